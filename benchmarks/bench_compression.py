@@ -0,0 +1,74 @@
+"""
+Copyright 2022-2026 czubix
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+# python benchmarks/bench_compression.py [frames.jsonl]
+#
+# frames.jsonl is recorded gateway traffic, one payload per line. without it a
+# burst of synthetic GUILD_CREATE payloads is used
+
+import sys
+import zlib
+import json
+import timeit
+
+from femcord.websocket import Inflator, ZstdDecompressor
+
+def guild_create(guild_id, count):
+    members = [{"user": {"id": str(guild_id + index), "username": "user%d" % index, "discriminator": "0", "avatar": None, "global_name": None}, "roles": [str(guild_id + 1)], "joined_at": "2021-03-22T17:00:00.000000+00:00", "deaf": False, "mute": False, "flags": 0} for index in range(count)]
+    return {"op": 0, "s": 1, "t": "GUILD_CREATE", "d": {"id": str(guild_id), "name": "guild", "member_count": count, "members": members, "channels": [], "roles": [], "presences": [], "voice_states": []}}
+
+def load(path):
+    if path is None:
+        return [json.dumps(guild_create(824683713459814400 + index * 1000, 1000)).encode() for index in range(50)]
+
+    with open(path, "rb") as file:
+        return [line.rstrip(b"\n") for line in file if line.strip()]
+
+def zlib_stream(frames):
+    compressobj = zlib.compressobj()
+    return [compressobj.compress(frame) + compressobj.flush(zlib.Z_SYNC_FLUSH) for frame in frames]
+
+def zstd_stream(frames):
+    import zstandard
+    compressobj = zstandard.ZstdCompressor().compressobj()
+    return [compressobj.compress(frame) + compressobj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK) for frame in frames]
+
+def main(path):
+    frames = load(path)
+    size = sum(map(len, frames))
+
+    print("%d frames, %d bytes" % (len(frames), size))
+
+    streams = [("zlib-stream", Inflator, zlib_stream)]
+
+    try:
+        ZstdDecompressor()
+        streams.append(("zstd-stream", ZstdDecompressor, zstd_stream))
+    except Exception:
+        print("  zstd-stream unavailable, install zstandard")
+
+    for name, decompressor, compress in streams:
+        compressed = compress(frames)
+
+        def run():
+            instance = decompressor()
+            for frame in compressed:
+                instance.feed(frame)
+
+        elapsed = min(timeit.repeat(run, number=1, repeat=5))
+        print("  %-12s %10d bytes  %8.1f ms  %8.1f MB/s" % (name, sum(map(len, compressed)), elapsed * 1e3, size / elapsed / 1e6))
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,42 @@
+"""
+Copyright 2022-2026 czubix
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+# python benchmarks/bench_etf.py [count]
+
+import os
+import sys
+import zlib
+import json
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "tests"))
+
+from femcord import etf
+from test_etf import CORPUS, WIRE
+
+def main(count):
+    json_frames = [json.dumps(frame).encode() for frame in CORPUS]
+    etf_frames = [etf.dumps(frame) for frame in WIRE]
+
+    print("%d frames x %d" % (len(CORPUS), count))
+
+    for name, frames, loads in (("json", json_frames, json.loads), ("etf", etf_frames, etf.loads)):
+        size = sum(map(len, frames))
+        compressed = len(zlib.compress(b"".join(frames)))
+        elapsed = min(timeit.repeat(lambda: [loads(frame) for frame in frames], number=count, repeat=5))
+        print("  %-4s %6d bytes  %6d zlib  %8.1f us/frame" % (name, size, compressed, elapsed / count / len(frames) * 1e6))
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,69 @@
+"""
+Copyright 2022-2026 czubix
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+# python benchmarks/bench_models.py [count]
+
+import os
+import sys
+import asyncio
+import dataclasses
+import tracemalloc
+
+from femcord import Client
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "tests"))
+
+from femcord.types import Guild, Member, User
+from conftest import guild_payload, member_payload
+
+def template():
+    asyncio.set_event_loop(asyncio.new_event_loop())
+    client = Client()
+    guild = Guild.parse(client, guild_payload())
+    data = member_payload("41771983423143938")
+    return Member.parse(client, guild, data, User.parse(client, data.pop("user")))
+
+def unslotted(cls):
+    return dataclasses.make_dataclass(cls.__name__, [field.name for field in dataclasses.fields(cls)])
+
+def clone(member, classes, index):
+    # one Member, User and VoiceState per cached member, like the gateway keeps them
+    values = {field.name: getattr(member, field.name) for field in dataclasses.fields(member)}
+    user = member.user
+    values["user"] = classes[type(user)](*(getattr(user, field.name) for field in dataclasses.fields(user)))
+    values["user"].id = str(41771983423143937 + index)
+    voice_state = member.voice_state
+    values["voice_state"] = classes[type(voice_state)](*(getattr(voice_state, field.name) for field in dataclasses.fields(voice_state)))
+    return classes[type(member)](*values.values())
+
+def measure(member, classes, count):
+    tracemalloc.start()
+    members = [clone(member, classes, index) for index in range(count)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return members, size
+
+def main(count):
+    member = template()
+    types = (type(member), type(member.user), type(member.voice_state))
+
+    print("%d members" % count)
+
+    for name, classes in (("slotted", {cls: cls for cls in types}), ("__dict__", {cls: unslotted(cls) for cls in types})):
+        members, size = measure(member, classes, count)
+        print("  %-9s %8.1f MB  %6.1f bytes/member" % (name, size / 1e6, size / count))
+        del members
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,50 @@
+"""
+Copyright 2022-2026 czubix
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+# python benchmarks/bench_snowflake.py [count]
+
+import sys
+import random
+import timeit
+import tracemalloc
+
+from femcord.utils import Snowflake
+
+def measure(factory, count):
+    tracemalloc.start()
+    ids = [factory(random.getrandbits(63)) for _ in range(count)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return ids, size
+
+def main(count):
+    random.seed(0)
+    strings, string_size = measure(str, count)
+    random.seed(0)
+    snowflakes, snowflake_size = measure(lambda value: Snowflake(value), count)
+
+    print("%d ids" % count)
+    print("  str        %6.1f bytes/id" % (string_size / count))
+    print("  Snowflake  %6.1f bytes/id" % (snowflake_size / count))
+
+    by_string = dict.fromkeys(strings)
+    by_snowflake = dict.fromkeys(snowflakes)
+
+    for name, cache, keys in (("str keys, str lookups", by_string, strings), ("Snowflake keys, Snowflake lookups", by_snowflake, snowflakes), ("Snowflake keys, str lookups", by_snowflake, strings)):
+        elapsed = min(timeit.repeat(lambda: [cache[key] for key in keys], number=1, repeat=5))
+        print("  %-34s %6.1f ns/lookup" % (name, elapsed / count * 1e9))
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
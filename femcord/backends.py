@@ -0,0 +1,263 @@
+"""
+Copyright 2022-2026 czubix
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from .codec import JSONCodec, get_codec
+
+import sqlite3
+import threading
+
+from typing import Iterable, Optional
+
+__all__ = ("CacheBatch", "CacheBackend", "MemoryCacheBackend", "SQLiteCacheBackend")
+
+THREAD_TYPES = (10, 11, 12)
+
+Operation = tuple
+
+class CacheBatch:
+    def __init__(self, codec: JSONCodec) -> None:
+        self.codec = codec
+        self.operations: list[Operation] = []
+
+    def __str__(self) -> str:
+        return "<CacheBatch operations={!r}>".format(len(self.operations))
+
+    def __repr__(self) -> str:
+        return "<CacheBatch operations={!r}>".format(len(self.operations))
+
+    def __len__(self) -> int:
+        return len(self.operations)
+
+    def set(self, namespace: str, key: str, value: dict) -> None:
+        self.operations.append(("set", namespace, str(key), value))
+
+    def set_many(self, namespace: str, items: Iterable[tuple[str, dict]]) -> None:
+        self.operations += [("set", namespace, str(key), value) for key, value in items]
+
+    def delete(self, namespace: str, key: str) -> None:
+        self.operations.append(("delete", namespace, str(key)))
+
+    def clear(self, namespace: str) -> None:
+        self.operations.append(("clear", namespace))
+
+    def retain(self, namespace: str, keys: Iterable[str]) -> None:
+        self.operations.append(("retain", namespace, {str(key) for key in keys}))
+
+    def encode(self) -> list[Operation]:
+        dumps = self.codec.dumps
+        return [("set", operation[1], operation[2], dumps(operation[3])) if operation[0] == "set" else operation for operation in self.operations]
+
+class CacheBackend:
+    codec: JSONCodec
+
+    def get(self, namespace: str, key: str) -> dict | None:
+        raise NotImplementedError
+
+    def set(self, namespace: str, key: str, value: dict) -> None:
+        raise NotImplementedError
+
+    def set_many(self, namespace: str, items: Iterable[tuple[str, dict]]) -> None:
+        for key, value in items:
+            self.set(namespace, key, value)
+
+    def delete(self, namespace: str, key: str) -> None:
+        raise NotImplementedError
+
+    def keys(self, namespace: str) -> list[str]:
+        raise NotImplementedError
+
+    def items(self, namespace: str) -> list[dict]:
+        return [value for value in (self.get(namespace, key) for key in self.keys(namespace)) if value is not None]
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        raise NotImplementedError
+
+    def update(self, namespace: str, key: str, **fields) -> None:
+        value = self.get(namespace, key)
+
+        if value is None:
+            return
+
+        value.update(fields)
+        self.set(namespace, key, value)
+
+    def batch(self) -> CacheBatch:
+        return CacheBatch(self.codec)
+
+    def write(self, operations: list[Operation]) -> None:
+        for operation in operations:
+            if operation[0] == "set":
+                self.set(operation[1], operation[2], self.codec.loads(operation[3]))
+            elif operation[0] == "delete":
+                self.delete(operation[1], operation[2])
+            elif operation[0] == "clear":
+                self.clear(operation[1])
+            elif operation[0] == "retain":
+                for key in self.keys(operation[1]):
+                    if key not in operation[2]:
+                        self.delete(operation[1], key)
+
+    def load_channel(self, channel_id: str) -> dict | None:
+        pointer = self.get("channels", channel_id)
+
+        if pointer is None:
+            return
+
+        return self.get("channels:" + pointer["guild_id"], channel_id)
+
+    def load_guild(self, guild_id: str) -> dict | None:
+        guild = self.get("guilds", guild_id)
+
+        if guild is None:
+            return
+
+        channels = self.items("channels:" + str(guild_id))
+
+        guild["channels"] = [channel for channel in channels if channel.get("type") not in THREAD_TYPES]
+        guild["threads"] = [channel for channel in channels if channel.get("type") in THREAD_TYPES]
+        guild["members"] = []
+
+        for namespace in ("roles", "emojis", "stickers"):
+            guild[namespace] = self.items(namespace + ":" + str(guild_id))
+
+        return guild
+
+class MemoryCacheBackend(CacheBackend):
+    def __init__(self, *, codec: Optional[JSONCodec] = None) -> None:
+        self.codec = codec or get_codec()
+        self.namespaces: dict[str, dict[str, str]] = {}
+
+    def __str__(self) -> str:
+        return "<MemoryCacheBackend namespaces={!r}>".format(len(self.namespaces))
+
+    def __repr__(self) -> str:
+        return "<MemoryCacheBackend namespaces={!r}>".format(len(self.namespaces))
+
+    def get(self, namespace: str, key: str) -> dict | None:
+        value = self.namespaces.get(namespace, {}).get(str(key))
+
+        if value is None:
+            return
+
+        return self.codec.loads(value)
+
+    def set(self, namespace: str, key: str, value: dict) -> None:
+        self.namespaces.setdefault(namespace, {})[str(key)] = self.codec.dumps(value)
+
+    def delete(self, namespace: str, key: str) -> None:
+        self.namespaces.get(namespace, {}).pop(str(key), None)
+
+    def keys(self, namespace: str) -> list[str]:
+        return list(self.namespaces.get(namespace, {}))
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        if namespace is None:
+            return self.namespaces.clear()
+
+        self.namespaces.pop(namespace, None)
+
+    def write(self, operations: list[Operation]) -> None:
+        for operation in operations:
+            if operation[0] == "set":
+                self.namespaces.setdefault(operation[1], {})[operation[2]] = operation[3]
+            elif operation[0] == "delete":
+                self.namespaces.get(operation[1], {}).pop(operation[2], None)
+            elif operation[0] == "clear":
+                self.namespaces.pop(operation[1], None)
+            elif operation[0] == "retain":
+                namespace = self.namespaces.get(operation[1], {})
+
+                for key in [key for key in namespace if key not in operation[2]]:
+                    del namespace[key]
+
+class SQLiteCacheBackend(CacheBackend):
+    # reads and writes each have their own connection and lock. the gateway runs
+    # both in an executor, so a locked database never blocks the event loop.
+    # WAL lets readers run alongside the writer.
+
+    def __init__(self, path: str, *, codec: Optional[JSONCodec] = None, timeout: float = 5) -> None:
+        self.path = path
+        self.codec = codec or get_codec()
+
+        self.write_connection = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+        self.write_connection.execute("PRAGMA journal_mode=WAL")
+        self.write_connection.execute("PRAGMA synchronous=NORMAL")
+        self.write_connection.execute("CREATE TABLE IF NOT EXISTS cache (namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, PRIMARY KEY (namespace, key)) WITHOUT ROWID")
+        self.write_connection.commit()
+
+        self.connection = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.read_lock = threading.Lock()
+
+    def __str__(self) -> str:
+        return "<SQLiteCacheBackend path={!r}>".format(self.path)
+
+    def __repr__(self) -> str:
+        return "<SQLiteCacheBackend path={!r}>".format(self.path)
+
+    def get(self, namespace: str, key: str) -> dict | None:
+        with self.read_lock:
+            row = self.connection.execute("SELECT value FROM cache WHERE namespace = ? AND key = ?", (namespace, str(key))).fetchone()
+
+        if row is None:
+            return
+
+        return self.codec.loads(row[0])
+
+    def set(self, namespace: str, key: str, value: dict) -> None:
+        self.write([("set", namespace, str(key), self.codec.dumps(value))])
+
+    def set_many(self, namespace: str, items: Iterable[tuple[str, dict]]) -> None:
+        batch = self.batch()
+        batch.set_many(namespace, items)
+        self.write(batch.encode())
+
+    def delete(self, namespace: str, key: str) -> None:
+        self.write([("delete", namespace, str(key))])
+
+    def keys(self, namespace: str) -> list[str]:
+        with self.read_lock:
+            return [row[0] for row in self.connection.execute("SELECT key FROM cache WHERE namespace = ?", (namespace,))]
+
+    def items(self, namespace: str) -> list[dict]:
+        with self.read_lock:
+            rows = self.connection.execute("SELECT value FROM cache WHERE namespace = ?", (namespace,)).fetchall()
+
+        return [self.codec.loads(row[0]) for row in rows]
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        if namespace is None:
+            with self.lock, self.write_connection:
+                self.write_connection.execute("DELETE FROM cache")
+        else:
+            self.write([("clear", namespace)])
+
+    def write(self, operations: list[Operation]) -> None:
+        with self.lock, self.write_connection as connection:
+            for operation in operations:
+                if operation[0] == "set":
+                    connection.execute("INSERT OR REPLACE INTO cache (namespace, key, value) VALUES (?, ?, ?)", operation[1:])
+                elif operation[0] == "delete":
+                    connection.execute("DELETE FROM cache WHERE namespace = ? AND key = ?", operation[1:])
+                elif operation[0] == "clear":
+                    connection.execute("DELETE FROM cache WHERE namespace = ?", operation[1:])
+                elif operation[0] == "retain":
+                    keys = [row[0] for row in connection.execute("SELECT key FROM cache WHERE namespace = ?", (operation[1],))]
+                    connection.executemany("DELETE FROM cache WHERE namespace = ? AND key = ?", ((operation[1], key) for key in keys if key not in operation[2]))
+
+    def close(self) -> None:
+        self.connection.close()
+        self.write_connection.close()
\ No newline at end of file
@@ -0,0 +1,364 @@
+"""
+Copyright 2022-2026 czubix
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from .enums import StatusTypes
+from .utils import Snowflake, MISSING
+
+from collections import OrderedDict
+
+import time
+
+from typing import Generic, Iterable, Iterator, Optional, TypeVar, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .types import Message, Member, User
+
+__all__ = ("MessageCache", "MemberCachePolicy", "SnowflakeDict", "NameIndexedDict", "UserCache", "MemberCache", "ModelIndex")
+
+T = TypeVar("T")
+
+class MessageCache:
+    def __init__(self, limit: int, *, channel_limit: Optional[int] = None, guild_limit: Optional[int] = None) -> None:
+        self.limit = limit
+        self.channel_limit = channel_limit
+        self.guild_limit = guild_limit
+
+        self.messages: OrderedDict[str, "Message"] = OrderedDict()
+        self.channels: dict[str, OrderedDict[str, "Message"]] = {}
+        self.guilds: dict[str, OrderedDict[str, "Message"]] = {}
+
+    def __str__(self) -> str:
+        return "<MessageCache messages={!r} limit={!r}>".format(len(self.messages), self.limit)
+
+    def __repr__(self) -> str:
+        return "<MessageCache messages={!r} limit={!r}>".format(len(self.messages), self.limit)
+
+    def __len__(self) -> int:
+        return len(self.messages)
+
+    def __iter__(self) -> Iterator["Message"]:
+        return iter(list(self.messages.values()))
+
+    def __contains__(self, message_id: str) -> bool:
+        return Snowflake.key(message_id) in self.messages
+
+    @staticmethod
+    def channel_id(message: "Message") -> str:
+        return Snowflake.key(getattr(message.channel, "id", message.channel))
+
+    @staticmethod
+    def guild_id(message: "Message") -> str | None:
+        return Snowflake.key(getattr(message.guild, "id", message.guild))
+
+    def add(self, message: "Message") -> None:
+        if self.limit <= 0:
+            return
+
+        self.messages[message.id] = message
+        self.messages.move_to_end(message.id)
+
+        channel_id = self.channel_id(message)
+        guild_id = self.guild_id(message)
+
+        channel = self.channels.setdefault(channel_id, OrderedDict())
+        channel[message.id] = message
+        channel.move_to_end(message.id)
+
+        if self.channel_limit is not None and len(channel) > self.channel_limit:
+            self.remove(next(iter(channel)))
+
+        if guild_id is not None:
+            guild = self.guilds.setdefault(guild_id, OrderedDict())
+            guild[message.id] = message
+            guild.move_to_end(message.id)
+
+            if self.guild_limit is not None and len(guild) > self.guild_limit:
+                self.remove(next(iter(guild)))
+
+        while len(self.messages) > self.limit:
+            self.remove(next(iter(self.messages)))
+
+    def get(self, message_id: str) -> Optional["Message"]:
+        message_id = Snowflake.key(message_id)
+        message = self.messages.get(message_id)
+
+        if message is None:
+            return
+
+        self.messages.move_to_end(message_id)
+
+        for index, key in ((self.channels, self.channel_id(message)), (self.guilds, self.guild_id(message))):
+            messages = index.get(key)
+
+            if messages is not None and message_id in messages:
+                messages.move_to_end(message_id)
+
+        return message
+
+    def remove(self, message_id: str) -> Optional["Message"]:
+        message_id = Snowflake.key(message_id)
+        message = self.messages.pop(message_id, None)
+
+        if message is None:
+            return
+
+        for index, key in ((self.channels, self.channel_id(message)), (self.guilds, self.guild_id(message))):
+            messages = index.get(key)
+
+            if messages is None:
+                continue
+
+            messages.pop(message_id, None)
+
+            if not messages:
+                del index[key]
+
+        return message
+
+    def channel(self, channel_id: str) -> list["Message"]:
+        return list(self.channels.get(Snowflake.key(channel_id), {}).values())
+
+    def guild(self, guild_id: str) -> list["Message"]:
+        return list(self.guilds.get(Snowflake.key(guild_id), {}).values())
+
+    def clear(self) -> None:
+        self.messages.clear()
+        self.channels.clear()
+        self.guilds.clear()
+
+class MemberCachePolicy:
+    def __init__(self, *, everyone: bool = True, voice: bool = False, online: bool = False, recent: Optional[float] = None, reap_interval: Optional[float] = MISSING) -> None:
+        self.everyone = everyone
+        self.voice = voice
+        self.online = online
+        self.recent = recent
+        # caching everyone never evicts, so the reaper only runs by default for the narrower policies
+        self.reap_interval = (None if everyone else 300) if reap_interval is MISSING else reap_interval
+
+        self.last_seen: SnowflakeDict[float] = SnowflakeDict()
+
+    def __str__(self) -> str:
+        return "<MemberCachePolicy everyone={!r} voice={!r} online={!r} recent={!r}>".format(self.everyone, self.voice, self.online, self.recent)
+
+    def __repr__(self) -> str:
+        return "<MemberCachePolicy everyone={!r} voice={!r} online={!r} recent={!r}>".format(self.everyone, self.voice, self.online, self.recent)
+
+    @classmethod
+    def all(cls, **kwargs) -> "MemberCachePolicy":
+        return cls(everyone=True, **kwargs)
+
+    @classmethod
+    def none(cls, **kwargs) -> "MemberCachePolicy":
+        return cls(everyone=False, **kwargs)
+
+    @classmethod
+    def voice_only(cls, **kwargs) -> "MemberCachePolicy":
+        return cls(everyone=False, voice=True, **kwargs)
+
+    @classmethod
+    def online_only(cls, **kwargs) -> "MemberCachePolicy":
+        return cls(everyone=False, online=True, **kwargs)
+
+    @classmethod
+    def recently_seen(cls, minutes: float, **kwargs) -> "MemberCachePolicy":
+        return cls(everyone=False, recent=minutes * 60, **kwargs)
+
+    def seen(self, user_id: str) -> None:
+        if self.recent is not None:
+            self.last_seen[user_id] = time.monotonic()
+
+    def forget(self, user_id: str) -> None:
+        self.last_seen.pop(user_id, None)
+
+    def expire(self) -> None:
+        if self.recent is None:
+            return
+
+        deadline = time.monotonic() - self.recent
+        self.last_seen = SnowflakeDict({user_id: seen for user_id, seen in self.last_seen.items() if seen >= deadline})
+
+    def should_cache(self, member: "Member") -> bool:
+        if self.everyone:
+            return True
+        if self.voice and member.voice_state is not None and member.voice_state.channel is not None:
+            return True
+        if self.online and member.presence is not None and member.presence.status not in (StatusTypes.OFFLINE, StatusTypes.INVISIBLE):
+            return True
+        if self.recent is not None:
+            seen = self.last_seen.get(member.user.id)
+            return seen is not None and time.monotonic() - seen <= self.recent
+
+        return False
+
+class SnowflakeDict(dict[str, T]):
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__()
+        self.update(*args, **kwargs)
+
+    def __reduce__(self) -> tuple:
+        return self.__class__, (dict(self),)
+
+    def __getitem__(self, key: str) -> T:
+        return super().__getitem__(Snowflake.key(key))
+
+    def __setitem__(self, key: str, value: T) -> None:
+        super().__setitem__(Snowflake.key(key), value)
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(Snowflake.key(key))
+
+    def __contains__(self, key: object) -> bool:
+        return super().__contains__(Snowflake.key(key))
+
+    def get(self, key: str, default: Optional[T] = None) -> Optional[T]:
+        return super().get(Snowflake.key(key), default)
+
+    def pop(self, key: str, *default) -> T:
+        return super().pop(Snowflake.key(key), *default)
+
+    def setdefault(self, key: str, default: T = None) -> T:
+        if key not in self:
+            self[key] = default
+
+        return self[key]
+
+    def update(self, *args, **kwargs) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+class NameIndexedDict(SnowflakeDict[T]):
+    def __init__(self, *args, **kwargs) -> None:
+        self.name_index: dict[str, dict[str, None]] = {}
+        self.indexed_names: dict[str, tuple[str, ...]] = {}
+
+        super().__init__(*args, **kwargs)
+
+    @staticmethod
+    def names(value: T) -> Iterable[Optional[str]]:
+        return ()
+
+    def index(self, key: str, value: T) -> None:
+        names = tuple({name.casefold() for name in self.names(value) if name})
+        self.indexed_names[key] = names
+
+        for name in names:
+            self.name_index.setdefault(name, {})[key] = None
+
+    def unindex(self, key: str) -> None:
+        for name in self.indexed_names.pop(key, ()):
+            keys = self.name_index.get(name)
+
+            if keys is None:
+                continue
+
+            keys.pop(key, None)
+
+            if not keys:
+                del self.name_index[name]
+
+    def reindex(self, key: str) -> None:
+        key = Snowflake.key(key)
+        self.unindex(key)
+
+        if key in self:
+            self.index(key, self[key])
+
+    def find(self, name: str) -> Optional[T]:
+        keys = self.name_index.get(name.casefold())
+
+        if not keys:
+            return None
+
+        return self[next(iter(keys))]
+
+    def __setitem__(self, key: str, value: T) -> None:
+        key = Snowflake.key(key)
+        self.unindex(key)
+        super().__setitem__(key, value)
+        self.index(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        key = Snowflake.key(key)
+        super().__delitem__(key)
+        self.unindex(key)
+
+    def pop(self, key: str, *default) -> T:
+        key = Snowflake.key(key)
+        self.unindex(key)
+        return super().pop(key, *default)
+
+    def popitem(self) -> tuple[str, T]:
+        key, value = super().popitem()
+        self.unindex(key)
+        return key, value
+
+    def clear(self) -> None:
+        super().clear()
+        self.name_index.clear()
+        self.indexed_names.clear()
+
+class UserCache(NameIndexedDict["User"]):
+    @staticmethod
+    def names(user: "User") -> Iterable[Optional[str]]:
+        return user.username, user.global_name
+
+class MemberCache(NameIndexedDict["Member"]):
+    @staticmethod
+    def names(member: "Member") -> Iterable[Optional[str]]:
+        return member.user.username, member.user.global_name, member.nick
+
+class ModelIndex(Generic[T]):
+    def __init__(self, items: Iterable[T] = ()) -> None:
+        self.ids: dict[str, T] = {}
+        self.names: dict[str, T] = {}
+
+        self.rebuild(items)
+
+    def __str__(self) -> str:
+        return "<ModelIndex items={!r}>".format(len(self.ids))
+
+    def __repr__(self) -> str:
+        return "<ModelIndex items={!r}>".format(len(self.ids))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, id: str) -> bool:
+        return Snowflake.key(id) in self.ids
+
+    def rebuild(self, items: Optional[Iterable[T]]) -> None:
+        self.ids = {}
+        self.names = {}
+
+        for item in items or ():
+            self.ids[item.id] = item
+
+            if item.name:
+                self.names.setdefault(item.name.casefold(), item)
+
+    def get_id(self, id: str) -> Optional[T]:
+        return self.ids.get(Snowflake.key(id))
+
+    def get_name(self, name: str) -> Optional[T]:
+        return self.names.get(name.casefold())
+
+    def get(self, id_or_name: str) -> Optional[T]:
+        item = self.ids.get(Snowflake.key(id_or_name))
+
+        if item is None:
+            item = self.names.get(id_or_name.casefold())
+
+        return item
@@ -15,29 +15,87 @@ limitations under the License.
 """
 
 import asyncio
+import signal
+import traceback
 
-from .gateway import Gateway
+from .gateway import Gateway, IdentifyQueue
 from .http import HTTP
+from .codec import JSONCodec, get_codec
+from .session import SessionStore
+from .cache import MemberCachePolicy
+from .backends import CacheBackend
 from .intents import Intents
-from .utils import MISSING
+from .utils import Snowflake, MISSING
+from .errors import InvalidArgument
+from .types import Presence
 
 from datetime import datetime
 
-from typing import Awaitable, Callable, Optional
+from typing import Awaitable, Callable, Optional, Literal
+
+class Listeners(list):
+    # client.listeners is what gets dispatched, the per-event index is only a cache
+    # rebuilt after any change to the list
+    def __init__(self, *args) -> None:
+        super().__init__(*args)
+        self.index: Optional[dict[str, list[Callable[..., Awaitable]]]] = None
+
+    def events(self) -> dict[str, list[Callable[..., Awaitable]]]:
+        if self.index is None:
+            self.index = {}
+
+            for listener in self:
+                self.index.setdefault(listener.__name__, []).append(listener)
+
+        return self.index
+
+def invalidate_index(name: str) -> Callable:
+    method = getattr(list, name)
+
+    def wrapper(self, *args):
+        self.index = None
+        return method(self, *args)
+
+    wrapper.__name__ = name
+
+    return wrapper
+
+for name in ("append", "extend", "insert", "remove", "pop", "clear", "sort", "reverse", "__setitem__", "__delitem__", "__iadd__", "__imul__"):
+    setattr(Listeners, name, invalidate_index(name))
 
 class Client:
-    def __init__(self, *, intents: Intents = Intents.default(), messages_limit: int = 1000, last_latencies_limit: int = 100, mobile: bool = False) -> None:
+    def __init__(self, *, intents: Intents = Intents.default(), messages_limit: int = 1000, messages_channel_limit: Optional[int] = None, messages_guild_limit: Optional[int] = None, last_latencies_limit: int = 100, mobile: bool = False, codec: Optional[JSONCodec] = None, encoding: Literal["json", "etf"] = "json", compress: Optional[Literal["zlib-stream", "zstd-stream"]] = "zlib-stream", shard_count: Optional[int] = None, shard_ids: Optional[list[int]] = None, session_store: Optional[SessionStore] = None, member_cache_policy: Optional[MemberCachePolicy] = None, snowflakes: bool = False, cache_backend: Optional[CacheBackend] = None, snapshot_path: Optional[str] = None, ingest_time_budget: float = 0.005, wait_for_chunking: bool = False, chunk_guilds_at_startup: bool = True) -> None:
         self.loop = asyncio.get_event_loop()
         self.token: str = MISSING
         self.bot: bool = MISSING
         self.intents = intents
         self.http: HTTP = MISSING
         self.gateway: Gateway = MISSING
-        self.listeners: list[Callable[..., Awaitable]] = []
-        self.waiting_for: list[tuple[str, asyncio.Future, Callable[..., bool]]] = []
+        self.shards: dict[int, Gateway] = {}
+        self.shard_count = shard_count
+        self.shard_ids = shard_ids
+        self.presence: Optional[Presence] = None
+        self.identify_queue = IdentifyQueue()
+        self.session_store = session_store
+        self.member_cache_policy = member_cache_policy or MemberCachePolicy()
+        if Snowflake.configured is not None and Snowflake.configured is not snowflakes:
+            raise InvalidArgument("snowflakes is process-wide, every Client in a process must use the same value")
+        self.snowflakes = Snowflake.configured = Snowflake.enabled = snowflakes
+        self.cache_backend = cache_backend
+        self.snapshot_path = snapshot_path
+        self.ingest_time_budget = ingest_time_budget
+        self.wait_for_chunking = wait_for_chunking
+        self.chunk_guilds_at_startup = chunk_guilds_at_startup
+        self.listeners = Listeners()
+        self.waiting_for: dict[str, list[tuple[str, asyncio.Future, Callable[..., bool]]]] = {}
         self.messages_limit = messages_limit
+        self.messages_channel_limit = messages_channel_limit
+        self.messages_guild_limit = messages_guild_limit
         self.last_latencies_limit = last_latencies_limit
         self.mobile = mobile
+        self.codec = codec or get_codec()
+        self.encoding = encoding
+        self.compress = compress
         self.started_at = datetime.now()
 
     def event(self, function: Callable[..., Awaitable], *, name: Optional[str] = None) -> None: # pyright: ignore[reportRedeclaration]
@@ -46,37 +104,134 @@ class Client:
             def function(*args, **kwargs) -> None:
                 event(*args, **kwargs)
             function.__name__ = name
-        self.listeners.append(function) # pyright: ignore[reportArgumentType]
+        self.add_listener(function) # pyright: ignore[reportArgumentType]
+
+    @property
+    def listeners(self) -> Listeners:
+        return self.__listeners
+
+    @listeners.setter
+    def listeners(self, listeners: list[Callable[..., Awaitable]]) -> None:
+        self.__listeners = Listeners(listeners)
+
+    @property
+    def events(self) -> dict[str, list[Callable[..., Awaitable]]]:
+        return self.__listeners.events()
+
+    def add_listener(self, listener: Callable[..., Awaitable]) -> None:
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[..., Awaitable]) -> None:
+        self.listeners.remove(listener)
+
+    def get_listeners(self, event: str) -> list[Callable[..., Awaitable]]:
+        return self.events.get("on_" + event, [])
+
+    def is_listening(self, event: str) -> bool:
+        return "on_" + event in self.events or event in self.waiting_for
+
+    def remove_waiter(self, listener: tuple[str, asyncio.Future, Callable[..., bool]]) -> None:
+        waiting_for = self.waiting_for.get(listener[0])
+
+        if not waiting_for or listener not in waiting_for:
+            return
+
+        waiting_for.remove(listener)
+
+        if not waiting_for:
+            del self.waiting_for[listener[0]]
 
     async def wait_for(self, event: str, check: Optional[Callable[..., bool]] = None, *, timeout: Optional[float] = None) -> asyncio.Future:
         future = self.loop.create_future()
         listener = event, future, check or (lambda *args: True)
-        self.waiting_for.append(listener)
+
+        if event not in self.waiting_for:
+            self.waiting_for[event] = []
+
+        self.waiting_for[event].append(listener)
 
         if timeout is not None:
             try:
                 return await asyncio.wait_for(future, timeout)
             except TimeoutError:
-                self.waiting_for.remove(listener)
+                self.remove_waiter(listener)
                 raise
 
         return await future
 
+    def get_shard(self, guild_id: str) -> Gateway:
+        if self.shard_count is None:
+            return self.gateway
+
+        return self.shards[(int(guild_id) >> 22) % self.shard_count]
+
+    async def set_presence(self, presence: Presence) -> None:
+        self.presence = presence
+
+        gateways = list(self.shards.values()) or [self.gateway]
+
+        await asyncio.gather(*(gateway.set_presence(presence) for gateway in gateways if gateway is not MISSING))
+
+    async def connect(self) -> None:
+        await HTTP(self)
+
+        if self.shard_count is None and self.shard_ids is None:
+            return await Gateway(self)
+
+        gateway = await self.http.get_gateway_bot()
+
+        self.identify_queue.update(gateway["session_start_limit"])
+        self.identify_queue.fetch_gateway = self.http.get_gateway_bot
+
+        if self.shard_count is None:
+            self.shard_count = gateway["shards"]
+        if self.shard_ids is None:
+            self.shard_ids = list(range(self.shard_count))
+
+        for shard_id in self.shard_ids:
+            self.loop.create_task(Gateway(self, shard_id))
+
     def run(self, token: str, *, bot: bool = True) -> None:
         self.token = token
         self.bot = bot
 
-        self.loop.create_task(HTTP(self))
-        self.loop.create_task(Gateway(self))
+        self.loop.create_task(self.connect())
+
+        try:
+            self.loop.add_signal_handler(signal.SIGTERM, self.loop.stop)
+        except (NotImplementedError, RuntimeError):
+            pass
 
         try:
             self.loop.run_forever()
         except KeyboardInterrupt:
             pass
         finally:
-            on_closes = [listener() for listener in self.listeners if listener.__name__ == "on_close"]
+            on_closes = [listener() for listener in self.get_listeners("close")]
 
             for on_close in on_closes:
                 self.loop.run_until_complete(on_close) # pyright: ignore[reportArgumentType]
 
-            self.gateway.heartbeat.stop()
\ No newline at end of file
+            for gateway in list(self.shards.values()) or [self.gateway]:
+                if gateway is MISSING:
+                    continue
+
+                try:
+                    gateway.save_session()
+
+                    if gateway.heartbeat is not MISSING:
+                        gateway.heartbeat.stop()
+
+                    gateway.chunker.stop()
+                except Exception:
+                    traceback.print_exc()
+
+            if self.gateway is not MISSING and self.gateway.reaper_task is not None:
+                self.gateway.reaper_task.cancel()
+
+            if self.gateway is not MISSING and self.gateway.backend_task is not None:
+                self.gateway.backend_task.cancel()
+                self.gateway.flush_backend()
+
+            if self.gateway is not MISSING and self.snapshot_path is not None:
+                self.gateway.snapshot(self.snapshot_path)
\ No newline at end of file
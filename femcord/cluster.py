@@ -0,0 +1,286 @@
+"""
+Copyright 2022-2026 czubix
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import asyncio
+import aiohttp
+
+import multiprocessing
+import tempfile
+import traceback
+import logging
+import json
+import time
+import os
+
+from .gateway import IdentifyQueue
+from .http import HTTP
+from .utils import MISSING
+
+from typing import Callable, Optional, Any, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .client import Client
+
+__all__ = ("Cluster", "ClusterIdentifyQueue")
+
+async def send_line(writer: asyncio.StreamWriter, data: dict) -> None:
+    writer.write(json.dumps(data, separators=(",", ":")).encode() + b"\n")
+    await writer.drain()
+
+class ClusterIdentifyQueue:
+    def __init__(self, worker_id: int, path: str, *, health_interval: float = 10, retry_delay: float = 1) -> None:
+        self.loop = asyncio.get_event_loop()
+        self.worker_id = worker_id
+        self.path = path
+        self.health_interval = health_interval
+        self.retry_delay = retry_delay
+        self.reader: asyncio.StreamReader = MISSING
+        self.writer: asyncio.StreamWriter = MISSING
+        self.nonce = 0
+        self.futures: dict[int, asyncio.Future] = {}
+
+    def __str__(self) -> str:
+        return "<ClusterIdentifyQueue worker_id={!r} path={!r}>".format(self.worker_id, self.path)
+
+    def __repr__(self) -> str:
+        return "<ClusterIdentifyQueue worker_id={!r} path={!r}>".format(self.worker_id, self.path)
+
+    def update(self, session_start_limit: dict) -> None:
+        pass
+
+    async def connect(self) -> None:
+        if self.writer is not MISSING:
+            return
+
+        self.reader, self.writer = await asyncio.open_unix_connection(self.path)
+        self.loop.create_task(self.read_loop(self.reader))
+
+    async def read_loop(self, reader: asyncio.StreamReader) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+
+                if not line:
+                    break
+
+                data = json.loads(line)
+                future = self.futures.pop(data.get("nonce"), None)
+
+                if future is not None and not future.done():
+                    future.set_result(data)
+        except (OSError, ValueError):
+            traceback.print_exc()
+        finally:
+            # a retry may already have replaced the connection this loop was reading
+            if self.reader is reader:
+                self.disconnect()
+
+    def disconnect(self) -> None:
+        if self.writer is not MISSING:
+            self.writer.close()
+
+        self.reader = self.writer = MISSING
+
+        futures, self.futures = self.futures, {}
+
+        for future in futures.values():
+            if not future.done():
+                future.set_exception(ConnectionResetError("lost connection to the cluster"))
+
+    async def request(self, op: str, **data: Any) -> dict:
+        await self.connect()
+
+        self.nonce += 1
+        nonce = self.nonce
+        future = self.futures[nonce] = self.loop.create_future()
+
+        try:
+            await send_line(self.writer, {"op": op, "nonce": nonce, "worker_id": self.worker_id, **data})
+        except OSError:
+            self.futures.pop(nonce, None)
+            self.disconnect()
+            raise
+
+        return await future
+
+    async def acquire(self, shard_id: Optional[int] = None) -> None:
+        while True:
+            try:
+                await self.request("identify", shard_id=shard_id)
+                return
+            except OSError as error:
+                logging.warning(f"identify request for shard {shard_id} failed ({error!r}), retrying in {self.retry_delay}s")
+                await asyncio.sleep(self.retry_delay)
+
+    async def health_loop(self, client: "Client") -> None:
+        while True:
+            await asyncio.sleep(self.health_interval)
+
+            shards = {}
+
+            for shard_id, gateway in client.shards.items():
+                shards[shard_id] = {
+                    "ready": gateway.ready,
+                    "latency": gateway.latency or None,
+                    "guilds": len(gateway.guild_ids)
+                }
+
+            try:
+                await self.connect()
+                await send_line(self.writer, {"op": "health", "worker_id": self.worker_id, "pid": os.getpid(), "shards": shards})
+            except OSError:
+                traceback.print_exc()
+                self.disconnect()
+
+def run_worker(factory: Callable[[], "Client"], token: str, bot: bool, worker_id: int, shard_ids: list[int], shard_count: int, path: str, health_interval: float) -> None:
+    asyncio.set_event_loop(asyncio.new_event_loop())
+
+    client = factory()
+    client.shard_count = shard_count
+    client.shard_ids = shard_ids
+    client.identify_queue = ClusterIdentifyQueue(worker_id, path, health_interval=health_interval)
+
+    client.loop.create_task(client.identify_queue.health_loop(client))
+    client.run(token, bot=bot)
+
+class Cluster:
+    def __init__(self, factory: Callable[[], "Client"], *, workers: Optional[int] = None, shard_count: Optional[int] = None, path: Optional[str] = None, restart_delay: float = 5, health_interval: float = 10) -> None:
+        self.factory = factory
+        self.workers = workers or os.cpu_count() or 1
+        self.shard_count = shard_count
+        self.path = path or os.path.join(tempfile.gettempdir(), "femcord-%s.sock" % os.getpid())
+        self.restart_delay = restart_delay
+        self.health_interval = health_interval
+
+        self.token: str = MISSING
+        self.bot: bool = MISSING
+        self.identify_queue = IdentifyQueue()
+        self.shard_ranges: list[list[int]] = []
+        self.processes: dict[int, multiprocessing.Process] = {}
+        self.restarts: dict[int, int] = {}
+        self.health: dict[int, dict] = {}
+        self.context = multiprocessing.get_context("spawn")
+
+    def __str__(self) -> str:
+        return "<Cluster workers={!r} shard_count={!r}>".format(self.workers, self.shard_count)
+
+    def __repr__(self) -> str:
+        return "<Cluster workers={!r} shard_count={!r}>".format(self.workers, self.shard_count)
+
+    @property
+    def latencies(self) -> dict[int, int | None]:
+        return {int(shard_id): shard["latency"] for health in self.health.values() for shard_id, shard in health["shards"].items()}
+
+    async def fetch_gateway(self) -> dict:
+        headers = {"authorization": ("Bot " if self.bot else "") + self.token, "user-agent": "femcord"}
+
+        async with aiohttp.ClientSession() as session:
+            async with session.get(HTTP.URL + "/gateway/bot", headers=headers) as response:
+                return await response.json()
+
+    def start_worker(self, worker_id: int) -> None:
+        process = self.context.Process(
+            target = run_worker,
+            args = (self.factory, self.token, self.bot, worker_id, self.shard_ranges[worker_id], self.shard_count, self.path, self.health_interval),
+            name = "femcord-worker-%s" % worker_id,
+            daemon = True
+        )
+        process.start()
+
+        self.processes[worker_id] = process
+
+        logging.info(f"started worker {worker_id} (pid {process.pid}) with shards {self.shard_ranges[worker_id]}")
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        while True:
+            line = await reader.readline()
+
+            if not line:
+                break
+
+            try:
+                data = json.loads(line)
+            except ValueError:
+                continue
+
+            op = data.get("op")
+
+            if op == "identify":
+                asyncio.get_running_loop().create_task(self.grant_identify(writer, data))
+            elif op == "health":
+                data["time"] = time.time()
+                self.health[data["worker_id"]] = data
+            elif op == "status":
+                await send_line(writer, {"op": "status", "nonce": data.get("nonce"), "workers": self.health, "restarts": self.restarts})
+
+        writer.close()
+
+    async def grant_identify(self, writer: asyncio.StreamWriter, data: dict) -> None:
+        await self.identify_queue.acquire(data["shard_id"])
+        await send_line(writer, {"op": "identify", "nonce": data["nonce"]})
+
+    async def monitor(self) -> None:
+        while True:
+            await asyncio.sleep(1)
+
+            for worker_id, process in list(self.processes.items()):
+                if process.is_alive():
+                    continue
+
+                logging.warning(f"worker {worker_id} exited with code {process.exitcode}, restarting in {self.restart_delay}s")
+
+                self.health.pop(worker_id, None)
+                self.restarts[worker_id] = self.restarts.get(worker_id, 0) + 1
+
+                await asyncio.sleep(self.restart_delay)
+                self.start_worker(worker_id)
+
+    async def start(self) -> None:
+        gateway = await self.fetch_gateway()
+
+        self.identify_queue.update(gateway["session_start_limit"])
+        self.identify_queue.fetch_gateway = self.fetch_gateway
+
+        if self.shard_count is None:
+            self.shard_count = gateway["shards"]
+
+        workers = min(self.workers, self.shard_count)
+        self.shard_ranges = [list(range(self.shard_count))[worker_id::workers] for worker_id in range(workers)]
+
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+        server = await asyncio.start_unix_server(self.handle_connection, self.path)
+
+        for worker_id in range(workers):
+            self.start_worker(worker_id)
+
+        async with server:
+            await self.monitor()
+
+    def run(self, token: str, *, bot: bool = True) -> None:
+        self.token = token
+        self.bot = bot
+
+        try:
+            asyncio.run(self.start())
+        except KeyboardInterrupt:
+            pass
+        finally:
+            for process in self.processes.values():
+                process.terminate()
+
+            if os.path.exists(self.path):
+                os.remove(self.path)
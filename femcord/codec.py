@@ -0,0 +1,74 @@
+"""
+Copyright 2022-2026 czubix
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import json
+
+from typing import Any
+
+__all__ = ("JSONCodec", "OrjsonCodec", "MsgspecCodec", "get_codec")
+
+class JSONCodec:
+    name = "json"
+
+    def __str__(self) -> str:
+        return "<{} name={!r}>".format(self.__class__.__name__, self.name)
+
+    def __repr__(self) -> str:
+        return "<{} name={!r}>".format(self.__class__.__name__, self.name)
+
+    def loads(self, data: str | bytes) -> Any:
+        return json.loads(data)
+
+    def dumps(self, data: Any) -> str:
+        return json.dumps(data, separators=(",", ":"))
+
+class OrjsonCodec(JSONCodec):
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._loads = orjson.loads
+        self._dumps = orjson.dumps
+
+    def loads(self, data: str | bytes) -> Any:
+        return self._loads(data)
+
+    def dumps(self, data: Any) -> str:
+        return self._dumps(data).decode()
+
+class MsgspecCodec(JSONCodec):
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        import msgspec
+
+        self._decoder = msgspec.json.Decoder()
+        self._encoder = msgspec.json.Encoder()
+
+    def loads(self, data: str | bytes) -> Any:
+        return self._decoder.decode(data)
+
+    def dumps(self, data: Any) -> str:
+        return self._encoder.encode(data).decode()
+
+def get_codec() -> JSONCodec:
+    for codec in (OrjsonCodec, MsgspecCodec):
+        try:
+            return codec()
+        except ImportError:
+            continue
+
+    return JSONCodec()
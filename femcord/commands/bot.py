@@ -17,6 +17,10 @@ limitations under the License.
 from ..client import Client
 from ..http import Route
 from ..intents import Intents
+from ..codec import JSONCodec
+from ..session import SessionStore
+from ..cache import MemberCachePolicy
+from ..backends import CacheBackend
 from ..types import User, Channel, Role
 from ..errors import InvalidArgument
 from ..enums import ApplicationCommandTypes, InteractionTypes, CommandOptionTypes
@@ -41,7 +45,7 @@ import inspect
 import traceback
 import sys
 
-from typing import Callable, Awaitable, Optional, Any, Union, TYPE_CHECKING, get_origin, get_args
+from typing import Callable, Awaitable, Optional, Any, Union, Literal, TYPE_CHECKING, get_origin, get_args
 
 if TYPE_CHECKING:
     from ..types import Message, Interaction
@@ -49,8 +53,8 @@ if TYPE_CHECKING:
 BeforeAfterFunction = Callable[[Context | AppContext], Awaitable[None]]
 
 class Bot(Client):
-    def __init__(self, *, name: Optional[str] = None, command_prefix: Callable[["Message"], Awaitable[str]] | str, intents: Optional[Intents] = None, messages_limit: int = 1000, last_latencies_limit: int = 100, mobile: bool = False, owners: Optional[tuple[str] | list[str]] = None, context: Optional[Context] = None, app_context: Optional[AppContext] = None) -> None:
-        super().__init__(intents=intents or Intents.all(), messages_limit=messages_limit, last_latencies_limit=last_latencies_limit, mobile=mobile)
+    def __init__(self, *, name: Optional[str] = None, command_prefix: Callable[["Message"], Awaitable[str]] | str, intents: Optional[Intents] = None, messages_limit: int = 1000, messages_channel_limit: Optional[int] = None, messages_guild_limit: Optional[int] = None, last_latencies_limit: int = 100, mobile: bool = False, owners: Optional[tuple[str] | list[str]] = None, context: Optional[Context] = None, app_context: Optional[AppContext] = None, codec: Optional[JSONCodec] = None, encoding: Literal["json", "etf"] = "json", compress: Optional[Literal["zlib-stream", "zstd-stream"]] = "zlib-stream", shard_count: Optional[int] = None, shard_ids: Optional[list[int]] = None, session_store: Optional[SessionStore] = None, member_cache_policy: Optional[MemberCachePolicy] = None, snowflakes: bool = False, cache_backend: Optional[CacheBackend] = None, snapshot_path: Optional[str] = None, ingest_time_budget: float = 0.005, wait_for_chunking: bool = False, chunk_guilds_at_startup: bool = True) -> None:
+        super().__init__(intents=intents or Intents.all(), messages_limit=messages_limit, messages_channel_limit=messages_channel_limit, messages_guild_limit=messages_guild_limit, last_latencies_limit=last_latencies_limit, mobile=mobile, codec=codec, encoding=encoding, compress=compress, shard_count=shard_count, shard_ids=shard_ids, session_store=session_store, member_cache_policy=member_cache_policy, snowflakes=snowflakes, cache_backend=cache_backend, snapshot_path=snapshot_path, ingest_time_budget=ingest_time_budget, wait_for_chunking=wait_for_chunking, chunk_guilds_at_startup=chunk_guilds_at_startup)
 
         self.name = name
         self.owners = list(owners or [])
@@ -342,7 +346,8 @@ class Bot(Client):
 
         self.commands += [command for command in cog.commands if not command.type == CommandTypes.SUBCOMMAND]
         self.app_commands += cog.app_commands
-        self.listeners += cog.listeners
+        for listener in cog.listeners:
+            self.add_listener(listener)
 
         self.cogs.append(cog)
 
@@ -371,7 +376,7 @@ class Bot(Client):
             self.remove_command(command)
 
         for listener in cog.listeners:
-            self.listeners.remove(listener)
+            self.remove_listener(listener)
 
         self.cogs.remove(cog)
 
@@ -426,7 +431,7 @@ class Bot(Client):
         if callable(after_call_functions):
             after_call_functions = [after_call_functions]
 
-        on_error = "on_error" in (listener.__name__ for listener in self.listeners)
+        on_error = self.is_listening("error")
 
         command = self.get_app_command(interaction.data.name)
 
@@ -482,7 +487,7 @@ class Bot(Client):
         if not (len(message.content) > len(prefix) and message.content[:len(prefix)] == prefix):
             return
 
-        on_error = "on_error" in (listener.__name__ for listener in self.listeners)
+        on_error = self.is_listening("error")
 
         command, *arguments = message.content[len(prefix):].split(maxsplit=1)
         if arguments:
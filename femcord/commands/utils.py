@@ -18,6 +18,8 @@ from .errors import CheckFailure, NotOwner, NotNsfw, NoPermission
 
 from . import Context, Cog
 
+from ..permissions import Permissions
+
 from functools import wraps
 
 from typing import Callable
@@ -48,14 +50,14 @@ def is_nsfw(func) -> Callable:
     return check(check_function, error=NotNsfw)(func)
 
 def has_permissions(*permissions) -> Callable:
+    required = Permissions(*permissions)
+
     def decorator(func) -> Callable:
         def check_function(_: Cog, ctx: Context) -> bool:
-            for permission in permissions:
-                if ctx.guild.owner.user.id == ctx.author.id:
-                    return True
-                if not ctx.member.permissions.has(permission):
-                    return False
-            return True
+            if ctx.guild.owner.user.id == ctx.author.id:
+                return True
+
+            return ctx.member.permissions.has_all(required)
 
         return check(check_function, error=NoPermission)(func)
 
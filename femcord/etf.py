@@ -0,0 +1,286 @@
+"""
+Copyright 2022-2026 czubix
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import struct
+import zlib
+
+from .errors import InvalidArgument
+
+from typing import Any
+
+__all__ = ("ETFCodec", "loads", "dumps")
+
+VERSION = 131
+
+NEW_FLOAT_EXT = 70
+COMPRESSED = 80
+SMALL_INTEGER_EXT = 97
+INTEGER_EXT = 98
+FLOAT_EXT = 99
+ATOM_EXT = 100
+SMALL_TUPLE_EXT = 104
+LARGE_TUPLE_EXT = 105
+NIL_EXT = 106
+STRING_EXT = 107
+LIST_EXT = 108
+BINARY_EXT = 109
+SMALL_BIG_EXT = 110
+LARGE_BIG_EXT = 111
+MAP_EXT = 116
+SMALL_ATOM_EXT = 115
+ATOM_UTF8_EXT = 118
+SMALL_ATOM_UTF8_EXT = 119
+
+ATOMS = {
+    "nil": None,
+    "true": True,
+    "false": False
+}
+
+# keys whose integer values (or lists of integers) are snowflakes, discord sends
+# those as strings in the json encoding and as integers in etf
+ID_KEYS = frozenset(("id", "roles", "mention_roles", "not_found", "applied_tags", "exempt_roles", "exempt_channels"))
+
+_id_keys: dict[Any, bool] = {}
+
+def is_id_key(key: Any) -> bool:
+    if key not in _id_keys:
+        _id_keys[key] = isinstance(key, str) and (key in ID_KEYS or key.endswith(("_id", "_ids"))) and key != "custom_id"
+
+    return _id_keys[key]
+
+_u16 = struct.Struct(">H")
+_i32 = struct.Struct(">i")
+_u32 = struct.Struct(">I")
+_f64 = struct.Struct(">d")
+
+class Decoder:
+    # Discord sends snowflakes as integers, the rest of the library expects
+    # them as strings like in the json encoding. only values under id keys are
+    # converted, other integers (timestamps, flags) stay integers like in json
+
+    def __init__(self, data: bytes, *, bigints_as_str: bool = True) -> None:
+        self.data = data
+        self.offset = 0
+        self.bigints_as_str = bigints_as_str
+
+    def decode(self) -> Any:
+        if self.data[0] != VERSION:
+            raise InvalidArgument("Invalid ETF version")
+
+        self.offset = 1
+
+        return self.decode_term()
+
+    def decode_term(self) -> Any:
+        data = self.data
+        tag = data[self.offset]
+        self.offset += 1
+
+        if tag == BINARY_EXT:
+            length = _u32.unpack_from(data, self.offset)[0]
+            start = self.offset + 4
+            self.offset = start + length
+            return data[start:self.offset].decode()
+        elif tag == SMALL_ATOM_UTF8_EXT or tag == SMALL_ATOM_EXT:
+            length = data[self.offset]
+            start = self.offset + 1
+            self.offset = start + length
+            return self.atom(data[start:self.offset].decode())
+        elif tag == ATOM_UTF8_EXT or tag == ATOM_EXT:
+            length = _u16.unpack_from(data, self.offset)[0]
+            start = self.offset + 2
+            self.offset = start + length
+            return self.atom(data[start:self.offset].decode())
+        elif tag == MAP_EXT:
+            arity = _u32.unpack_from(data, self.offset)[0]
+            self.offset += 4
+            decode_term = self.decode_term
+            bigints_as_str = self.bigints_as_str
+            result = {}
+            for _ in range(arity):
+                key = decode_term()
+                value = decode_term()
+                if bigints_as_str and is_id_key(key):
+                    if type(value) is int:
+                        value = str(value)
+                    elif type(value) is list:
+                        value = [str(item) if type(item) is int else item for item in value]
+                result[key] = value
+            return result
+        elif tag == SMALL_INTEGER_EXT:
+            self.offset += 1
+            return data[self.offset - 1]
+        elif tag == INTEGER_EXT:
+            self.offset += 4
+            return _i32.unpack_from(data, self.offset - 4)[0]
+        elif tag == LIST_EXT:
+            length = _u32.unpack_from(data, self.offset)[0]
+            self.offset += 4
+            decode_term = self.decode_term
+            result = [decode_term() for _ in range(length)]
+            tail = decode_term()
+            if tail != []:
+                result.append(tail)
+            return result
+        elif tag == NIL_EXT:
+            return []
+        elif tag == SMALL_BIG_EXT or tag == LARGE_BIG_EXT:
+            if tag == SMALL_BIG_EXT:
+                length = data[self.offset]
+                self.offset += 1
+            else:
+                length = _u32.unpack_from(data, self.offset)[0]
+                self.offset += 4
+            sign = data[self.offset]
+            start = self.offset + 1
+            self.offset = start + length
+            value = int.from_bytes(data[start:self.offset], "little")
+            if sign:
+                value = -value
+            return value
+        elif tag == NEW_FLOAT_EXT:
+            self.offset += 8
+            return _f64.unpack_from(data, self.offset - 8)[0]
+        elif tag == FLOAT_EXT:
+            self.offset += 31
+            return float(data[self.offset - 31:self.offset].split(b"\x00", 1)[0])
+        elif tag == STRING_EXT:
+            length = _u16.unpack_from(data, self.offset)[0]
+            start = self.offset + 2
+            self.offset = start + length
+            return list(data[start:self.offset])
+        elif tag == SMALL_TUPLE_EXT or tag == LARGE_TUPLE_EXT:
+            if tag == SMALL_TUPLE_EXT:
+                arity = data[self.offset]
+                self.offset += 1
+            else:
+                arity = _u32.unpack_from(data, self.offset)[0]
+                self.offset += 4
+            decode_term = self.decode_term
+            return tuple(decode_term() for _ in range(arity))
+        elif tag == COMPRESSED:
+            size = _u32.unpack_from(data, self.offset)[0]
+            decompressobj = zlib.decompressobj()
+            inflated = decompressobj.decompress(data[self.offset + 4:], size)
+            self.offset = len(data) - len(decompressobj.unused_data)
+            decoder = Decoder(inflated, bigints_as_str=self.bigints_as_str)
+            return decoder.decode_term()
+
+        raise InvalidArgument("Unknown ETF tag %s at offset %s" % (tag, self.offset - 1))
+
+    def atom(self, atom: str) -> Any:
+        if atom in ATOMS:
+            return ATOMS[atom]
+
+        return atom
+
+class Encoder:
+    def __init__(self) -> None:
+        self.buffer = bytearray()
+
+    def encode(self, data: Any) -> bytes:
+        self.buffer = bytearray((VERSION,))
+        self.encode_term(data)
+
+        return bytes(self.buffer)
+
+    def encode_atom(self, atom: str) -> None:
+        atom = atom.encode()
+        self.buffer.append(SMALL_ATOM_UTF8_EXT)
+        self.buffer.append(len(atom))
+        self.buffer += atom
+
+    def encode_term(self, data: Any) -> None:
+        buffer = self.buffer
+
+        if data is None:
+            self.encode_atom("nil")
+        elif data is True:
+            self.encode_atom("true")
+        elif data is False:
+            self.encode_atom("false")
+        elif isinstance(data, str):
+            data = data.encode()
+            buffer.append(BINARY_EXT)
+            buffer += _u32.pack(len(data))
+            buffer += data
+        elif isinstance(data, int):
+            if 0 <= data <= 255:
+                buffer.append(SMALL_INTEGER_EXT)
+                buffer.append(data)
+            elif -2 ** 31 <= data < 2 ** 31:
+                buffer.append(INTEGER_EXT)
+                buffer += _i32.pack(data)
+            else:
+                value = abs(data)
+                length = (value.bit_length() + 7) // 8
+                if length > 255:
+                    raise InvalidArgument("Integer too big to encode")
+                buffer.append(SMALL_BIG_EXT)
+                buffer.append(length)
+                buffer.append(1 if data < 0 else 0)
+                buffer += value.to_bytes(length, "little")
+        elif isinstance(data, float):
+            buffer.append(NEW_FLOAT_EXT)
+            buffer += _f64.pack(data)
+        elif isinstance(data, dict):
+            buffer.append(MAP_EXT)
+            buffer += _u32.pack(len(data))
+            for key, value in data.items():
+                self.encode_term(key)
+                self.encode_term(value)
+        elif isinstance(data, (list, tuple)):
+            if not data:
+                buffer.append(NIL_EXT)
+                return
+            buffer.append(LIST_EXT)
+            buffer += _u32.pack(len(data))
+            for item in data:
+                self.encode_term(item)
+            buffer.append(NIL_EXT)
+        elif isinstance(data, (bytes, bytearray)):
+            buffer.append(BINARY_EXT)
+            buffer += _u32.pack(len(data))
+            buffer += data
+        else:
+            raise InvalidArgument("Object of type %s is not ETF serializable" % data.__class__.__name__)
+
+def loads(data: bytes, *, bigints_as_str: bool = True) -> Any:
+    return Decoder(data, bigints_as_str=bigints_as_str).decode()
+
+def dumps(data: Any) -> bytes:
+    return Encoder().encode(data)
+
+# pure python, decoding is about 5x slower than the json codec and frames are
+# not smaller once compressed (benchmarks/bench_etf.py). json stays the default,
+# etf is there for parity with other libraries, not for speed
+class ETFCodec:
+    name = "etf"
+
+    def __init__(self, *, bigints_as_str: bool = True) -> None:
+        self.bigints_as_str = bigints_as_str
+
+    def __str__(self) -> str:
+        return "<ETFCodec name={!r}>".format(self.name)
+
+    def __repr__(self) -> str:
+        return "<ETFCodec name={!r}>".format(self.name)
+
+    def loads(self, data: bytes) -> Any:
+        return loads(data, bigints_as_str=self.bigints_as_str)
+
+    def dumps(self, data: Any) -> bytes:
+        return dumps(data)
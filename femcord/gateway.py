@@ -15,16 +15,22 @@ limitations under the License.
 """
 
 import asyncio
+import logging
 
 import sys
 import base64
 import traceback
 import time
 import copy
+import pickle
+import os
+import itertools
 
-from .websocket import WebSocket
+from .websocket import WebSocket, Backoff
+from .cache import MessageCache, MemberCachePolicy, SnowflakeDict, UserCache, ModelIndex
+from .backends import CacheBatch, CacheBackend
 from .http import HTTP, Route, HTTPException
-from .utils import get_index, get_mime, parse_time, ID_PATTERN, MISSING
+from .utils import get_index, get_mime, parse_time, ID_PATTERN, Snowflake, MISSING
 
 from .types import (
     Guild, Channel, Role,
@@ -39,36 +45,105 @@ from .enums import (
     MfaLevel, ExplicitContentFilter, VerificationLevel, NSFWLevel,
     DefaultMessageNotification)
 
+from collections import deque
 from types import CoroutineType
 
-from typing import Callable, Optional, Awaitable, TYPE_CHECKING
+from typing import Any, Callable, Optional, Awaitable, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .client import Client
 
+SNAPSHOT_VERSION = 2
+
+# member requests are sent in this order, so queries and admissions never hold up chunking a guild
+FULL_PRIORITY = 0
+QUERY_PRIORITY = 1
+ADMISSION_PRIORITY = 2
+
+ADMISSION_WINDOW = 10
+ADMISSION_ATTEMPTS = 3
+
+GUILD_COLLECTIONS = ("members", "presences", "voice_states", "channels", "threads", "roles", "emojis", "stickers", "guild_scheduled_events", "stage_instances", "soundboard_sounds")
+
 class EventHandler:
     def __init__(self) -> None:
-        self.gateway: Gateway = None
         self.handlers: dict[str, Callable[[dict], Optional[tuple]]] = {}
+        self.parsers: set[str] = set()
 
-    async def __call__(self, name: str, *args) -> Callable[[str, ...], Awaitable[Optional[tuple]]]:
+    async def __call__(self, gateway: "Gateway", name: str, *args) -> Callable[[str, ...], Awaitable[Optional[tuple]]]:
         handler = self.handlers.get(name)
 
         if not handler:
             return
 
-        return handler(self.gateway, *args)
-
-    def bind_gateway(self, gateway: "Gateway") -> None:
-        self.gateway = gateway
+        return handler(gateway, *args)
 
     def event(self, callable: Callable) -> None:
         self.handlers[callable.__name__] = callable
 
         return callable
 
+    def parser(self, callable: Callable) -> None:
+        self.parsers.add(callable.__name__)
+
+        return self.event(callable)
+
 handler = EventHandler()
 
+class IdentifyQueue:
+    def __init__(self, max_concurrency: int = 1, delay: float = 5) -> None:
+        self.max_concurrency = max_concurrency
+        self.delay = delay
+        self.remaining: Optional[int] = None
+        self.reset_after: float = 0
+        self.buckets: dict[int, asyncio.Lock] = {}
+        self.fetch_gateway: Optional[Callable[[], Awaitable[dict]]] = None
+
+    def __str__(self) -> str:
+        return "<IdentifyQueue max_concurrency={!r} remaining={!r}>".format(self.max_concurrency, self.remaining)
+
+    def __repr__(self) -> str:
+        return "<IdentifyQueue max_concurrency={!r} remaining={!r}>".format(self.max_concurrency, self.remaining)
+
+    def update(self, session_start_limit: dict) -> None:
+        self.max_concurrency = session_start_limit["max_concurrency"]
+        self.remaining = session_start_limit["remaining"]
+        self.reset_after = time.time() + session_start_limit["reset_after"] / 1000
+
+    async def acquire(self, shard_id: Optional[int] = None) -> None:
+        key = (shard_id or 0) % self.max_concurrency
+
+        if key not in self.buckets:
+            self.buckets[key] = asyncio.Lock()
+
+        bucket = self.buckets[key]
+        await bucket.acquire()
+
+        try:
+            await self.wait_for_reset()
+        finally:
+            asyncio.get_running_loop().call_later(self.delay, bucket.release)
+
+        if self.remaining is not None:
+            self.remaining = max(self.remaining - 1, 0)
+
+    async def wait_for_reset(self) -> None:
+        while self.remaining is not None and self.remaining <= 0:
+            if self.reset_after > time.time():
+                await asyncio.sleep(self.reset_after - time.time())
+
+            if self.fetch_gateway is None:
+                return
+
+            try:
+                self.update((await self.fetch_gateway())["session_start_limit"])
+            except Exception:
+                traceback.print_exc()
+                return
+
+            if self.reset_after <= time.time():
+                return
+
 class Heartbeat:
     def __init__(self, gateway: "Gateway", heartbeat_interval: float) -> None:
         self.loop = asyncio.get_event_loop()
@@ -107,18 +182,275 @@ class Heartbeat:
     def stop(self) -> None:
         self.heartbeat_task.cancel()
 
+class ChunkRequest:
+    def __init__(self, guild_id: str, payload: dict, future: asyncio.Future, full: bool, priority: int) -> None:
+        self.guild_id = guild_id
+        self.payload = payload
+        self.future = future
+        self.full = full
+        self.priority = priority
+        self.chunk_count: Optional[int] = None
+        self.chunk_indexes: set[int] = set()
+        self.tasks: list[asyncio.Task] = []
+        self.queued = True
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+class ChunkScheduler:
+    def __init__(self, gateway: "Gateway", limit: int = 110, per: float = 60, timeout: float = 60) -> None:
+        self.loop = asyncio.get_event_loop()
+        self.gateway = gateway
+        self.limit = limit
+        self.per = per
+        self.timeout = timeout
+        self.nonces = itertools.count()
+        self.queue: asyncio.PriorityQueue[tuple[int, int, ChunkRequest]] = asyncio.PriorityQueue()
+        self.order = itertools.count()
+        self.requests: dict[str, ChunkRequest] = {}
+        self.guild_requests: dict[str, ChunkRequest] = {}
+        self.sent: deque[float] = deque()
+        self.task: Optional[asyncio.Task] = None
+
+    def request(self, guild_id: str, payload: dict, priority: int = QUERY_PRIORITY) -> asyncio.Future:
+        guild_id = Snowflake.key(guild_id)
+        full = payload.get("query") == "" and payload.get("limit") == 0
+
+        if full and guild_id in self.guild_requests:
+            return self.guild_requests[guild_id].future
+
+        nonce = "%d.%d" % (self.gateway.shard_id or 0, next(self.nonces))
+        request = ChunkRequest(guild_id, {**payload, "guild_id": str(guild_id), "nonce": nonce}, self.loop.create_future(), full, FULL_PRIORITY if full else priority)
+
+        self.requests[nonce] = request
+        request.future.add_done_callback(lambda future: future.cancelled() and self.discard(request))
+
+        if full:
+            self.guild_requests[guild_id] = request
+            request.future.add_done_callback(lambda future: future.cancelled() or future.exception())
+
+        self.put(request)
+        self.start()
+
+        return request.future
+
+    def put(self, request: ChunkRequest) -> None:
+        request.queued = True
+        self.queue.put_nowait((request.priority, next(self.order), request))
+
+    def start(self) -> None:
+        if self.task is None or self.task.done():
+            self.task = self.loop.create_task(self.send_loop())
+
+    def requeue(self, *, reset: bool = False) -> None:
+        for request in self.requests.values():
+            if reset:
+                request.chunk_count = None
+                request.chunk_indexes.clear()
+                request.tasks.clear()
+
+            if request.queued or request.future.done():
+                continue
+
+            if request.timer is not None:
+                request.timer.cancel()
+
+            self.put(request)
+
+        self.start()
+
+    def touch(self, request: ChunkRequest) -> None:
+        if request.timer is not None:
+            request.timer.cancel()
+
+        request.timer = self.loop.call_later(self.timeout, self.expire, request)
+
+    def expire(self, request: ChunkRequest) -> None:
+        self.discard(request)
+
+        if request.full:
+            self.gateway.pending_voice_states.pop(request.guild_id, None)
+
+        if not request.future.done():
+            request.future.set_exception(asyncio.TimeoutError("no member chunks received for guild %s" % request.guild_id))
+
+    def discard(self, request: ChunkRequest) -> None:
+        if request.timer is not None:
+            request.timer.cancel()
+
+        if self.requests.get(request.payload["nonce"]) is request:
+            del self.requests[request.payload["nonce"]]
+
+        if self.guild_requests.get(request.guild_id) is request:
+            del self.guild_requests[request.guild_id]
+
+    async def acquire(self) -> None:
+        while True:
+            now = time.monotonic()
+
+            while self.sent and self.sent[0] <= now - self.per:
+                self.sent.popleft()
+
+            if len(self.sent) < self.limit:
+                self.sent.append(now)
+                return
+
+            await asyncio.sleep(self.sent[0] + self.per - now)
+
+    async def send_loop(self) -> None:
+        while True:
+            _, _, request = await self.queue.get()
+            request.queued = False
+
+            if request.future.done():
+                self.discard(request)
+                continue
+
+            # requests that can't go out now stay in self.requests, requeue() sends them after READY or RESUMED
+            if not self.connected:
+                continue
+
+            await self.acquire()
+
+            if not self.connected:
+                self.sent.pop()
+                continue
+
+            self.touch(request)
+            await self.gateway.ws.send(Opcodes.REQUEST_GUILD_MEMBERS, request.payload)
+
+    @property
+    def connected(self) -> bool:
+        return self.gateway.ready and self.gateway.ws is not MISSING and not self.gateway.ws.ws.closed
+
+    def received(self, chunk: dict, task: asyncio.Task) -> None:
+        request = self.requests.get(chunk.get("nonce"))
+
+        if request is None:
+            return
+
+        request.tasks.append(task)
+        request.chunk_count = chunk["chunk_count"]
+        request.chunk_indexes.add(chunk["chunk_index"])
+
+        if len(request.chunk_indexes) < request.chunk_count:
+            return self.touch(request)
+
+        self.discard(request)
+        self.loop.create_task(self.complete(request))
+
+    async def complete(self, request: ChunkRequest) -> None:
+        try:
+            results = await asyncio.gather(*request.tasks)
+        except Exception as exc:
+            traceback.print_exc()
+
+            if request.full:
+                self.gateway.pending_voice_states.pop(request.guild_id, None)
+
+            if not request.future.done():
+                request.future.set_exception(exc)
+
+            return
+
+        # a request sent again after a resume can receive the same chunk twice
+        members = list({member.user.id: member for result in results for member in result}.values())
+
+        if request.full:
+            self.gateway.pending_voice_states.pop(request.guild_id, None)
+            restored = self.gateway.restored_members.pop(request.guild_id, set())
+            guild = self.gateway.get_guild(request.guild_id)
+
+            if self.gateway.cache_backend is not None:
+                batch = self.gateway.cache_backend.batch()
+                batch.retain("members:" + str(request.guild_id), (member.user.id for member in members))
+                await self.gateway.commit(batch)
+
+            if guild is not None:
+                for user_id in restored.difference(member.user.id for member in members):
+                    guild.members.pop(user_id, None)
+
+                guild.chunked = True
+                await self.gateway.dispatch("guild_chunked", guild)
+
+        if not request.future.done():
+            request.future.set_result(members)
+
+    async def wait(self) -> None:
+        await asyncio.gather(*(request.future for request in list(self.guild_requests.values())), return_exceptions=True)
+
+    def cancel(self) -> None:
+        for request in self.requests.values():
+            if request.timer is not None:
+                request.timer.cancel()
+
+            request.future.cancel()
+
+        self.requests.clear()
+        self.guild_requests.clear()
+
+    def stop(self) -> None:
+        self.cancel()
+
+        if self.task is not None:
+            self.task.cancel()
+
+class SnapshotPickler(pickle.Pickler):
+    def __init__(self, file, client: "Client") -> None:
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.client = client
+
+    def persistent_id(self, obj: object) -> Optional[str]:
+        if obj is self.client:
+            return "client"
+
+class SnapshotUnpickler(pickle.Unpickler):
+    # snapshots are pickles, only load files written by this process or another trusted one.
+    # find_class is restricted to model and cache types so a tampered file can't import arbitrary callables.
+    SAFE_MODULES = ("femcord.types", "femcord.cache", "femcord.enums", "femcord.permissions", "femcord.utils", "femcord.embed", "femcord.components")
+    SAFE_GLOBALS = {
+        ("datetime", "datetime"), ("datetime", "date"), ("datetime", "timedelta"), ("datetime", "timezone"),
+        ("builtins", "set"), ("builtins", "frozenset"), ("builtins", "dict"), ("builtins", "list"), ("builtins", "tuple"), ("builtins", "object"),
+        ("collections", "OrderedDict"), ("copyreg", "_reconstructor")
+    }
+
+    def __init__(self, file, client: "Client") -> None:
+        super().__init__(file)
+        self.client = client
+
+    def find_class(self, module: str, name: str) -> type:
+        if (module, name) in self.SAFE_GLOBALS:
+            return super().find_class(module, name)
+
+        if module.startswith(self.SAFE_MODULES):
+            cls = super().find_class(module, name)
+
+            if isinstance(cls, type):
+                return cls
+
+        raise pickle.UnpicklingError("global %s.%s is not allowed in a snapshot" % (module, name))
+
+    def persistent_load(self, pid: str) -> "Client":
+        if pid == "client":
+            return self.client
+
+        raise pickle.UnpicklingError("unsupported persistent id %r" % pid)
+
 class Gateway:
     async def __new__(cls, *args) -> "Gateway":
         instance = super().__new__(cls)
         await instance.__init__(*args)
         return instance
 
-    async def __init__(self, client: "Client") -> None:
-        handler.bind_gateway(self)
-        client.gateway = self
+    async def __init__(self, client: "Client", shard_id: Optional[int] = None) -> None:
+        primary = client.gateway if shard_id is not None and client.gateway is not MISSING else None
+        if primary is None:
+            client.gateway = self
+        if shard_id is not None:
+            client.shards[shard_id] = self
         self.loop = asyncio.get_event_loop()
         self.__client = client
         self.__http = client.http
+        self.shard_id = shard_id
+        self.shard_count = client.shard_count
         self.ws: "WebSocket" = MISSING
         self.ready = False
         self.heartbeat: Heartbeat = MISSING
@@ -127,51 +459,231 @@ class Gateway:
         self.last_latencies_limit = client.last_latencies_limit
         self.session_id: str = MISSING
         self.sequence_number: int = MISSING
+        self.resume_gateway_url: Optional[str] = None
 
         self.resuming: bool = False
         self.last_sequence_number: int = MISSING
 
+        self.backoff = Backoff()
+        self.reconnects = 0
+        self.failed_reconnects = 0
+        self.reconnect_time: float = 0
+        self.last_reconnect_time: float = 0
+
         self.bot_user: User = MISSING
+        self.bot_user_data: dict = MISSING
         self.emojis: list[Emoji] = MISSING
-
-        self.guilds: list[Guild] = []
+        self.emoji_index: ModelIndex[Emoji] = ModelIndex()
+
+        self.guilds: list[Guild] = primary.guilds if primary else []
+        self.guild_index: SnowflakeDict[Guild] = primary.guild_index if primary else SnowflakeDict()
+        self.channel_index: SnowflakeDict[Channel] = primary.channel_index if primary else SnowflakeDict()
+        self.channel_guilds: SnowflakeDict[Guild] = primary.channel_guilds if primary else SnowflakeDict()
+        self.guild_ids: set[str] = set()
+        self.restored_guild_ids: set[str] = primary.restored_guild_ids if primary else set()
         self.unavailable_guilds: list[dict] = []
-        self.users: dict[str, User] = {}
+        self.users: UserCache = primary.users if primary else UserCache()
+        self.member_cache_policy: MemberCachePolicy = client.member_cache_policy
+        self.cache_backend: Optional[CacheBackend] = client.cache_backend
+        self.backend_queue: asyncio.Queue[list[tuple]] = primary.backend_queue if primary else asyncio.Queue()
+        self.backend_task: Optional[asyncio.Task] = None
+        self.reaper_task: Optional[asyncio.Task] = None
+        self.chunker = ChunkScheduler(self)
+        self.pending_voice_states: SnowflakeDict[SnowflakeDict[dict]] = SnowflakeDict()
+        self.pending_admissions: SnowflakeDict[SnowflakeDict[Optional[dict]]] = SnowflakeDict()
+        self.restored_members: SnowflakeDict[set[str]] = SnowflakeDict()
+        self.wait_for_chunking = client.wait_for_chunking
+        self.chunk_guilds_at_startup = client.chunk_guilds_at_startup
+
+        self.ingest_time_budget = client.ingest_time_budget
+        self.ingested_members = 0
+        self.ingest_time: float = 0
+
+        if primary is None and not self.member_cache_policy.everyone and self.member_cache_policy.reap_interval is not None:
+            self.reaper_task = self.loop.create_task(self.reaper_loop())
+
+        if primary is None and self.cache_backend is not None:
+            self.backend_task = self.loop.create_task(self.backend_writer())
 
         self.messages_limit = client.messages_limit
-        self.messages: list[Message] = []
+        self.messages: MessageCache = primary.messages if primary else MessageCache(client.messages_limit, channel_limit=client.messages_channel_limit, guild_limit=client.messages_guild_limit)
 
         self.dispatched_ready = False
         self.dispatched_once = False
-        self.presence: Optional[Presence] = None
+        self.presence: Optional[Presence] = client.presence
+
+        if primary is None and client.snapshot_path is not None:
+            self.restore(client.snapshot_path)
+
+        await self.load_session()
 
         await WebSocket(self, client)
 
     async def dispatch(self, event: str, *args, **kwargs) -> None:
-        for listener in self.__client.waiting_for:
-            if listener[0] == event:
+        if event in self.__client.waiting_for:
+            for listener in self.__client.waiting_for[event]:
                 try:
                     if listener[2](*args) is True:
                         listener[1].set_result(args)
-                        return self.__client.waiting_for.remove(listener)
+                        return self.__client.remove_waiter(listener)
                 except Exception:
                     traceback.print_exc()
 
-        for listener in self.__client.listeners:
-            if listener.__name__ == "on_" + event:
-                try:
-                    self.loop.create_task(listener(*args, **kwargs))
-                except Exception:
-                    traceback.print_exc()
+        for listener in self.__client.get_listeners(event):
+            try:
+                self.loop.create_task(listener(*args, **kwargs))
+            except Exception:
+                traceback.print_exc()
+
+    @property
+    def ingest_stats(self) -> dict:
+        return {
+            "members": self.ingested_members,
+            "time": self.ingest_time,
+            "rate": self.ingested_members / self.ingest_time if self.ingest_time else 0
+        }
+
+    @property
+    def reconnect_stats(self) -> dict:
+        return {
+            "reconnects": self.reconnects,
+            "failed_reconnects": self.failed_reconnects,
+            "attempts": self.backoff.attempts,
+            "circuit_open": self.backoff.open,
+            "reconnect_time": self.reconnect_time,
+            "last_reconnect_time": self.last_reconnect_time
+        }
 
     def reset(self) -> None:
-        self.guilds = []
+        if self.shard_id is None:
+            if not self.restored_guild_ids:
+                self.guilds = []
+                self.guild_index = SnowflakeDict()
+                self.channel_index = SnowflakeDict()
+                self.channel_guilds = SnowflakeDict()
+                self.users = UserCache()
+        else:
+            for guild_id in self.guild_ids:
+                if guild_id in self.guild_index:
+                    self.unindex_guild(self.guild_index[guild_id])
+
+            self.guilds[:] = [guild for guild in self.guilds if guild.id not in self.guild_ids]
+
+        self.guild_ids = set()
         self.unavailable_guilds = []
-        self.users = {}
+
+    async def dispatch_ready(self) -> None:
+        if self.shard_id is None:
+            return await self.dispatch("ready")
+
+        await self.dispatch("shard_ready", self.shard_id)
+
+        shards = self.__client.shards
+
+        if len(shards) == len(self.__client.shard_ids) and all(shard.dispatched_once for shard in shards.values()):
+            await self.dispatch("ready")
+
+    async def dispatch_ready_after_chunking(self) -> None:
+        await self.chunker.wait()
+        await self.dispatch_ready()
+
+    def request_guild_members(self, guild_id: str, *, query: Optional[str] = "", limit: int = 0, user_ids: Optional[list[str]] = None, priority: int = QUERY_PRIORITY) -> asyncio.Future:
+        payload = {"limit": limit, "presences": self.__client.intents.has(IntentsEnum.GUILD_PRESENCES)}
+
+        if user_ids is not None:
+            payload["user_ids"] = [str(user_id) for user_id in user_ids]
+        else:
+            payload["query"] = query
+
+        return self.chunker.request(guild_id, payload, priority)
+
+    async def load_session(self) -> None:
+        if self.__client.session_store is None:
+            return
+
+        session = self.__client.session_store.load(self.shard_id)
+
+        if session is None:
+            return
+
+        if not any(self.owns_guild(guild_id) for guild_id in self.restored_guild_ids):
+            return
+
+        self.session_id = session["session_id"]
+        self.last_sequence_number = self.sequence_number = session["sequence_number"]
+        self.resume_gateway_url = session["resume_gateway_url"]
+        self.bot_user_data = session["user"]
+        self.bot_user = User.parse(self.__client, dict(self.bot_user_data))
+        self.resuming = True
+        self.dispatched_ready = True
+
+    def snapshot(self, path: str) -> None:
+        with open(path + ".tmp", "wb") as file:
+            SnapshotPickler(file, self.__client).dump({
+                "version": SNAPSHOT_VERSION,
+                "time": time.time(),
+                "snowflakes": Snowflake.enabled,
+                "guilds": self.guilds,
+                "users": self.users
+            })
+
+        os.replace(path + ".tmp", path)
+
+    def restore(self, path: str) -> bool:
+        try:
+            with open(path, "rb") as file:
+                snapshot = SnapshotUnpickler(file, self.__client).load()
+        except (OSError, ValueError, EOFError, AttributeError, ImportError, pickle.UnpicklingError):
+            return False
+
+        if snapshot.get("version") != SNAPSHOT_VERSION or snapshot.get("snowflakes") != Snowflake.enabled:
+            return False
+
+        self.users.update(snapshot["users"])
+
+        for guild in snapshot["guilds"]:
+            self.guilds.append(guild)
+            self.index_guild(guild)
+            self.restored_guild_ids.add(guild.id)
+
+        return True
+
+    def owns_guild(self, guild_id: str) -> bool:
+        return self.shard_id is None or (int(guild_id) >> 22) % self.shard_count == self.shard_id
+
+    def prune_restored(self, guilds: list[dict]) -> None:
+        available = {Snowflake.key(guild["id"]) for guild in guilds}
+
+        for guild_id in list(self.restored_guild_ids):
+            if not self.owns_guild(guild_id):
+                continue
+
+            if guild_id in available:
+                continue
+
+            self.restored_guild_ids.discard(guild_id)
+            guild = self.get_guild(guild_id)
+
+            if guild is not None:
+                self.unindex_guild(guild)
+                self.guilds[:] = [cached_guild for cached_guild in self.guilds if cached_guild is not guild]
+
+    def save_session(self) -> None:
+        if self.__client.session_store is None or self.session_id is MISSING or self.sequence_number is MISSING:
+            return
+
+        self.__client.session_store.save(self.shard_id, {
+            "session_id": self.session_id,
+            "sequence_number": self.sequence_number,
+            "resume_gateway_url": self.resume_gateway_url,
+            "user": self.bot_user_data
+        })
 
     async def identify(self) -> None:
         self.reset()
 
+        await self.__client.identify_queue.acquire(self.shard_id)
+
         identify_data = {
             "token": self.__client.token,
             "properties": {
@@ -187,6 +699,9 @@ class Gateway:
         if self.presence is not None:
             identify_data["presence"] = self.presence.to_dict()
 
+        if self.shard_id is not None:
+            identify_data["shard"] = [self.shard_id, self.shard_count]
+
         await self.ws.send(Opcodes.IDENTIFY, identify_data)
 
     async def resume(self) -> None:
@@ -200,7 +715,8 @@ class Gateway:
         self.last_sequence_number = None
 
     async def on_message(self, op: Opcodes, data: dict, sequence_number: int, event_name: str) -> None:
-        self.sequence_number = sequence_number
+        if sequence_number is not None:
+            self.sequence_number = sequence_number
 
         if op is Opcodes.HELLO:
             self.heartbeat = Heartbeat(self, data["heartbeat_interval"])
@@ -234,15 +750,25 @@ class Gateway:
 
         if event_name == "READY":
             self.session_id = data["session_id"]
-            self.bot_user = await User.from_raw(self.__client, data["user"])
+            self.resume_gateway_url = data.get("resume_gateway_url")
+            self.bot_user_data = dict(data["user"])
+            self.bot_user = User.parse(self.__client, data["user"])
             self.emojis = await self.get_application_emojis() if self.__client.bot else []
+            self.emoji_index.rebuild(self.emojis)
             self.unavailable_guilds = data["guilds"]
 
+            if self.restored_guild_ids:
+                self.prune_restored(data["guilds"])
+
             self.ready = True
+            self.chunker.requeue(reset=True)
 
             if self.__client.bot is False:
                 self.unavailable_guilds = []
-                self.guilds = [await Guild.from_raw(self.__client, guild) for guild in data["guilds"]]
+                self.guilds = [Guild.parse(self.__client, guild) for guild in data["guilds"]]
+
+                for guild in self.guilds:
+                    self.index_guild(guild)
 
                 if not self.dispatched_ready:
                     self.dispatched_ready = True
@@ -250,30 +776,53 @@ class Gateway:
 
         elif event_name == "RESUMED":
             self.ready = True
+            self.chunker.requeue()
+            owned = [guild_id for guild_id in self.restored_guild_ids if self.owns_guild(guild_id)]
+            self.restored_guild_ids.difference_update(owned)
+            self.guild_ids.update(owned)
+
+            if not self.dispatched_once:
+                self.emojis = await self.get_application_emojis() if self.__client.bot else []
+                self.emoji_index.rebuild(self.emojis)
+                self.dispatched_once = True
+                await self.dispatch_ready()
 
         elif isinstance(event_name, str) and isinstance(data, dict):
-            if self.dispatched_ready:
-                await self.dispatch("raw_" + event_name.lower(), data.copy())
+            name = event_name.lower()
+
+            if self.dispatched_ready and self.__client.is_listening("raw_" + name):
+                await self.dispatch("raw_" + name, data.copy())
 
             if not self.dispatched_ready:
                 if event_name == "GUILD_CREATE":
                     await self.guild_create(data)
                 elif event_name == "GUILD_DELETE":
                     await self.guild_delete(data)
+                elif event_name == "GUILD_MEMBERS_CHUNK":
+                    await self.guild_members_chunk(data)
 
-                if len(self.unavailable_guilds) <= len(self.guilds):
+                if len(self.unavailable_guilds) <= len(self.guild_ids):
                     self.dispatched_ready = True
 
                     if not self.dispatched_once:
                         self.dispatched_once = True
-                        await self.dispatch("ready")
+
+                        if self.wait_for_chunking:
+                            self.loop.create_task(self.dispatch_ready_after_chunking())
+                        else:
+                            await self.dispatch_ready()
 
                     return
 
             if not self.dispatched_ready:
                 return
 
-            parsed_data = await handler(event_name.lower(), data)
+            listening = self.__client.is_listening(name)
+
+            if not listening and (name in handler.parsers or name not in handler.handlers):
+                return
+
+            parsed_data = await handler(self, name, data)
 
             if isinstance(parsed_data, CoroutineType):
                 parsed_data = await parsed_data
@@ -286,8 +835,8 @@ class Gateway:
             if parsed_data == (None,):
                 parsed_data = ()
 
-            if self.dispatched_ready:
-                await self.dispatch(event_name.lower(), *parsed_data)
+            if self.dispatched_ready and listening:
+                await self.dispatch(name, *parsed_data)
 
     async def set_presence(self, presence: Presence) -> None:
         self.presence = presence
@@ -295,49 +844,85 @@ class Gateway:
             return
         await self.ws.send(Opcodes.PRESENCE_UPDATE, self.presence.to_dict())
 
+    def index_guild(self, guild: Guild) -> None:
+        self.guild_index[guild.id] = guild
+
+        for channel in guild.channels:
+            self.index_channel(guild, channel)
+        for thread in guild.threads:
+            self.index_channel(guild, thread)
+
+    def unindex_guild(self, guild: Guild) -> None:
+        self.guild_index.pop(guild.id, None)
+
+        for channel in guild.channels:
+            self.unindex_channel(channel.id)
+        for thread in guild.threads:
+            self.unindex_channel(thread.id)
+
+    def index_channel(self, guild: Guild, channel: Channel) -> None:
+        self.channel_index[channel.id] = channel
+        self.channel_guilds[channel.id] = guild
+
+    def unindex_channel(self, channel_id: str) -> None:
+        self.channel_index.pop(channel_id, None)
+        self.channel_guilds.pop(channel_id, None)
+
     def get_guild(self, guild_id: str) -> Guild:
-        for guild in self.guilds:
-            if guild.id == guild_id:
-                return guild
+        return self.guild_index.get(guild_id)
 
     def get_channel(self, channel_id: str) -> Channel:
-        for guild in self.guilds:
-            for channel in guild.channels + guild.threads:
-                if channel.id == channel_id:
-                    return channel
+        return self.channel_index.get(channel_id)
 
     def get_guild_by_channel_id(self, channel_id: str) -> Guild:
-        for guild in self.guilds:
-            for channel in guild.channels:
-                if channel.id == channel_id:
-                    return guild
+        return self.channel_guilds.get(channel_id)
 
-    def cache_message(self, message: Message) -> None:
-        self.messages.append(message)
+    async def load_guild(self, guild_id: str) -> Optional[Guild]:
+        guild = self.get_guild(guild_id)
+
+        if guild is not None or self.cache_backend is None:
+            return guild
 
-        if len(self.messages) > self.messages_limit:
-            del self.messages[0]
+        guild = await self.read_backend(self.cache_backend.load_guild, str(guild_id))
+
+        if guild is not None:
+            return Guild.parse(self.__client, guild)
+
+    async def load_channel(self, channel_id: str) -> Optional[Channel]:
+        channel = self.get_channel(channel_id)
+
+        if channel is not None or self.cache_backend is None:
+            return channel
+
+        channel = await self.read_backend(self.cache_backend.load_channel, str(channel_id))
+
+        if channel is not None:
+            return Channel.parse(self.__client, channel)
+
+    def cache_message(self, message: Message) -> None:
+        self.messages.add(message)
 
     def get_emoji(self, *, emoji_id: str = None, name: str = None) -> Emoji:
+        emoji = None
+
         if emoji_id is not None:
-            kwargs = dict(value=emoji_id, key=lambda e: e.id)
+            emoji = self.emoji_index.get_id(emoji_id)
         if name is not None:
-            kwargs = dict(value=name, key=lambda e: e.name)
-
-        index = get_index(self.emojis, **kwargs)
+            emoji = self.emoji_index.get_name(name)
 
-        if index is None:
+        if emoji is None:
             raise Exception("Emoji not found")
 
-        return self.emojis[index]
+        return emoji
 
     async def get_application_emojis(self) -> list[Emoji]:
-        return [await Emoji.from_raw(self.__client, emoji) for emoji in (await self.__http.get_application_emojis(self.bot_user.id))["items"]]
+        return [Emoji.parse(self.__client, emoji) for emoji in (await self.__http.get_application_emojis(self.bot_user.id))["items"]]
 
     async def create_application_emoji(self, name: str, image: bytes) -> Emoji:
         image = f"data:{get_mime(image)};base64," + base64.b64encode(image).decode()
-        emoji = await Emoji.from_raw(self.__client, await self.__http.create_application_emoji(self.bot_user.id, name, image))
+        emoji = Emoji.parse(self.__client, await self.__http.create_application_emoji(self.bot_user.id, name, image))
         self.emojis.append(emoji)
+        self.emoji_index.rebuild(self.emojis)
         return emoji
 
     async def edit_application_emoji(self, emoji_id: str, *, name: Optional[str] = None, image: Optional[bytes] = None) -> Emoji:
@@ -351,9 +936,10 @@ class Gateway:
 
         del self.emojis[index]
 
-        emoji = await Emoji.from_raw(self.__client, await self.__http.edit_application_emoji(self.bot_user.id, emoji_id, name=name, image=image))
+        emoji = Emoji.parse(self.__client, await self.__http.edit_application_emoji(self.bot_user.id, emoji_id, name=name, image=image))
 
         self.emojis.insert(index, emoji)
+        self.emoji_index.rebuild(self.emojis)
 
         return emoji
 
@@ -366,30 +952,186 @@ class Gateway:
         await self.__http.delete_application_emoji(emoji_id)
 
         del self.emojis[index]
+        self.emoji_index.rebuild(self.emojis)
 
     async def fetch_user(self, user_id: str) -> dict | str:
         if not ID_PATTERN.match(user_id):
             raise ValueError("invalid user_id")
         return await self.__http.request(Route("GET", "users", user_id))
 
+    async def commit(self, batch: CacheBatch) -> None:
+        # encoding is the expensive part, callers await it before parsing mutates the payload
+        if batch:
+            self.backend_queue.put_nowait(await self.loop.run_in_executor(None, batch.encode))
+
+    async def read_backend(self, function: Callable, *args) -> Any:
+        return await self.loop.run_in_executor(None, function, *args)
+
+    async def backend_writer(self) -> None:
+        while True:
+            operations = await self.backend_queue.get()
+
+            while not self.backend_queue.empty():
+                operations += self.backend_queue.get_nowait()
+
+            try:
+                await self.loop.run_in_executor(None, self.cache_backend.write, operations)
+            except Exception:
+                traceback.print_exc()
+
+    def flush_backend(self) -> None:
+        operations = []
+
+        while not self.backend_queue.empty():
+            operations += self.backend_queue.get_nowait()
+
+        if operations:
+            self.cache_backend.write(operations)
+
+    def store_guild(self, batch: CacheBatch, guild: dict) -> None:
+        guild_id = guild["id"]
+
+        batch.set("guilds", guild_id, {key: value for key, value in guild.items() if key not in GUILD_COLLECTIONS})
+
+        for namespace in ("roles", "emojis", "stickers", "channels"):
+            batch.clear(namespace + ":" + guild_id)
+
+        for namespace in ("roles", "emojis", "stickers"):
+            batch.set_many(namespace + ":" + guild_id, ((item["id"], item) for item in guild.get(namespace, ())))
+
+        for channel in guild.get("channels", []) + guild.get("threads", []):
+            self.store_channel(batch, guild_id, channel)
+
+        if guild.get("member_count") == len(guild.get("members", ())):
+            batch.retain("members:" + guild_id, (member["user"]["id"] for member in guild["members"]))
+
+        self.store_members(batch, guild_id, guild.get("members", ()))
+
+    def store_channel(self, batch: CacheBatch, guild_id: str, channel: dict) -> None:
+        batch.set("channels:" + guild_id, channel["id"], {**channel, "guild_id": guild_id})
+        batch.set("channels", channel["id"], {"guild_id": guild_id})
+
+    def unstore_channel(self, batch: CacheBatch, guild_id: str, channel_id: str) -> None:
+        batch.delete("channels:" + guild_id, channel_id)
+        batch.delete("channels", channel_id)
+
+    def store_members(self, batch: CacheBatch, guild_id: str, members: list[dict]) -> None:
+        members = [member for member in members if isinstance(member.get("user"), dict)]
+
+        batch.set_many("members:" + guild_id, ((member["user"]["id"], member) for member in members))
+        batch.set_many("users", ((member["user"]["id"], member["user"]) for member in members))
+
+    def unstore_guild(self, batch: CacheBatch, guild: Guild) -> None:
+        batch.delete("guilds", guild.id)
+
+        for namespace in ("roles", "emojis", "stickers", "members", "channels"):
+            batch.clear(namespace + ":" + guild.id)
+
+        for channel in guild.channels + guild.threads:
+            batch.delete("channels", channel.id)
+
+    def cache_member(self, guild: Guild, member: Member) -> Member:
+        if (self.bot_user is not MISSING and member.user.id == self.bot_user.id) or self.member_cache_policy.should_cache(member):
+            guild.members[member.user.id] = member
+            self.users[member.user.id] = member.user
+        else:
+            guild.members.pop(member.user.id, None)
+
+        return member
+
+    def rename_user(self, user: User) -> None:
+        # the same user can be a member of many guilds, each indexing it by name
+        for guild in self.guilds:
+            member = guild.members.get(user.id)
+
+            if member is None:
+                continue
+
+            member.user = user
+            guild.members.reindex(user.id)
+
+        if user.id in self.users:
+            self.users[user.id] = user
+
+    def cache_members(self, guild: Guild, members: list[Member]) -> None:
+        bot_user_id = self.bot_user.id if self.bot_user is not MISSING else None
+        cached = {member.user.id: member for member in members if member.user.id == bot_user_id or self.member_cache_policy.should_cache(member)}
+
+        for member in members:
+            if member.user.id not in cached:
+                guild.members.pop(member.user.id, None)
+
+        guild.members.update(cached)
+        self.users.update({user_id: member.user for user_id, member in cached.items()})
+
+    async def reap(self, batch_size: int = 1000) -> int:
+        if self.member_cache_policy.everyone:
+            return 0
+
+        self.member_cache_policy.expire()
+
+        bot_user_id = self.bot_user.id if self.bot_user is not MISSING else None
+        checked = 0
+
+        for guild in list(self.guilds):
+            for user_id, member in list(guild.members.items()):
+                if member.user.id != bot_user_id and member is not guild.owner and not self.member_cache_policy.should_cache(member) and guild.members.get(user_id) is member:
+                    del guild.members[user_id]
+
+                checked += 1
+
+                if checked % batch_size == 0:
+                    await asyncio.sleep(0)
+
+        # collected in one pass after the last yield so users cached meanwhile are kept
+        user_ids = {bot_user_id}
+
+        for guild in self.guilds:
+            user_ids.update(guild.members)
+
+        reaped = [user_id for user_id in self.users if user_id not in user_ids]
+
+        for user_id in reaped:
+            del self.users[user_id]
+
+        return len(reaped)
+
+    async def reaper_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.member_cache_policy.reap_interval)
+
+            try:
+                await self.reap()
+            except Exception:
+                traceback.print_exc()
+
     async def get_user(self, user: dict | str) -> User:
-        if isinstance(user, str) and user in self.users:
-            return self.users[user]
-
-        for cached_user in self.users.values():
-            if isinstance(user, str):
-                if user.lower() in (cached_user.username.lower(), cached_user.id) + \
-                                   ((cached_user.global_name.lower(),) if cached_user.global_name else ()):
-                    return cached_user
-            elif isinstance(user, dict):
-                if user["id"] == cached_user.id:
-                    return cached_user
+        if isinstance(user, int):
+            user = str(user)
 
         if isinstance(user, str):
-            user = await self.fetch_user(user)        
+            cached_user = self.users.get(user) or self.users.find(user)
+        else:
+            cached_user = self.users.get(user["id"])
 
-        user = await User.from_raw(self.__client, user)
-        self.users[user.id] = user
+        if cached_user is not None:
+            return cached_user
+
+        if isinstance(user, str) and self.cache_backend is not None:
+            user = await self.read_backend(self.cache_backend.get, "users", user) or user
+
+        if isinstance(user, str):
+            user = await self.fetch_user(user)
+
+            if self.cache_backend is not None:
+                batch = self.cache_backend.batch()
+                batch.set("users", user["id"], user)
+                await self.commit(batch)
+
+        user = User.parse(self.__client, user)
+
+        if self.cache_backend is None:
+            self.users[user.id] = user
 
         return user
 
@@ -398,10 +1140,16 @@ class Gateway:
         if "guild_id" not in channel:
             return
 
+        if self.cache_backend is not None:
+            batch = self.cache_backend.batch()
+            self.store_channel(batch, channel["guild_id"], channel)
+            await self.commit(batch)
+
         guild = self.get_guild(channel["guild_id"])
-        channel = await Channel.from_raw(self.__client, channel)
+        channel = Channel.parse(self.__client, channel)
 
         guild.channels.append(channel)
+        self.index_channel(guild, channel)
 
         return channel,
 
@@ -410,13 +1158,20 @@ class Gateway:
         if "guild_id" not in channel:
             return
 
+        if self.cache_backend is not None:
+            batch = self.cache_backend.batch()
+            self.store_channel(batch, channel["guild_id"], channel)
+            await self.commit(batch)
+
         guild = self.get_guild(channel["guild_id"])
-        channel = await Channel.from_raw(self.__client, channel)
+        channel = Channel.parse(self.__client, channel)
 
         index = get_index(guild.channels, channel.id, key=lambda c: c.id)
 
-        old_channel = Channel(**guild.channels[index].__dict__)
+        old_channel = copy.copy(guild.channels[index])
         guild.channels[index] = channel
+        self.index_channel(guild, channel)
+        guild.invalidate_permissions()
 
         return old_channel, channel
 
@@ -425,101 +1180,267 @@ class Gateway:
         if "guild_id" not in channel:
             return
 
+        if self.cache_backend is not None:
+            batch = self.cache_backend.batch()
+            self.unstore_channel(batch, channel["guild_id"], channel["id"])
+            await self.commit(batch)
+
         guild = self.get_guild(channel["guild_id"])
 
         index = get_index(guild.channels, channel["id"], key=lambda c: c.id)
 
         channel = guild.channels[index]
         del guild.channels[index]
+        guild.invalidate_permissions()
+        self.unindex_channel(channel.id)
 
         return channel,
 
     @handler.event
     async def thread_create(self, thread):
+        if self.cache_backend is not None:
+            batch = self.cache_backend.batch()
+            self.store_channel(batch, thread["guild_id"], thread)
+            await self.commit(batch)
+
         guild = self.get_guild(thread["guild_id"])
-        thread = await Channel.from_raw(self.__client, thread)
+        thread = Channel.parse(self.__client, thread)
 
         guild.threads.append(thread)
+        self.index_channel(guild, thread)
 
         return thread,
 
     @handler.event
     async def thread_update(self, thread):
+        if self.cache_backend is not None:
+            batch = self.cache_backend.batch()
+            self.store_channel(batch, thread["guild_id"], thread)
+            await self.commit(batch)
+
         guild = self.get_guild(thread["guild_id"])
-        thread = await Channel.from_raw(self.__client, thread)
+        thread = Channel.parse(self.__client, thread)
 
         index = get_index(guild.threads, thread.id, key=lambda t: t.id)
 
         if index is None:
             return
 
-        old_thread = Channel(**guild.threads[index].__dict__)
+        old_thread = copy.copy(guild.threads[index])
         guild.threads[index] = thread
+        self.index_channel(guild, thread)
 
         return old_thread, thread
 
     @handler.event
     async def thread_delete(self, thread):
+        if self.cache_backend is not None:
+            batch = self.cache_backend.batch()
+            self.unstore_channel(batch, thread["guild_id"], thread["id"])
+            await self.commit(batch)
+
         guild = self.get_guild(thread["guild_id"])
 
         index = get_index(guild.threads, thread["id"], key=lambda t: t.id)
 
         thread = guild.threads[index]
         del guild.threads[index]
+        guild.invalidate_permissions(channel_id=thread.id)
+        self.unindex_channel(thread.id)
 
         return thread,
 
-    async def add_members(self, guild: Guild, members: list[dict], presences: list[dict]) -> None:
+    async def add_members(self, guild: Guild, members: list[dict], presences: list[dict], voice_states: Optional[SnowflakeDict[dict]] = None) -> list[Member]:
+        presences_by_user = {presence["user"]["id"]: presence for presence in presences or () if "user" in presence}
+
+        if voice_states is None:
+            voice_states = self.pending_voice_states.get(guild.id)
+        owner = guild.owner
+        owner_id = owner.user.id if isinstance(owner, Member) else owner
+        bot_user_id = self.bot_user.id if self.bot_user is not MISSING else None
+
+        added: list[Member] = []
+        batch: list[Member] = []
+        busy_time = 0
+        slice_start = time.perf_counter()
+
         for member in members:
             if isinstance(member["user"], User):
                 user = member["user"]
             elif member["user"]["id"] in self.users:
                 user = self.users[member["user"]["id"]]
             else:
-                user = await User.from_raw(self.__client, member["user"])
-                self.users[user.id] = user
-
-            await asyncio.sleep(0)
+                user = User.parse(self.__client, member["user"])
 
-            if isinstance(guild.owner, Member) and user.id == guild.owner.user.id:
-                member = guild.owner
+            if isinstance(owner, Member) and user.id == owner_id:
+                member = owner
             else:
-                member = await Member.from_raw(self.__client, guild, member, user)
+                member = Member.parse(self.__client, guild, member, user)
 
-            if member.user.id == guild.owner:
+            if member.user.id == owner_id:
                 guild.owner = member
-            if member.user.id == self.bot_user.id:
+            if member.user.id == bot_user_id:
                 guild.me = member
 
-            guild.members[member.user.id] = member
+            presence = presences_by_user.get(member.user.id)
 
-            if presences:
-                for presence in presences:
-                    if "user" in presence and presence["user"]["id"] == member.user.id:
-                        member.presence = await Presence.from_raw(self.__client, presence)
-                    await asyncio.sleep(0)
+            if presence is not None:
+                member.presence = Presence.parse(self.__client, presence)
+
+            voice_state = voice_states.pop(member.user.id, None) if voice_states else None
+
+            if voice_state is not None:
+                member.voice_state = self.parse_voice_state(guild, voice_state)
+
+            batch.append(member)
+
+            if time.perf_counter() - slice_start >= self.ingest_time_budget:
+                self.cache_members(guild, batch)
+                self.ingested_members += len(batch)
+                added += batch
+                batch = []
+                busy_time += time.perf_counter() - slice_start
+                await asyncio.sleep(0)
+                slice_start = time.perf_counter()
+
+        self.cache_members(guild, batch)
+        self.ingested_members += len(batch)
+        self.ingest_time += busy_time + time.perf_counter() - slice_start
+        added += batch
+
+        return added
+
+    def parse_voice_state(self, guild: Guild, voice_state: dict) -> VoiceState:
+        channel_id = voice_state.get("channel_id")
+
+        parsed_voice_state = VoiceState.parse(self.__client, voice_state)
+        parsed_voice_state.guild = guild
+        parsed_voice_state.channel = guild.get_channel(channel_id) if channel_id is not None else None
+
+        return parsed_voice_state
+
+    def admit_member(self, guild: Guild, user_id: str, presence: Optional[dict] = None) -> None:
+        pending = self.pending_admissions.setdefault(guild.id, SnowflakeDict())
+        pending[user_id] = presence
+
+        if len(pending) == 1:
+            self.loop.create_task(self.flush_admissions(guild))
+
+    async def flush_admissions(self, guild: Guild) -> None:
+        await asyncio.sleep(ADMISSION_WINDOW)
+
+        pending = self.pending_admissions.pop(guild.id, None)
+
+        if not pending:
+            return
+
+        user_ids = list(pending)
+        batches = [user_ids[index:index + 100] for index in range(0, len(user_ids), 100)]
+
+        for _ in range(ADMISSION_ATTEMPTS):
+            if self.get_guild(guild.id) is not guild:
+                return
+
+            try:
+                results = await asyncio.gather(*(self.request_guild_members(guild.id, user_ids=batch, limit=len(batch), priority=ADMISSION_PRIORITY) for batch in batches))
+                break
+            except asyncio.CancelledError:
+                return
+            except asyncio.TimeoutError:
+                continue
+        else:
+            logging.warning(f"dropped {len(user_ids)} member admissions for guild {guild.id} after {ADMISSION_ATTEMPTS} attempts")
+            return
+
+        for member in (member for result in results for member in result):
+            presence = pending.get(member.user.id)
+
+            if presence is not None:
+                member.presence = Presence.parse(self.__client, presence)
+
+            self.cache_member(guild, member)
 
     @handler.event
     async def guild_create(self, guild):
         members = guild["members"]
         presences = guild["presences"]
+        voice_states = guild.get("voice_states", [])
+
+        if self.cache_backend is not None:
+            batch = self.cache_backend.batch()
+            self.store_guild(batch, guild)
+            await self.commit(batch)
 
-        guild = await Guild.from_raw(self.__client, guild)
-        self.guilds.append(guild)
+        restored = self.get_guild(guild["id"]) if Snowflake.key(guild["id"]) in self.restored_guild_ids else None
+        listed = {Snowflake.key(member["user"]["id"]) for member in members}
 
-        if guild.member_count != len(members):
-            await self.ws.send(Opcodes.REQUEST_GUILD_MEMBERS, {"guild_id": guild.id, "query": "", "limit": 0, "presences": self.__client.intents.has(IntentsEnum.GUILD_PRESENCES)})
+        guild = Guild.parse(self.__client, guild)
+
+        if restored is not None:
+            self.unindex_guild(restored)
+            self.guilds[:] = [guild if cached_guild is restored else cached_guild for cached_guild in self.guilds]
+            self.restored_guild_ids.discard(guild.id)
+
+            # a partial payload keeps the snapshot's other members until a full chunk says who is still there
+            if guild.member_count != len(members):
+                merged = [user_id for user_id in restored.members if user_id not in listed and user_id not in guild.members]
+
+                for user_id in merged:
+                    guild.members[user_id] = restored.members[user_id]
+
+                self.restored_members[guild.id] = set(merged)
         else:
-            self.loop.create_task(self.add_members(guild, members, presences))
+            self.guilds.append(guild)
+
+        self.guild_ids.add(guild.id)
+        self.index_guild(guild)
+
+        voice_states_by_user = SnowflakeDict({voice_state["user_id"]: voice_state for voice_state in voice_states})
+
+        if guild.member_count != len(members) and self.chunk_guilds_at_startup:
+            # held for the chunks, dropped once the full request completes or fails
+            if voice_states_by_user:
+                self.pending_voice_states[guild.id] = voice_states_by_user
+
+            self.request_guild_members(guild.id)
+        else:
+            guild.chunked = guild.member_count == len(members)
+            self.loop.create_task(self.add_members(guild, members, presences, voice_states_by_user))
+
+            if not guild.chunked and (self.member_cache_policy.voice or self.member_cache_policy.online):
+                if self.member_cache_policy.voice:
+                    for voice_state in voice_states:
+                        if Snowflake.key(voice_state["user_id"]) not in listed:
+                            self.admit_member(guild, voice_state["user_id"])
+
+                if self.member_cache_policy.online:
+                    for presence in presences:
+                        if Snowflake.key(presence["user"]["id"]) not in listed and presence["status"] not in ("offline", "invisible"):
+                            self.admit_member(guild, presence["user"]["id"], presence)
 
         return guild,
 
     @handler.event
     async def guild_members_chunk(self, chunk):
-        self.loop.create_task(self.add_members(self.get_guild(chunk["guild_id"]), chunk["members"], chunk["presences"]))
+        if self.cache_backend is not None:
+            batch = self.cache_backend.batch()
+            self.store_members(batch, chunk["guild_id"], chunk["members"])
+            await self.commit(batch)
+
+        task = self.loop.create_task(self.add_members(self.get_guild(chunk["guild_id"]), chunk["members"], chunk.get("presences")))
+        self.chunker.received(chunk, task)
 
         return chunk,
 
+    @handler.event
+    async def user_update(self, user):
+        old_user = self.bot_user
+        self.bot_user_data = dict(user)
+        self.bot_user = User.parse(self.__client, user)
+        self.rename_user(self.bot_user)
+
+        return old_user, self.bot_user
+
     @handler.event
     async def presence_update(self, presence):
         if "guild_id" not in presence:
@@ -530,26 +1451,37 @@ class Gateway:
         if not guild:
             return
         
+        self.member_cache_policy.seen(presence["user"]["id"])
+
         member = guild.members.get(presence["user"]["id"])
 
         if not member:
+            if self.member_cache_policy.online and presence["status"] not in ("offline", "invisible"):
+                self.admit_member(guild, presence["user"]["id"], presence)
+
             return
         
-        member.presence = await Presence.from_raw(self.__client, presence)
+        member.presence = Presence.parse(self.__client, presence)
+
+        self.cache_member(guild, member)
 
         return member,
 
     @handler.event
     async def guild_update(self, guild):
-        index = get_index(self.guilds, guild["id"], key=lambda g: g.id)
+        if self.cache_backend is not None:
+            batch = self.cache_backend.batch()
+            batch.set("guilds", guild["id"], {key: value for key, value in guild.items() if key not in GUILD_COLLECTIONS})
+            await self.commit(batch)
 
-        old_guild = copy.copy(self.guilds[index])
+        guild_object = self.get_guild(guild["id"])
 
-        guild_object = self.guilds[index]
+        old_guild = copy.copy(guild_object)
 
         guild_object.premium_tier = guild["premium_tier"]
         guild_object.discovery_splash = guild["discovery_splash"]
         guild_object.owner = await guild_object.get_member(guild["owner_id"])
+        guild_object.invalidate_permissions()
         guild_object.banner = guild["banner"]
         guild_object.features = guild["features"]
         guild_object.premium_progress_bar_enabled = guild["premium_progress_bar_enabled"]
@@ -610,17 +1542,27 @@ class Gateway:
 
         index = get_index(self.guilds, guild.id, key=lambda g: g.id)
         del self.guilds[index]
+        self.guild_ids.discard(guild.id)
+        self.pending_voice_states.pop(guild.id, None)
+        self.pending_admissions.pop(guild.id, None)
+        self.restored_members.pop(guild.id, None)
+        self.unindex_guild(guild)
+
+        if self.cache_backend is not None:
+            batch = self.cache_backend.batch()
+            self.unstore_guild(batch, guild)
+            await self.commit(batch)
 
         return guild,
 
-    @handler.event
+    @handler.parser
     async def guild_ban_add(self, ban):
         guild = self.get_guild(ban["guild_id"])
         user = await self.get_user(ban["user"])
 
         return guild, user
 
-    @handler.event
+    @handler.parser
     async def guild_ban_remove(self, ban):
         guild = self.get_guild(ban["guild_id"])
         user = await self.get_user(ban["user"])
@@ -629,27 +1571,48 @@ class Gateway:
 
     @handler.event
     async def guild_emojis_update(self, emojis):
+        if self.cache_backend is not None:
+            batch = self.cache_backend.batch()
+            batch.clear("emojis:" + emojis["guild_id"])
+            batch.set_many("emojis:" + emojis["guild_id"], ((emoji["id"], emoji) for emoji in emojis["emojis"]))
+            await self.commit(batch)
+
         guild = self.get_guild(emojis["guild_id"])
 
-        old_emojis = [Emoji(**emoji.__dict__) for emoji in guild.emojis]
-        guild.emojis = [await Emoji.from_raw(self.__client, emoji) for emoji in emojis["emojis"]]
+        old_emojis = [copy.copy(emoji) for emoji in guild.emojis]
+        guild.emojis = [Emoji.parse(self.__client, emoji) for emoji in emojis["emojis"]]
+        guild.emoji_index.rebuild(guild.emojis)
 
         return old_emojis, guild.emojis
 
     @handler.event
     async def guild_stickers_update(self, stickers):
+        if self.cache_backend is not None:
+            batch = self.cache_backend.batch()
+            batch.clear("stickers:" + stickers["guild_id"])
+            batch.set_many("stickers:" + stickers["guild_id"], ((sticker["id"], sticker) for sticker in stickers["stickers"]))
+            await self.commit(batch)
+
         guild = self.get_guild(stickers["guild_id"])
 
-        old_stickers = [Sticker(**sticker.__dict__) for sticker in guild.stickers]
-        guild.stickers = [await Sticker.from_raw(self.__client, sticker) for sticker in stickers["stickers"]]
+        old_stickers = [copy.copy(sticker) for sticker in guild.stickers]
+        guild.stickers = [Sticker.parse(self.__client, sticker) for sticker in stickers["stickers"]]
+        guild.sticker_index.rebuild(guild.stickers)
 
         return old_stickers, guild.stickers
 
     @handler.event
     async def guild_member_add(self, member):
+        if self.cache_backend is not None:
+            batch = self.cache_backend.batch()
+            self.store_members(batch, member["guild_id"], [member])
+            await self.commit(batch)
+
         guild = self.get_guild(member["guild_id"])
         del member["guild_id"]
 
+        self.member_cache_policy.seen(member["user"]["id"])
+
         member = await guild.get_member(member)
 
         return guild, member
@@ -659,30 +1622,48 @@ class Gateway:
         if not self.guilds:
             return
 
+        if self.cache_backend is not None:
+            batch = self.cache_backend.batch()
+            self.store_members(batch, member["guild_id"], [{key: value for key, value in member.items() if key != "guild_id"}])
+            await self.commit(batch)
+
         guild = self.get_guild(member["guild_id"])
 
         if guild is None:
             return None, None, member
 
         try:
-            old_member = Member(**(await guild.get_member(member["user"]["id"])).__dict__)
+            old_member = copy.copy(await guild.get_member(member["user"]["id"]))
         except HTTPException:
             return
 
         del member["guild_id"]
 
-        user = await User.from_raw(self.__client, member["user"])
+        user = User.parse(self.__client, member["user"])
         del member["user"]
 
-        self.users[user.id] = user
+        member = Member.parse(self.__client, guild, member, user)
+        member.presence = old_member.presence
+        member.voice_state = old_member.voice_state
 
-        member = await Member.from_raw(self.__client, guild, member, user)
-        guild.members[member.user.id] = member
+        if user.id in self.users:
+            self.users[user.id] = user
+
+        self.cache_member(guild, member)
+        guild.invalidate_permissions(user_id=user.id)
+
+        if (old_member.user.username, old_member.user.global_name) != (user.username, user.global_name):
+            self.rename_user(user)
 
         return guild, old_member, member
 
     @handler.event
     async def guild_member_remove(self, user):
+        if self.cache_backend is not None:
+            batch = self.cache_backend.batch()
+            batch.delete("members:" + user["guild_id"], user["user"]["id"])
+            await self.commit(batch)
+
         guild = self.get_guild(user["guild_id"])
 
         if not guild:
@@ -693,31 +1674,55 @@ class Gateway:
         if user.id in guild.members:
             del guild.members[user.id]
 
+        guild.invalidate_permissions(user_id=user.id)
+
+        if not any(user.id in cached_guild.members for cached_guild in self.guilds):
+            self.member_cache_policy.forget(user.id)
+
         return guild, user
 
     @handler.event
     async def guild_role_create(self, role):
+        if self.cache_backend is not None:
+            batch = self.cache_backend.batch()
+            batch.set("roles:" + role["guild_id"], role["role"]["id"], role["role"])
+            await self.commit(batch)
+
         guild = self.get_guild(role["guild_id"])
 
-        role = await Role.from_raw(self.__client, role["role"])
+        role = Role.parse(self.__client, role["role"])
         guild.roles.append(role)
+        guild.role_index.rebuild(guild.roles)
+        guild.invalidate_permissions()
 
         return guild, role
 
     @handler.event
     async def guild_role_update(self, role):
+        if self.cache_backend is not None:
+            batch = self.cache_backend.batch()
+            batch.set("roles:" + role["guild_id"], role["role"]["id"], role["role"])
+            await self.commit(batch)
+
         guild = self.get_guild(role["guild_id"])
-        role = await Role.from_raw(self.__client, role["role"])
+        role = Role.parse(self.__client, role["role"])
 
         index = get_index(guild.roles, role.id, key=lambda r: r.id)
 
-        old_role = Role(**guild.roles[index].__dict__)
+        old_role = copy.copy(guild.roles[index])
         guild.roles[index] = role
+        guild.role_index.rebuild(guild.roles)
+        guild.invalidate_permissions()
 
         return guild, old_role, role
 
     @handler.event
     async def guild_role_delete(self, role):
+        if self.cache_backend is not None:
+            batch = self.cache_backend.batch()
+            batch.delete("roles:" + role["guild_id"], role["role_id"])
+            await self.commit(batch)
+
         guild = self.get_guild(role["guild_id"])
 
         role = guild.get_role(role["role_id"])
@@ -727,15 +1732,20 @@ class Gateway:
 
         index = get_index(guild.roles, role.id, key=lambda r: r.id)
         del guild.roles[index]
+        guild.role_index.rebuild(guild.roles)
+        guild.invalidate_permissions()
 
         return guild, role
 
-    @handler.event
+    @handler.parser
     async def interaction_create(self, interaction):
         return await Interaction.from_raw(self.__client, interaction),
 
     @handler.event
     async def message_create(self, message):
+        if "author" in message:
+            self.member_cache_policy.seen(message["author"]["id"])
+
         message = await Message.from_raw(self.__client, message)
 
         self.cache_message(message)
@@ -744,13 +1754,12 @@ class Gateway:
 
     @handler.event
     async def message_update(self, message):
-        index = get_index(self.messages, message["id"], key=lambda m: m.id)
+        old_message = self.messages.get(message["id"])
 
-        if index is None:
+        if old_message is None:
             return None, None
 
-        old_message = self.messages[index]
-        new_message = Message(**old_message.__dict__)
+        new_message = copy.copy(old_message)
 
         if "content" in message:
             new_message.content = message["content"]
@@ -759,37 +1768,29 @@ class Gateway:
         if "attachments" in message:
             new_message.attachments = [Attachment(**attachment) for attachment in message["attachments"]]
         if "embeds" in message:
-            new_message.embeds = [await Embed.from_raw(self.__client, embed) for embed in message["embeds"]]
+            new_message.embeds = [Embed.parse(self.__client, embed) for embed in message["embeds"]]
         if "components" in message:
-            new_message.components = [await MessageComponents.from_raw(self.__client, component) for component in message["components"]]
+            new_message.components = [MessageComponents.parse(self.__client, component) for component in message["components"]]
 
-        self.messages[index] = new_message
+        self.messages.add(new_message)
 
         return old_message, new_message
 
     @handler.event
     async def message_delete(self, message):
-        index = get_index(self.messages, message["id"], key=lambda m: m.id)
+        cached_message = self.messages.remove(message["id"])
 
-        if index is None:
+        if cached_message is None:
             return message["id"],
 
-        message = self.messages[index]
-        del self.messages[index]
-
-        return message,
+        return cached_message,
 
-    @handler.event
+    @handler.parser
     async def message_delete_bulk(self, message):
         messages = []
 
         for message_id in message["ids"]:
-            index = get_index(self.messages, message_id, key=lambda m: m.id)
-
-            if index is None:
-                messages.append(message_id)
-            else:
-                messages.append(self.messages[index])
+            messages.append(self.messages.get(message_id) or message_id)
 
         return messages,
 
@@ -802,24 +1803,22 @@ class Gateway:
         if user is None:
             return
 
-        emoji = await Emoji.from_raw(self.__client, reaction["emoji"])
+        emoji = Emoji.parse(self.__client, reaction["emoji"])
 
-        index = get_index(self.messages, reaction["message_id"], key=lambda m: m.id)
+        message = self.messages.get(reaction["message_id"])
 
-        if index is None:
+        if message is None:
             message = reaction["message_id"]
             # message = Message(self.__client, id=reaction["message_id"], channel=reaction["channel_id"])
             # self.loop.create_task(message._resolve())
         else:
-            message = self.messages[index]
-
             if emoji.id is not None:
                 reaction_index = get_index(message.reactions, emoji.id, key=lambda r: r.emoji.id)
             else:
                 reaction_index = get_index(message.reactions, emoji.name, key=lambda r: r.emoji.name)
 
             if reaction_index is None:
-                reaction_object = await MessageReaction.from_raw(self.__client, reaction)
+                reaction_object = MessageReaction.parse(self.__client, reaction)
                 message.reactions.append(reaction_object)
             else:
                 reaction_object = message.reactions[reaction_index]
@@ -842,15 +1841,13 @@ class Gateway:
         if user is None:
             return
 
-        emoji = await Emoji.from_raw(self.__client, reaction["emoji"])
+        emoji = Emoji.parse(self.__client, reaction["emoji"])
 
-        index = get_index(self.messages, reaction["message_id"], key=lambda m: m.id)
+        message = self.messages.get(reaction["message_id"])
 
-        if index is None:
+        if message is None:
             message = reaction["message_id"]
         else:
-            message = self.messages[index]
-            
             if emoji.id is not None:
                 reaction_index = get_index(message.reactions, emoji.id, key=lambda r: r.emoji.id)
             else:
@@ -869,32 +1866,28 @@ class Gateway:
 
         return guild, channel, user, message, emoji
 
-    @handler.event
+    @handler.parser
     async def message_reaction_remove_all(self, reaction):
         guild = self.get_guild(reaction["guild_id"])
         channel = guild.get_channel(reaction["channel_id"])
 
-        index = get_index(self.messages, reaction["message_id"], key=lambda m: m.id)
+        message = self.messages.get(reaction["message_id"])
 
-        if index is None:
+        if message is None:
             message = reaction["message_id"]
-        else:
-            message = self.messages[index]
 
         return guild, channel, message
 
-    @handler.event
+    @handler.parser
     async def message_reaction_remove_emoji(self, reaction):
         guild = self.get_guild(reaction["guild_id"])
         channel = guild.get_channel(reaction["channel_id"])
-        emoji = await Emoji.from_raw(self.__client, reaction["emoji"])
+        emoji = Emoji.parse(self.__client, reaction["emoji"])
 
-        index = get_index(self.messages, reaction["message_id"], key=lambda m: m.id)
+        message = self.messages.get(reaction["message_id"])
 
-        if index is None:
+        if message is None:
             message = reaction["message_id"]
-        else:
-            message = self.messages[index]
 
         return guild, channel, message, emoji
 
@@ -918,13 +1911,25 @@ class Gateway:
         if guild is None:
             return
 
-        member = await guild.get_member(voice_state["user_id"])
+        self.member_cache_policy.seen(voice_state["user_id"])
 
-        old_voice_state = VoiceState(**member.voice_state.__dict__)
+        pending = self.pending_voice_states.get(guild.id)
 
-        _voice_state = await VoiceState.from_raw(self.__client, voice_state)
+        if pending is not None:
+            if voice_state["channel_id"] is None:
+                pending.pop(voice_state["user_id"], None)
+            else:
+                pending[voice_state["user_id"]] = {key: value for key, value in voice_state.items() if key != "member"}
+
+        member = await guild.get_member(voice_state["member"] if "member" in voice_state else voice_state["user_id"])
+
+        old_voice_state = copy.copy(member.voice_state)
+
+        _voice_state = VoiceState.parse(self.__client, voice_state)
         _voice_state.guild = guild
         _voice_state.channel = channel
         member.voice_state = _voice_state
 
+        self.cache_member(guild, member)
+
         return member, old_voice_state, _voice_state
\ No newline at end of file
@@ -24,7 +24,6 @@ from .components import Components
 from .enums import MessageFlags, InteractionCallbackTypes
 from .errors import HTTPException, InvalidArgument
 
-import json
 import logging
 
 from typing import Any, Awaitable, Optional, Sequence, Literal, TYPE_CHECKING, TypedDict, Unpack
@@ -60,6 +59,8 @@ class SearchGuildMessagesKwargs(TypedDict, total=False):
 
 class Route:
     def __init__(self, method: str, *endpoint: str) -> None:
+        endpoint = tuple(str(e) for e in endpoint)
+
         for e in endpoint:
             if ".." in e or "/" in e:
                 raise ValueError
@@ -88,7 +89,8 @@ class HTTP:
     async def __init__(self, client: "Client") -> None:
         client.http = self
         self.loop = asyncio.get_event_loop()
-        self.session: ClientSession = ClientSession(loop=self.loop)
+        self.codec = client.codec
+        self.session: ClientSession = ClientSession(loop=self.loop, json_serialize=self.codec.dumps)
         self.token: str = client.token
         self.bot: bool = client.bot
         self.routes: dict[Route, asyncio.Lock] = {}
@@ -121,7 +123,7 @@ class HTTP:
 
         if files is not None:
             form = FormData()
-            form.add_field("payload_json", json.dumps(data))
+            form.add_field("payload_json", self.codec.dumps(data))
 
             for index, file in enumerate(files):
                 form.add_field("files[%s]" % index, file[1], content_type="application/octet-stream", filename=file[0])
@@ -138,7 +140,7 @@ class HTTP:
                 # TODO: rework logic
 
                 try:
-                    response_data = await response.json()
+                    response_data = await response.json(loads=self.codec.loads)
                 except ContentTypeError:
                     response_data = await response.text()
 
@@ -156,6 +158,9 @@ class HTTP:
 
         return await self.request(route, headers=headers, data=data, params=params, files=files)
 
+    def get_gateway_bot(self) -> Awaitable[dict]:
+        return self.request(Route("GET", "gateway", "bot"))
+
     def get_application_emojis(self, application_id: str) -> Awaitable[dict]:
         return self.request(Route("GET", "applications", application_id, "emojis"))
 
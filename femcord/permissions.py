@@ -17,62 +17,109 @@ limitations under the License.
 from .enums import Permissions as PermissionsEnum
 from .errors import PermissionNotExist
 
-from functools import reduce
+from functools import reduce, lru_cache
 
 __all__ = ("Permissions",)
 
+ALL_PERMISSIONS = reduce(lambda a, b: a | b, (permission.value for permission in PermissionsEnum), 0)
+
+@lru_cache(maxsize=1024)
+def permissions_from_int(value: int) -> tuple[PermissionsEnum, ...]:
+    return tuple(permission for permission in PermissionsEnum if value & permission.value == permission.value)
+
 class Permissions:
+    __slots__ = ("value",)
+
     def __init__(self, *permissions: PermissionsEnum | str) -> None:
-        self.permissions = []
+        self.value = 0
 
         for permission in permissions:
-            self.add(permission)
+            self.value |= self.check(permission).value
 
     def __str__(self) -> str:
-        return "<Permissions permissions={!r} value={!r}>".format(self.permissions, self.get_int())
+        return "<Permissions permissions={!r} value={!r}>".format(self.permissions, self.value)
 
     def __repr__(self) -> str:
-        return "<Permissions permissions={!r} value={!r}>".format(self.permissions, self.get_int())
+        return "<Permissions permissions={!r} value={!r}>".format(self.permissions, self.value)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Permissions):
+            return self.value == other.value
+
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.value)
+
+    def __int__(self) -> int:
+        return self.value
+
+    def __contains__(self, permission: PermissionsEnum | str) -> bool:
+        return self.value & self.check(permission).value != 0
+
+    def __iter__(self):
+        return iter(permissions_from_int(self.value))
+
+    def __or__(self, other: "Permissions") -> "Permissions":
+        return Permissions.from_int(self.value | other.value)
+
+    def __and__(self, other: "Permissions") -> "Permissions":
+        return Permissions.from_int(self.value & other.value)
+
+    def __sub__(self, other: "Permissions") -> "Permissions":
+        return Permissions.from_int(self.value & ~other.value)
+
+    def __xor__(self, other: "Permissions") -> "Permissions":
+        return Permissions.from_int(self.value ^ other.value)
+
+    def __invert__(self) -> "Permissions":
+        return Permissions.from_int(ALL_PERMISSIONS & ~self.value)
+
+    @property
+    def permissions(self) -> list[PermissionsEnum]:
+        return list(permissions_from_int(self.value))
 
     def check(self, permission: PermissionsEnum | str) -> PermissionsEnum:
-        if not isinstance(permission, PermissionsEnum) and permission.upper() in (i.name for i in PermissionsEnum):
-            permission = PermissionsEnum[permission.upper()]
+        if isinstance(permission, PermissionsEnum):
+            return permission
 
-        if not isinstance(permission, PermissionsEnum):
-            raise PermissionNotExist(f"{permission} doesn't exist")
+        if isinstance(permission, str) and permission.upper() in PermissionsEnum.__members__:
+            return PermissionsEnum[permission.upper()]
 
-        return permission
+        raise PermissionNotExist(f"{permission} doesn't exist")
 
     def add(self, permission: PermissionsEnum | str) -> "Permissions":
-        permission = self.check(permission)
-        self.permissions.append(permission)
+        self.value |= self.check(permission).value
 
         return self
 
     def remove(self, permission: PermissionsEnum | str) -> "Permissions":
-        permission = self.check(permission)
-        self.permissions.remove(permission)
+        self.value &= ~self.check(permission).value
 
         return self
 
     def get_int(self) -> int:
-        if not self.permissions:
-            return 0
-
-        return reduce(lambda a, b: a | b, [permission.value for permission in PermissionsEnum if permission in self.permissions])
+        return self.value
 
     def has(self, permission: PermissionsEnum | str) -> bool:
-        permission = self.check(permission)
+        if self.value & PermissionsEnum.ADMINISTRATOR.value:
+            return True
 
-        if PermissionsEnum.ADMINISTRATOR in self.permissions:
+        return self.value & self.check(permission).value != 0
+
+    def has_all(self, permissions: "Permissions") -> bool:
+        if self.value & PermissionsEnum.ADMINISTRATOR.value:
             return True
 
-        return permission in self.permissions
+        return self.value & permissions.value == permissions.value
 
     @classmethod
     def all(cls) -> "Permissions":
-        return cls(*PermissionsEnum)
+        return cls.from_int(ALL_PERMISSIONS)
 
     @classmethod
     def from_int(cls, permissions: int) -> "Permissions":
-        return cls(*(permission for permission in PermissionsEnum if permissions & permission.value == permission.value))
\ No newline at end of file
+        instance = cls.__new__(cls)
+        instance.value = permissions
+
+        return instance
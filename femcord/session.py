@@ -0,0 +1,80 @@
+"""
+Copyright 2022-2026 czubix
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import json
+import time
+import os
+
+from typing import Optional
+
+__all__ = ("SessionStore", "FileSessionStore")
+
+class SessionStore:
+    def load(self, shard_id: Optional[int]) -> dict | None:
+        raise NotImplementedError
+
+    def save(self, shard_id: Optional[int], session: dict) -> None:
+        raise NotImplementedError
+
+    def clear(self, shard_id: Optional[int]) -> None:
+        raise NotImplementedError
+
+class FileSessionStore(SessionStore):
+    def __init__(self, path: str, *, max_age: float = 120) -> None:
+        self.path = path
+        self.max_age = max_age
+
+    def __str__(self) -> str:
+        return "<FileSessionStore path={!r} max_age={!r}>".format(self.path, self.max_age)
+
+    def __repr__(self) -> str:
+        return "<FileSessionStore path={!r} max_age={!r}>".format(self.path, self.max_age)
+
+    def shard_path(self, shard_id: Optional[int]) -> str:
+        root, extension = os.path.splitext(self.path)
+        return "%s.%s%s" % (root, "main" if shard_id is None else shard_id, extension)
+
+    def read(self, shard_id: Optional[int]) -> dict | None:
+        try:
+            with open(self.shard_path(shard_id), "r") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def write(self, shard_id: Optional[int], session: dict) -> None:
+        path = self.shard_path(shard_id)
+        temp_path = "%s.%d.tmp" % (path, os.getpid())
+
+        with open(temp_path, "w") as file:
+            json.dump(session, file)
+
+        os.replace(temp_path, path)
+
+    def load(self, shard_id: Optional[int]) -> dict | None:
+        session = self.read(shard_id)
+
+        if session is None or time.time() - session["time"] > self.max_age:
+            return
+
+        return session
+
+    def save(self, shard_id: Optional[int], session: dict) -> None:
+        self.write(shard_id, {**session, "time": time.time()})
+
+    def clear(self, shard_id: Optional[int]) -> None:
+        try:
+            os.remove(self.shard_path(shard_id))
+        except FileNotFoundError:
+            pass
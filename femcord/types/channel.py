@@ -43,8 +43,9 @@ class PermissionOverwrite:
     role_id: str = None
 
     @classmethod
-    async def from_raw(cls, client, overwrite):
-        overwrite["role_id" if overwrite["type"] == OverwriteTypes.ROLE else "user_id"] = overwrite["id"]
+    def parse(cls, client, overwrite):
+        overwrite["type"] = OverwriteTypes(overwrite["type"])
+        overwrite["role_id" if overwrite["type"] is OverwriteTypes.ROLE else "user_id"] = overwrite["id"]
         overwrite["allow"] = Permissions.from_int(int(overwrite["allow"]))
         overwrite["deny"] = Permissions.from_int(int(overwrite["deny"]))
 
@@ -72,7 +73,7 @@ class ThreadMetadata:
     invitable: bool = None
 
     @classmethod
-    async def from_raw(cls, client, metadata):
+    def parse(cls, client, metadata):
         metadata["archive_timestamp"] = parse_time(metadata["archive_timestamp"])
         metadata["create_timestamp"] = parse_time(metadata["create_timestamp"])
 
@@ -87,7 +88,7 @@ class ThreadMember:
     flags: int = None
 
     @classmethod
-    async def from_raw(cls, client, member):
+    def parse(cls, client, member):
         if "datetime" in member:
             member["datetime"] = parse_time(member["datetime"])
 
@@ -123,18 +124,18 @@ class Channel:
         return "<Channel id={!r} name={!r} type={!r} position={!r}>".format(self.id, self.name, self.type, self.position)
 
     @classmethod
-    async def from_raw(cls, client, channel):
+    def parse(cls, client, channel):
         channel["type"] = ChannelTypes(channel["type"])
         channel["created_at"] = time_from_snowflake(channel["id"])
 
         if "permission_overwrites" in channel:
-            channel["permission_overwrites"] = [await PermissionOverwrite.from_raw(client, overwrite) for overwrite in channel["permission_overwrites"]]
+            channel["permission_overwrites"] = [PermissionOverwrite.parse(client, overwrite) for overwrite in channel["permission_overwrites"]]
         if "last_pin_timestamp" in channel:
             channel["last_pin_timestamp"] = parse_time(channel["last_pin_timestamp"])
         if "thread_metadata" in channel:
-            channel["thread_metadata"] = await ThreadMetadata.from_raw(client, channel["thread_metadata"]) if channel["thread_metadata"] else None
+            channel["thread_metadata"] = ThreadMetadata.parse(client, channel["thread_metadata"]) if channel["thread_metadata"] else None
         if "member" in channel:
-            channel["member"] = await ThreadMember.from_raw(client, channel["member"]) if channel["member"] else None
+            channel["member"] = ThreadMember.parse(client, channel["member"]) if channel["member"] else None
         if "nsfw" not in channel or channel["nsfw"] is None:
             channel["nsfw"] = False
 
@@ -165,9 +166,10 @@ class Channel:
             return [await Message.from_raw(self.__client, message) for message in response]
 
     async def get_message(self, message_id: str) -> "Message":
-        for message in self.__client.gateway.messages:
-            if message.channel == self and message.id == message_id:
-                return message
+        message = self.__client.gateway.messages.get(message_id)
+
+        if message is not None and message.channel == self:
+            return message
 
         message = await self.__client.http.get_message(self.id, message_id)
         message = await Message.from_raw(self.__client, message)
@@ -178,7 +180,7 @@ class Channel:
 
     async def purge(self, *, limit: Optional[int] = None, messages: Optional[Sequence[Type["Message"] | str]] = [], key: Optional[Callable[["Message"], bool]] = None) -> list[dict]:
         if limit is not None:
-            messages += [message for message in self.__client.gateway.messages if message.channel.id == self.id][-limit:]
+            messages += self.__client.gateway.messages.channel(self.id)[-limit:]
 
             if len(messages) < limit:
                 missing_messages = limit - len(messages)
@@ -15,11 +15,36 @@ limitations under the License.
 """
 
 import dataclasses
+
+from ..utils import Snowflake, ID_PATTERN
+
 from typing import TypeVar, Any, Callable, overload, dataclass_transform
 
 
 _T = TypeVar("_T", bound=type)
 
+def used_keys_of(cls):
+    used_keys = set(cls.__annotations__.keys())
+
+    for old_key, new_key in getattr(cls, "__CHANGE_KEYS__", ()):
+        used_keys.discard(new_key)
+        used_keys.add(old_key)
+
+    return frozenset(used_keys)
+
+def prepare(data_argument, used_keys, change_keys):
+    for key in [key for key in data_argument if key not in used_keys]:
+        del data_argument[key]
+
+    if Snowflake.enabled is True:
+        for key, value in data_argument.items():
+            if (key == "id" or key.endswith("_id")) and key != "custom_id" and isinstance(value, str) and ID_PATTERN.fullmatch(value):
+                data_argument[key] = Snowflake(value)
+
+    for old_key, new_key in change_keys:
+        if old_key in data_argument:
+            data_argument[new_key] = data_argument.pop(old_key)
+
 @overload
 def dataclass(cls: _T, **kwargs: Any) -> _T: ...
 
@@ -27,39 +52,43 @@ def dataclass(cls: _T, **kwargs: Any) -> _T: ...
 def dataclass(**kwargs: Any) -> Callable[[_T], _T]: ...
 
 @dataclass_transform()
-def dataclass(cls, **kwargs):
-    if hasattr(cls, "from_raw") is True:
-        cls.original_from_raw = cls.from_raw
+def dataclass(cls=None, **kwargs):
+    if cls is None:
+        return lambda cls: dataclass(cls, **kwargs)
 
-        @classmethod
-        def new_from_raw(cls, client, *args):
-            data_argument = args[0]
+    kwargs.setdefault("slots", True)
+
+    used_keys = used_keys_of(cls)
+    change_keys = getattr(cls, "__CHANGE_KEYS__", ())
+
+    if hasattr(cls, "parse") is True:
+        cls.original_parse = cls.__dict__.get("parse", cls.parse)
 
-            if isinstance(data_argument, cls):
-                return data_argument
+        @classmethod
+        def new_parse(cls, client, *args):
+            if isinstance(args[0], cls):
+                return args[0]
 
-            if len(args) > 1:
-                data_argument = args[1]
+            prepare(args[1] if len(args) > 1 else args[0], used_keys, change_keys)
 
-            used_keys = list(cls.__annotations__.keys())
-            change_keys = getattr(cls, "__CHANGE_KEYS__", ())
+            return cls.original_parse(client, *args)
 
-            for old_key, new_key in change_keys:
-                used_keys.remove(new_key)
-                used_keys.append(old_key)
+        @classmethod
+        async def from_raw(cls, client, *args):
+            return cls.parse(client, *args)
 
-            to_remove = []
+        cls.parse = new_parse
+        cls.from_raw = from_raw
 
-            for key in data_argument:
-                if key not in used_keys:
-                    to_remove.append(key)
+    elif hasattr(cls, "from_raw") is True:
+        cls.original_from_raw = cls.__dict__.get("from_raw", cls.from_raw)
 
-            for key in to_remove:
-                del data_argument[key]
+        @classmethod
+        def new_from_raw(cls, client, *args):
+            if isinstance(args[0], cls):
+                return args[0]
 
-            for old_key, new_key in change_keys:
-                if old_key in data_argument:
-                    data_argument[new_key] = data_argument.pop(old_key)
+            prepare(args[1] if len(args) > 1 else args[0], used_keys, change_keys)
 
             return cls.original_from_raw(client, *args)
 
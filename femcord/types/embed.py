@@ -105,7 +105,7 @@ class Embed:
     placeholder_version: Any = None
 
     @classmethod
-    async def from_raw(cls, client, embed):
+    def parse(cls, client, embed):
         if "timestamp" in embed:
             embed["timestamp"] = parse_time(embed["timestamp"])
         if "footer" in embed:
@@ -48,7 +48,7 @@ class Emoji:
         return "https://cdn.discordapp.com/emojis/" + self.id + extension
 
     @classmethod
-    async def from_raw(cls, client, emoji):
+    def parse(cls, client, emoji):
         if emoji.get("id", None) is not None:
             emoji["created_at"] = time_from_snowflake(emoji["id"])
 
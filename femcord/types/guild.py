@@ -18,8 +18,10 @@ from .dataclass import dataclass
 
 from ..http import Route, SearchGuildMessagesKwargs
 from ..enums import VerificationLevel, DefaultMessageNotification, ExplicitContentFilter, NSFWLevel, MfaLevel, AuditLogEvents
-from ..utils import get_index, parse_time, time_from_snowflake, ID_PATTERN
+from ..utils import get_index, parse_time, time_from_snowflake, ID_PATTERN, Snowflake
 from ..errors import InvalidArgument
+from ..cache import MemberCache, ModelIndex
+from ..permissions import Permissions
 
 from .channel import Channel
 from .user import User
@@ -29,6 +31,8 @@ from .sticker import Sticker
 from .member import Member
 from .message import Message
 
+from dataclasses import field
+from asyncio import gather, wait_for
 from datetime import datetime
 
 from typing import Optional, TYPE_CHECKING, Any, Unpack
@@ -48,7 +52,7 @@ class WelcomeScreenChannel:
     emoji_name: str
 
     @classmethod
-    async def from_raw(cls, client: "Client", channels: list[Channel], channel: dict):
+    def parse(cls, client: "Client", channels: list[Channel], channel: dict):
         channel["channel"] = [_channel := [_channel for _channel in channels if _channel.id == channel["channel_id"]], _channel if len(_channel) >= 1 else None][1]
         return cls(client, **channel)
 
@@ -59,8 +63,8 @@ class WelcomeScreen:
     welcome_channels: list[WelcomeScreenChannel]
 
     @classmethod
-    async def from_raw(cls, client: "Client", channels: list[Channel], welcomescreen: dict):
-        welcomescreen["welcome_channels"] = [await WelcomeScreenChannel.from_raw(client, channels, channel) for channel in welcomescreen["welcome_channels"]]
+    def parse(cls, client: "Client", channels: list[Channel], welcomescreen: dict):
+        welcomescreen["welcome_channels"] = [WelcomeScreenChannel.parse(client, channels, channel) for channel in welcomescreen["welcome_channels"]]
 
         return cls(client, **welcomescreen)
 
@@ -80,12 +84,12 @@ class AuditLogChange:
     @property
     def is_reset(self) -> bool:
         """Returns True if the property was reset or set to null."""
-        return "new_value" not in self.__dict__ and "old_value" in self.__dict__
+        return self.new_value is None and self.old_value is not None
 
     @property
     def was_previously_null(self) -> bool:
         """Returns True if the property was previously null."""
-        return "old_value" not in self.__dict__ and "new_value" in self.__dict__
+        return self.old_value is None and self.new_value is not None
 
     @property
     def is_role_change(self) -> bool:
@@ -121,7 +125,7 @@ class AuditLogEntry:
     reason: Optional[str] = None
 
     @classmethod
-    async def from_raw(cls, client: "Client", entry: dict) -> "AuditLogEntry":
+    def parse(cls, client: "Client", entry: dict) -> "AuditLogEntry":
         entry["action_type"] = AuditLogEvents(entry["action_type"])
 
         if "changes" in entry:
@@ -251,7 +255,7 @@ class Guild:
     joined_at: datetime
     large: bool
     member_count: int
-    members: dict[str, Member]
+    members: MemberCache
     channels: list[Channel]
     threads: list[Channel]
     description: str
@@ -277,6 +281,11 @@ class Guild:
     approximate_member_count: Optional[int] = None
     welcome_screen: Optional[WelcomeScreen] = None
     me: Optional[Member] = None
+    role_index: ModelIndex[Role] = field(default_factory=ModelIndex)
+    emoji_index: ModelIndex[Emoji] = field(default_factory=ModelIndex)
+    sticker_index: ModelIndex[Sticker] = field(default_factory=ModelIndex)
+    permission_cache: dict[str, dict[str, Permissions]] = field(default_factory=dict)
+    chunked: bool = False
 
     __CHANGE_KEYS__ = (
         (
@@ -312,7 +321,7 @@ class Guild:
         return "<Guild id={!r} name={!r} owner={!r}>".format(self.id, self.name, self.owner)
 
     @classmethod
-    async def from_raw(cls, client: "Client", guild: dict) -> "Guild":
+    def parse(cls, client: "Client", guild: dict) -> "Guild":
         icon_url = CDN_URL + "/icons/%s/%s.%s" % (guild["id"], guild["icon"], "gif" if guild["icon"] and guild["icon"][:2] == "a_" else "png")
         banner_url = CDN_URL + "/banners/%s/%s.%s" % (guild["id"], guild["banner"], "gif" if guild["banner"] and guild["banner"][:2] == "a_" else "png")
 
@@ -322,19 +331,19 @@ class Guild:
         if guild["banner"] is None:
             banner_url = None
 
-        channels = [await Channel.from_raw(client, channel) for channel in guild["channels"]]
+        channels = [Channel.parse(client, channel) for channel in guild["channels"]]
 
         guild["verification_level"] = VerificationLevel(guild["verification_level"])
         guild["default_message_notifications"] = DefaultMessageNotification(guild["default_message_notifications"])
         guild["explicit_content_filter"] = ExplicitContentFilter(guild["explicit_content_filter"])
-        guild["roles"] = sorted([await Role.from_raw(client, role) for role in guild["roles"]], key=lambda role: role.position)
-        guild["emojis"] = [await Emoji.from_raw(client, emoji) for emoji in guild["emojis"]]
+        guild["roles"] = sorted([Role.parse(client, role) for role in guild["roles"]], key=lambda role: role.position)
+        guild["emojis"] = [Emoji.parse(client, emoji) for emoji in guild["emojis"]]
         guild["mfa_level"] = MfaLevel(guild["mfa_level"])
         guild["joined_at"] = parse_time(guild["joined_at"])
         guild["channels"] = channels
-        guild["threads"] = [await Channel.from_raw(client, thread) for thread in guild["threads"]]
+        guild["threads"] = [Channel.parse(client, thread) for thread in guild["threads"]]
         guild["nsfw_level"] = NSFWLevel(guild["nsfw_level"])
-        guild["stickers"] = [await Sticker.from_raw(client, sticker) for sticker in guild["stickers"]]
+        guild["stickers"] = [Sticker.parse(client, sticker) for sticker in guild["stickers"]]
         guild["created_at"] = time_from_snowflake(guild["id"])
         guild["icon_url"] = icon_url
         guild["banner_url"] = banner_url
@@ -355,19 +364,20 @@ class Guild:
             index = get_index(guild["channels"], guild["widget_channel"], key=lambda channel: channel.id)
             guild["widget_channel"] = guild["channels"][index] if index is not None else None
         if "welcome_screen" in guild:
-            guild["welcome_screen"] = await WelcomeScreen.from_raw(client, channels, guild["welcome_screen"])
+            guild["welcome_screen"] = WelcomeScreen.parse(client, channels, guild["welcome_screen"])
 
         g = cls(client, **guild)
-        g.members = {}
+        g.members = MemberCache()
+        g.reindex()
 
         for member in guild["members"]:
             if member["user"]["id"] == guild["owner"]:
                 if member["user"]["id"] in client.gateway.users:
                     user = client.gateway.users[member["user"]["id"]]
                 else:
-                    user = await User.from_raw(client, member["user"])
+                    user = User.parse(client, member["user"])
                     client.gateway.users[user.id] = user
-                owner = await Member.from_raw(client, g, member, user)
+                owner = Member.parse(client, g, member, user)
                 g.owner = owner
                 g.members[user.id] = owner
                 break
@@ -376,42 +386,57 @@ class Guild:
 
     @property
     def default_role(self) -> Role:
-        return [role for role in self.roles if role.id == self.id][0]
+        return self.role_index.get_id(self.id)
+
+    def reindex(self) -> None:
+        self.role_index.rebuild(self.roles)
+        self.emoji_index.rebuild(self.emojis)
+        self.sticker_index.rebuild(self.stickers)
+
+    def invalidate_permissions(self, *, user_id: Optional[str] = None, channel_id: Optional[str] = None) -> None:
+        if channel_id is not None:
+            self.permission_cache.pop(Snowflake.key(channel_id), None)
+        elif user_id is not None:
+            user_id = Snowflake.key(user_id)
+
+            for permissions in self.permission_cache.values():
+                permissions.pop(user_id, None)
+        else:
+            self.permission_cache.clear()
 
     def get_channel(self, channel_id_or_name: str) -> Channel | None:
         if not channel_id_or_name:
             return
 
-        for channel in self.channels + self.threads:
-            if channel.name.lower() == channel_id_or_name.lower() or channel.id == channel_id_or_name:
-                return channel
+        gateway = self.__client.gateway
+
+        if gateway.get_guild_by_channel_id(channel_id_or_name) is self:
+            return gateway.get_channel(channel_id_or_name)
+
+        name = channel_id_or_name.lower()
+
+        for channels in (self.channels, self.threads):
+            for channel in channels:
+                if channel.name.lower() == name or channel.id == channel_id_or_name:
+                    return channel
 
     def get_role(self, role_id_or_name: str) -> Role | None:
         if not role_id_or_name:
             return
 
-        for role in self.roles:
-            if role.name.lower() == role_id_or_name.lower() or role.id == role_id_or_name:
-                return role
+        return self.role_index.get(role_id_or_name)
 
     def get_emoji(self, emoji_name_or_id: str) -> Emoji | None:
         if not emoji_name_or_id:
             return
 
-        if self.emojis is None:
-            return
-
-        for emoji in self.emojis:
-            if emoji.name.lower() == emoji_name_or_id.lower() or emoji.id == emoji_name_or_id:
-                return emoji
+        return self.emoji_index.get(emoji_name_or_id)
 
     def get_sticker(self, sticker_name_or_id: str) -> Sticker | None:
         if not sticker_name_or_id:
             return
 
-        for sticker in self.stickers:
-            if sticker.name.lower() == sticker_name_or_id.lower() or sticker.id == sticker_name_or_id:
-                return sticker
+        return self.sticker_index.get(sticker_name_or_id)
 
     def icon_as(self, extension: str) -> str:
         if extension not in EXTENSIONS:
@@ -430,27 +455,59 @@ class Guild:
             raise ValueError("invalid user_id")
         return await self.__client.http.request(Route("GET", "guilds", self.id, "members", user_id))
 
+    async def chunk(self) -> list[Member]:
+        if self.chunked:
+            return list(self.members.values())
+
+        return await self.__client.get_shard(self.id).request_guild_members(self.id)
+
+    async def query_members(self, query: Optional[str] = None, *, user_ids: Optional[list[str]] = None, limit: int = 100, timeout: Optional[float] = 30) -> list[Member]:
+        if (query is None) is (user_ids is None):
+            raise InvalidArgument("Pass either query or user_ids")
+
+        gateway = self.__client.get_shard(self.id)
+
+        if query is not None:
+            return await wait_for(gateway.request_guild_members(self.id, query=query, limit=limit), timeout)
+
+        members = []
+        missing = []
+
+        for user_id in user_ids:
+            member = self.members.get(user_id)
+
+            if member is not None:
+                members.append(member)
+            else:
+                missing.append(user_id)
+
+        batches = [missing[index:index + 100] for index in range(0, len(missing), 100)]
+        results = await wait_for(gather(*(gateway.request_guild_members(self.id, user_ids=batch, limit=len(batch)) for batch in batches)), timeout)
+
+        for result in results:
+            members += result
+
+        return members
+
     async def get_member(self, member: dict | str, user: Optional[User | dict] = None) -> Member:
-        if isinstance(member, str) and member in self.members:
-            return self.members[member]
-
-        for cached_member in self.members.values():
-            if isinstance(member, str):
-                if member.lower() in (cached_member.user.username.lower(), cached_member.user.id) + \
-                                     ((cached_member.user.global_name.lower(),) if cached_member.user.global_name else ()) + \
-                                     ((cached_member.nick.lower(),) if cached_member.nick else ()):
-                    return cached_member
-            elif isinstance(member, dict):
-                if user is not None:
-                    if isinstance(user, User):
-                        if user.id == cached_member.user.id:
-                            return cached_member
-                    elif isinstance(user, dict):
-                        if user["id"] == cached_member.user.id:
-                            return cached_member
-                elif "user" in member:
-                    if member["user"]["id"] == cached_member.user.id:
-                        return cached_member
+        cached_member = None
+
+        if isinstance(member, int):
+            member = str(member)
+
+        if isinstance(member, str):
+            cached_member = self.members.get(member) or self.members.find(member)
+        elif user is not None:
+            cached_member = self.members.get(user.id if isinstance(user, User) else user["id"])
+        elif "user" in member:
+            cached_member = self.members.get(member["user"]["id"])
+
+        if cached_member is not None:
+            return cached_member
+
+        if isinstance(member, str) and self.__client.gateway.cache_backend is not None:
+            gateway = self.__client.gateway
+            member = await gateway.read_backend(gateway.cache_backend.get, "members:" + self.id, member) or member
 
         if isinstance(member, str):
             member = await self.fetch_member(member)
@@ -461,10 +518,9 @@ class Guild:
         if not user and "user" in member:
             user = await self.__client.gateway.get_user(member["user"])
 
-        member = await Member.from_raw(self.__client, self, member, user)
-        self.members[member.user.id] = member
+        member = Member.parse(self.__client, self, member, user)
 
-        return member
+        return self.__client.gateway.cache_member(self, member)
 
     async def ban(self, user: User, reason: Optional[str] = None, delete_message_seconds: Optional[int] = 0) -> dict | str:
         return await self.__client.http.ban_member(self.id, user.id, reason=reason, delete_message_seconds=delete_message_seconds)
@@ -474,7 +530,7 @@ class Guild:
 
     async def audit_log(self, limit: int = 100, before: Optional[str] = None, after: Optional[str] = None) -> list[AuditLogEntry]:
         response = await self.__client.http.audit_log(self.id, limit=limit, before=before, after=after)
-        return [await AuditLogEntry.from_raw(self.__client, entry) for entry in response["audit_log_entries"]]
+        return [AuditLogEntry.parse(self.__client, entry) for entry in response["audit_log_entries"]]
 
     async def search_messages(self, **kwargs: Unpack[SearchGuildMessagesKwargs]) -> list[Message]:
         response = await self.__client.http.search_guild_messages(self.id, **kwargs)
@@ -17,7 +17,6 @@ limitations under the License.
 from .dataclass import dataclass
 
 from ..enums import CommandOptionTypes, ApplicationCommandTypes, ComponentTypes, InteractionTypes, ChannelTypes, InteractionCallbackTypes, MessageFlags, InteractionContextTypes
-from ..utils import get_index
 from ..permissions import Permissions
 
 from .channel import Channel
@@ -62,14 +61,14 @@ class InteractionDataOption:
                     dataoption["value"] = Channel(client, dataoption["value"], ChannelTypes.NONE)
                 else:
                     resolved_channel = resolved["channels"][dataoption["value"]]
-                    dataoption["value"] = await Channel.from_raw(client, resolved_channel)
+                    dataoption["value"] = Channel.parse(client, resolved_channel)
 
             case CommandOptionTypes.ROLE:
                 if guild is not None:
                     dataoption["value"] = guild.get_role(dataoption["value"])
                 elif resolved is not None:
                     resolved_role = resolved["roles"][dataoption["value"]]
-                    dataoption["value"] = await Role.from_raw(client, resolved_role)
+                    dataoption["value"] = Role.parse(client, resolved_role)
 
         if "options" in dataoption:
             dataoption["options"] = [await cls.from_raw(client, guild, dataoption, resolved) for dataoption in dataoption["options"]]
@@ -114,7 +113,7 @@ class InteractionData:
             elif data["type"] == ApplicationCommandTypes.MESSAGE:
                 data["target"] = await Message.from_raw(client, data["resolved"]["messages"][data["target"]])
         if "components" in data:
-            data["components"] = [await MessageComponents.from_raw(client, component) for component in data["components"]]
+            data["components"] = [MessageComponents.parse(client, component) for component in data["components"]]
 
         return cls(client, **data)
 
@@ -176,7 +175,7 @@ class InteractionData:
 
 #     @classmethod
 #     async def from_raw(cls, client: "Client", data: dict) -> "ModalSubmitData":
-#         data["components"] = [await MessageComponents.from_raw(client, component) for component in data["components"]]
+#         data["components"] = [MessageComponents.parse(client, component) for component in data["components"]]
 #         return cls(client, **data)
 
 @dataclass
@@ -246,13 +245,13 @@ class Interaction:
         if "user" in interaction:
             interaction["user"] = await client.gateway.get_user(interaction["user"])
         if "message" in interaction:
-            index = get_index(client.gateway.messages, interaction["message"]["id"], key=lambda m: m.id)
+            message = client.gateway.messages.get(interaction["message"]["id"])
 
-            if index is None:
-                interaction["message"] = await Message.from_raw(client, interaction["message"])
-                client.gateway.cache_message(interaction["message"])
-            else:
-                interaction["message"] = client.gateway.messages[index]
+            if message is None:
+                message = await Message.from_raw(client, interaction["message"])
+                client.gateway.cache_message(message)
+
+            interaction["message"] = message
         if "channel" in interaction and isinstance(interaction["channel"], str):
             interaction["channel"] = Channel(client, interaction["channel"], ChannelTypes.DM)
         if "app_permissions" in interaction:
@@ -16,8 +16,8 @@ limitations under the License.
 
 from .dataclass import dataclass
 
-from ..enums import StatusTypes
-from ..utils import ID_PATTERN, parse_time
+from ..enums import StatusTypes, OverwriteTypes, Permissions as PermissionsEnum
+from ..utils import ID_PATTERN, parse_time, Snowflake
 from ..permissions import Permissions
 
 from .channel import Channel
@@ -33,6 +33,7 @@ if TYPE_CHECKING:
     from ..commands import Context
     from .user import User
     from .role import Role
+    from .guild import Guild
 
 @dataclass
 class Member:
@@ -61,13 +62,19 @@ class Member:
         return "<Member user={!r} roles={!r} presence={!r}>".format(self.user, self.roles, self.presence)
 
     @classmethod
-    async def from_raw(cls, client, guild, member, user):
+    def parse(cls, client, guild, member, user):
         member["user"] = user
         member["guild_id"] = guild.id
 
         if member is not None:
             member["roles"] = [guild.roles[0]] + sorted((guild.get_role(role) for role in member["roles"]), key=lambda role: role.position if role else 0)
-            member["permissions"] = Permissions(*set(permission for permissions in [role.permissions.permissions for role in member["roles"] if role] for permission in permissions))
+            permissions = 0
+
+            for role in member["roles"]:
+                if role:
+                    permissions |= role.permissions.value
+
+            member["permissions"] = Permissions.from_int(permissions)
             member["joined_at"] = parse_time(member["joined_at"])
 
             if "premium_since" in member:
@@ -85,6 +92,76 @@ class Member:
 
         return cls(client, **member)
 
+    def permissions_in(self, channel: Channel) -> Permissions:
+        guild = self.__client.gateway.get_guild(self.guild_id)
+
+        if guild is None:
+            return self.compute_permissions(None, channel)
+
+        user_id = Snowflake.key(self.user.id)
+        cache = guild.permission_cache.setdefault(Snowflake.key(channel.id), {})
+        permissions = cache.get(user_id)
+
+        if permissions is None:
+            permissions = cache[user_id] = self.compute_permissions(guild, channel)
+
+        return permissions
+
+    def compute_permissions(self, guild: Optional["Guild"], channel: Channel) -> Permissions:
+        if guild is not None:
+            owner_id = guild.owner.user.id if isinstance(guild.owner, Member) else guild.owner
+
+            if self.user.id == owner_id:
+                return Permissions.all()
+
+            roles = [guild.role_index.get_id(role.id) for role in self.roles if role]
+        else:
+            roles = self.roles
+
+        value = 0
+
+        for role in roles:
+            if role:
+                value |= role.permissions.value
+
+        if value & PermissionsEnum.ADMINISTRATOR.value:
+            return Permissions.all()
+
+        overwrites = channel.permission_overwrites
+
+        if overwrites is None and channel.parent_id is not None:
+            parent = self.__client.gateway.get_channel(channel.parent_id)
+
+            if parent is not None:
+                overwrites = parent.permission_overwrites
+
+        if not overwrites:
+            return Permissions.from_int(value)
+
+        role_ids = {role.id for role in roles if role}
+        everyone = member = None
+        allow = deny = 0
+
+        for overwrite in overwrites:
+            if overwrite.id == self.guild_id:
+                everyone = overwrite
+            elif overwrite.type is OverwriteTypes.MEMBER:
+                if overwrite.id == self.user.id:
+                    member = overwrite
+            elif overwrite.id in role_ids:
+                allow |= overwrite.allow.value
+                deny |= overwrite.deny.value
+
+        if everyone is not None:
+            value = (value & ~everyone.deny.value) | everyone.allow.value
+
+        value = (value & ~deny) | allow
+
+        if member is not None:
+            value = (value & ~member.deny.value) | member.allow.value
+
+        return Permissions.from_int(value)
+
     @staticmethod
     def from_arg(ctx: "Context", argument) -> "Member":
         result = ID_PATTERN.search(argument)
@@ -76,7 +76,7 @@ class MessageReference:
     fail_if_not_exists: bool = None
 
     @classmethod
-    async def from_raw(cls, client, reference):
+    def parse(cls, client, reference):
         reference["type"] = MessageReferences(reference["type"])
 
         return cls(client, **reference)
@@ -89,7 +89,7 @@ class MessageSticker:
     format_type: StickerFormatTypes
 
     @classmethod
-    async def from_raw(cls, client, sticker):
+    def parse(cls, client, sticker):
         sticker["format_type"] = StickerFormatTypes(sticker["format_type"])
 
         return cls(client, **sticker)
@@ -104,7 +104,7 @@ class SelectOptions:
     default: bool = None
 
     @classmethod
-    async def from_raw(cls, client, option):
+    def parse(cls, client, option):
         if "emoji" in option:
             option["emoji"] = Emoji(client, **option["emoji"])
 
@@ -130,22 +130,22 @@ class MessageComponents:
     values: list = None
 
     @classmethod
-    async def from_raw(cls, client, component):
+    def parse(cls, client, component):
         if "hash" in component:
             del component["hash"]
 
         component["type"] = ComponentTypes(component["type"])
 
         if "components" in component:
-            component["components"] = [await cls.from_raw(client, components) for components in component["components"]]
+            component["components"] = [cls.parse(client, components) for components in component["components"]]
         if "component" in component:
-            component["component"] = await cls.from_raw(client, component["component"])
+            component["component"] = cls.parse(client, component["component"])
         if "style" in component:
             component["style"] = ButtonStyles(component["style"])
         if "emoji" in component:
             component["emoji"] = Emoji(client, **component["emoji"])
         if "options" in component:
-            component["options"] = [await SelectOptions.from_raw(client, option) for option in component["options"]]
+            component["options"] = [SelectOptions.parse(client, option) for option in component["options"]]
 
         return cls(client, **component)
 
@@ -157,8 +157,8 @@ class MessageReaction:
     me: Optional[bool] = None
 
     @classmethod
-    async def from_raw(cls, client, reaction):
-        reaction["emoji"] = await Emoji.from_raw(client, reaction["emoji"])
+    def parse(cls, client, reaction):
+        reaction["emoji"] = Emoji.parse(client, reaction["emoji"])
 
         return cls(client, **reaction)
 
@@ -229,11 +229,10 @@ class Message:
 
     @classmethod
     async def from_raw(cls, client: "Client", message: dict[str, Any]):
-        for guild in client.gateway.guilds:
-            if isinstance(message["channel"], Channel) is False:
-                channel = guild.get_channel(message["channel"])
-                if channel is not None:
-                    message["channel"] = channel
+        if isinstance(message["channel"], Channel) is False:
+            channel = client.gateway.get_channel(message["channel"])
+            if channel is not None:
+                message["channel"] = channel
 
         if "guild" in message:
             message["guild"] = client.gateway.get_guild(message["guild"])
@@ -259,11 +258,11 @@ class Message:
         if "edited_timestamp" in message:
             message["edited_timestamp"] = parse_time(message["edited_timestamp"])
         if "sticker_items" in message:
-            message["sticker_items"] = [await MessageSticker.from_raw(client, sticker) for sticker in message["sticker_items"]]
+            message["sticker_items"] = [MessageSticker.parse(client, sticker) for sticker in message["sticker_items"]]
         if "reactions" in message:
-            message["reactions"] = [await MessageReaction.from_raw(client, reaction) for reaction in message["reactions"]]
+            message["reactions"] = [MessageReaction.parse(client, reaction) for reaction in message["reactions"]]
         if "message_reference" in message:
-            message["message_reference"] = await MessageReference.from_raw(client, message["message_reference"])
+            message["message_reference"] = MessageReference.parse(client, message["message_reference"])
         if "referenced_message" in message and message["referenced_message"]:
             message["referenced_message"] = await Message.from_raw(client, message["referenced_message"])
         if "attachments" in message:
@@ -271,9 +270,9 @@ class Message:
         if "type" in message:
             message["type"] = MessageTypes(message["type"])
         if "components" in message:
-            message["components"] = [await MessageComponents.from_raw(client, component) for component in message["components"]]
+            message["components"] = [MessageComponents.parse(client, component) for component in message["components"]]
         if "embeds" in message:
-            message["embeds"] = [await Embed.from_raw(client, embed) for embed in message["embeds"]]
+            message["embeds"] = [Embed.parse(client, embed) for embed in message["embeds"]]
         if "flags" in message:
             message["flags"] = [flag for flag in MessageFlags if message["flags"] & flag.value == flag.value]
         if "interaction_metadata" in message:
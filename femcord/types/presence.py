@@ -15,6 +15,7 @@ limitations under the License.
 """
 
 from .dataclass import dataclass
+from dataclasses import fields
 
 from ..enums import ActivityTypes, ActivityFlags, StatusTypes
 
@@ -36,7 +37,7 @@ class ActivityTimestamps:
     end: int = None
 
     @classmethod
-    async def from_raw(cls, client, timestamps):
+    def parse(cls, client, timestamps):
         # if "start" in timestamps:
         #     timestamps["start"] = datetime.fromtimestamp(timestamps["start"] / 1000)
         # if "end" in timestamps:
@@ -96,14 +97,14 @@ class Activity:
         return "<Activity name={!r} type={!r} details={!r} state={!r}>".format(self.name, self.type, self.details, self.state)
 
     @classmethod
-    async def from_raw(cls, client, activity):
+    def parse(cls, client, activity):
         activity["type"] = ActivityTypes(activity["type"])
         activity["created_at"] = datetime.fromtimestamp(activity["created_at"] / 1000)
 
         if "timestamps" in activity:
-            activity["timestamps"] = await ActivityTimestamps.from_raw(client, activity["timestamps"])
+            activity["timestamps"] = ActivityTimestamps.parse(client, activity["timestamps"])
         if "emoji" in activity:
-            activity["emoji"] = await Emoji.from_raw(client, activity["emoji"])
+            activity["emoji"] = Emoji.parse(client, activity["emoji"])
         if "party" in activity:
             activity["party"] = ActivityParty(**activity["party"])
         if "assets" in activity:
@@ -134,7 +135,7 @@ class ClientStatus:
         return "<ClientStatus desktop={!r} mobile={!r} web={!r}>".format(self.desktop, self.mobile, self.web)
 
     @classmethod
-    async def from_raw(cls, client, client_status):
+    def parse(cls, client, client_status):
         for key in client_status:
             client_status[key] = StatusTypes(client_status[key])
 
@@ -154,7 +155,7 @@ class Presence:
         return "<Presence status={!r} client_status={!r} activities={!r}>".format(self.status, self.client_status, self.activities)
 
     def to_dict(self):
-        presence = {key: value for key, value in self.__dict__.items() if value is not None}
+        presence = {field.name: getattr(self, field.name) for field in fields(self) if getattr(self, field.name) is not None}
 
         for key, value in presence.items():
             if isinstance(value, Enum):
@@ -163,7 +164,7 @@ class Presence:
         activities = []
 
         for activity in presence["activities"]:
-            activity = {key: value for key, value in activity.__dict__.items() if value is not None}
+            activity = {field.name: getattr(activity, field.name) for field in fields(activity) if getattr(activity, field.name) is not None}
 
             for key, value in activity.items():
                 if isinstance(value, Enum):
@@ -182,9 +183,9 @@ class Presence:
         return presence
 
     @classmethod
-    async def from_raw(cls, client, presence):
+    def parse(cls, client, presence):
         presence["status"] = StatusTypes(presence["status"])
-        presence["client_status"] = await ClientStatus.from_raw(client, presence["client_status"])
-        presence["activities"] = [await Activity.from_raw(client, activity) for activity in presence["activities"]]
+        presence["client_status"] = ClientStatus.parse(client, presence["client_status"])
+        presence["activities"] = [Activity.parse(client, activity) for activity in presence["activities"]]
 
         return cls(client, **presence)
\ No newline at end of file
@@ -49,7 +49,7 @@ class Role:
         return "<Role id={!r} name={!r} color={!r} position={!r}>".format(self.id, self.name, self.color, self.position)
 
     @classmethod
-    async def from_raw(cls, client, role):
+    def parse(cls, client, role):
         role["permissions"] = Permissions.from_int(int(role["permissions"]))
         role["created_at"] = time_from_snowflake(role["id"])
 
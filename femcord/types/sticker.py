@@ -53,7 +53,7 @@ class Sticker:
         return "https://cdn.discordapp.com/stickers/" + self.id + extension
 
     @classmethod
-    async def from_raw(cls, client, sticker):
+    def parse(cls, client, sticker):
         sticker["type"] = StickerTypes(sticker["type"])
         sticker["format_type"] = StickerFormatTypes(sticker["format_type"])
         sticker["created_at"] = time_from_snowflake(sticker["id"])
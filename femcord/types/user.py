@@ -105,7 +105,7 @@ class User:
         return CDN_URL + "/banners/%s/%s.%s?size=512" % (self.id, self.banner, "gif" if self.banner and self.banner[:2] == "a_" else "png")
 
     @classmethod
-    async def from_raw(cls, client, user):
+    def parse(cls, client, user):
         user["created_at"] = time_from_snowflake(user["id"])
 
         if "primary_guild" in user and user["primary_guild"]:
@@ -133,7 +133,7 @@ class User:
     async def send(self, content: Optional[str] = None, *, embed: Optional["Embed"] = None, embeds: Optional[Sequence["Embed"]] = None, components: Optional["Components"] = None, files: Optional[list[tuple[str, bytes]]] = [], mentions: Optional[list] = [], flags: Optional[list[MessageFlags]] = None, other: Optional[dict] = {}) -> Message:
         if self.dm is None:
             response = await self.__client.http.open_dm(self.id)
-            self.dm = await Channel.from_raw(self.__client, response)
+            self.dm = Channel.parse(self.__client, response)
 
         response = await self.__client.http.send_message(self.dm.id, content, embed=embed, embeds=embeds, components=components, files=files, mentions=mentions, flags=flags, other=other)
 
@@ -54,7 +54,7 @@ class VoiceState:
         return "<VoiceState guild={!r} channel={!r} deaf={!r} mute={!r} self_deaf={!r} self_mute={!r} self_stream={!r} self_video={!r} suppress={!r} request_timestamp={!r}>".format(self.guild, self.channel, self.deaf, self.mute, self.self_deaf, self.self_mute, self.self_stream, self.self_video, self.suppress, self.request_timestamp)
 
     @classmethod
-    async def from_raw(cls, client, voice_state):
+    def parse(cls, client, voice_state):
         if voice_state["request_timestamp"] is not None:
             voice_state["request_timestamp"] = datetime.fromisoformat(voice_state["request_timestamp"])
 
@@ -24,7 +24,104 @@ import base64
 from typing import Callable, Iterable, Optional, Any
 
 DISCORD_EPOCH = 1420070400000
-ID_PATTERN = re.compile(r"\d{16,19}")
+
+class Snowflake(int):
+    __slots__ = ()
+
+    enabled: bool = False
+    configured: Optional[bool] = None
+
+    def __str__(self) -> str:
+        return int.__repr__(self)
+
+    def __repr__(self) -> str:
+        return repr(int.__repr__(self))
+
+    def __format__(self, format_spec: str) -> str:
+        if not format_spec:
+            return int.__repr__(self)
+
+        return int.__format__(self, format_spec)
+
+    # a Snowflake stands in for the string id, so it equals and hashes like that string.
+    # plain ints are not equal to it, otherwise hash and == would disagree.
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Snowflake):
+            return int.__eq__(self, other)
+
+        if isinstance(other, str):
+            return other == int.__repr__(self)
+
+        if isinstance(other, int):
+            return False
+
+        return NotImplemented
+
+    def __ne__(self, other: Any) -> bool:
+        result = self.__eq__(other)
+
+        if result is NotImplemented:
+            return result
+
+        return not result
+
+    def __hash__(self) -> int:
+        return hash(int.__repr__(self))
+
+    def __add__(self, other: Any) -> Any:
+        if isinstance(other, str):
+            return int.__repr__(self) + other
+
+        return int.__add__(self, other)
+
+    def __radd__(self, other: Any) -> Any:
+        if isinstance(other, str):
+            return other + int.__repr__(self)
+
+        return int.__radd__(self, other)
+
+    def __len__(self) -> int:
+        return len(int.__repr__(self))
+
+    def __getitem__(self, key: Any) -> str:
+        return int.__repr__(self)[key]
+
+    def __contains__(self, item: str) -> bool:
+        return item in int.__repr__(self)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(int.__repr__(self), name)
+
+    @staticmethod
+    def key(value: Any) -> Any:
+        if Snowflake.enabled:
+            if isinstance(value, str) and value.isdigit():
+                return Snowflake(value)
+        elif isinstance(value, Snowflake):
+            return int.__repr__(value)
+
+        return value
+
+class IdPattern:
+    def __init__(self, pattern: str) -> None:
+        self.regex = re.compile(pattern)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.regex, name)
+
+    def match(self, string: Any, *args) -> Optional[re.Match]:
+        return self.regex.match(str(string), *args)
+
+    def fullmatch(self, string: Any, *args) -> Optional[re.Match]:
+        return self.regex.fullmatch(str(string), *args)
+
+    def search(self, string: Any, *args) -> Optional[re.Match]:
+        return self.regex.search(str(string), *args)
+
+    def findall(self, string: Any, *args) -> list[str]:
+        return self.regex.findall(str(string), *args)
+
+ID_PATTERN = IdPattern(r"\d{16,19}")
 
 class Missing:
     def __str__(self) -> str:
@@ -45,8 +142,8 @@ def parse_time(timestamp: Optional[str]) -> datetime | None:
     if timestamp:
         return datetime.fromisoformat(timestamp.replace(" ", "T"))
 
-def time_from_snowflake(snowflake: str) -> datetime:
-    _snowflake = int(snowflake)
+def time_from_snowflake(snowflake: str | int) -> datetime:
+    _snowflake = snowflake if isinstance(snowflake, int) else int(snowflake)
     timestamp = ((_snowflake >> 22) + DISCORD_EPOCH) / 1000
 
     return datetime.fromtimestamp(timestamp)
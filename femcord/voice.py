@@ -172,7 +172,7 @@ class VoiceWebSocket:
         self.task = self.loop.create_task(self.run())
 
     def send(self, opcode: Opcodes, data: dict | float) -> Awaitable[None]:
-        return self.ws.send_json({"op": opcode.value, "d": data})
+        return self.ws.send_json({"op": opcode.value, "d": data}, dumps=self.client.codec.dumps)
 
     def get_voice_packet(self, data: bytes) -> bytes:
         header = bytearray(12)
@@ -247,7 +247,7 @@ class VoiceWebSocket:
         await self.send(Opcodes.IDENTIFY, {
             "server_id": self.guild_id,
             "user_id": self.client.gateway.bot_user.id,
-            "session_id": self.client.gateway.session_id,
+            "session_id": self.client.get_shard(self.guild_id).session_id,
             "token": self.token
         })
 
@@ -256,7 +256,7 @@ class VoiceWebSocket:
                 break
 
             if message.type is aiohttp.WSMsgType.text:
-                data = message.json()
+                data = message.json(loads=self.client.codec.loads)
                 op, data = Opcodes(data["op"]), data["d"]
 
                 match op:
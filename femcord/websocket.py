@@ -17,20 +17,172 @@ limitations under the License.
 import asyncio
 import aiohttp
 import zlib
-import json
 import traceback
 import logging
+import random
+import time
 
 from .enums import Opcodes
+from .errors import InvalidArgument
+from .etf import ETFCodec
+from .utils import MISSING
 
-from typing import TYPE_CHECKING
+try:
+    from compression import zstd
+except ImportError:
+    zstd = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from typing import Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .client import Client
     from .gateway import Gateway
 
+class Decompressor:
+    def __init__(self) -> None:
+        self.frames = 0
+        self.compressed_bytes = 0
+        self.decompressed_bytes = 0
+        self.decompress_time: float = 0
+        self.last_compressed_bytes = 0
+        self.last_decompressed_bytes = 0
+        self.last_decompress_time: float = 0
+
+        self.reset()
+
+    def __str__(self) -> str:
+        return "<{} frames={!r} compressed_bytes={!r} decompressed_bytes={!r} decompress_time={!r}>".format(self.__class__.__name__, self.frames, self.compressed_bytes, self.decompressed_bytes, self.decompress_time)
+
+    def __repr__(self) -> str:
+        return "<{} frames={!r} compressed_bytes={!r} decompressed_bytes={!r} decompress_time={!r}>".format(self.__class__.__name__, self.frames, self.compressed_bytes, self.decompressed_bytes, self.decompress_time)
+
+    def reset(self) -> None:
+        raise NotImplementedError
+
+    def feed(self, data: bytes) -> bytes | None:
+        return self.decompress(data)
+
+    def decompress(self, data: bytes | memoryview) -> bytes:
+        start = time.perf_counter()
+        decompressed = self.decompressobj.decompress(data)
+        self.last_decompress_time = time.perf_counter() - start
+
+        self.last_compressed_bytes = len(data)
+        self.last_decompressed_bytes = len(decompressed)
+
+        self.frames += 1
+        self.compressed_bytes += self.last_compressed_bytes
+        self.decompressed_bytes += self.last_decompressed_bytes
+        self.decompress_time += self.last_decompress_time
+
+        return decompressed
+
+    @property
+    def ratio(self) -> float:
+        if not self.compressed_bytes:
+            return 0
+
+        return self.decompressed_bytes / self.compressed_bytes
+
+class Inflator(Decompressor):
+    SUFFIX = b"\x00\x00\xff\xff"
+
+    def __init__(self, size: int = 1 << 16) -> None:
+        self.buffer = bytearray(size)
+
+        super().__init__()
+
+    def reset(self) -> None:
+        self.length = 0
+        self.decompressobj = zlib.decompressobj()
+
+    def write(self, data: bytes) -> None:
+        end = self.length + len(data)
+
+        if end > len(self.buffer):
+            self.buffer.extend(bytes(max(end, len(self.buffer) * 2) - len(self.buffer)))
+
+        self.buffer[self.length:end] = data
+        self.length = end
+
+    def feed(self, data: bytes) -> bytes | None:
+        if self.length == 0:
+            with memoryview(data) as view:
+                if len(view) >= 4 and view[-4:] == Inflator.SUFFIX:
+                    return self.decompress(view)
+
+        self.write(data)
+
+        if self.length < 4:
+            return
+
+        with memoryview(self.buffer) as view, view[:self.length] as frame:
+            if not frame[-4:] == Inflator.SUFFIX:
+                return
+
+            data = self.decompress(frame)
+
+        self.length = 0
+
+        return data
+
+class ZstdDecompressor(Decompressor):
+    def reset(self) -> None:
+        if zstd is not None:
+            self.decompressobj = zstd.ZstdDecompressor()
+        elif zstandard is not None:
+            self.decompressobj = zstandard.ZstdDecompressor().decompressobj()
+        else:
+            raise InvalidArgument("zstd-stream requires Python 3.14+ or the zstandard package")
+
+DECOMPRESSORS: dict[str, type[Decompressor]] = {
+    "zlib-stream": Inflator,
+    "zstd-stream": ZstdDecompressor
+}
+
+class Backoff:
+    def __init__(self, base: float = 1, maximum: float = 60, *, threshold: int = 10, cooldown: float = 300) -> None:
+        self.base = base
+        self.maximum = maximum
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.attempts = 0
+        self.open_until: float = 0
+
+    def __str__(self) -> str:
+        return "<Backoff attempts={!r} open={!r}>".format(self.attempts, self.open)
+
+    def __repr__(self) -> str:
+        return "<Backoff attempts={!r} open={!r}>".format(self.attempts, self.open)
+
+    @property
+    def open(self) -> bool:
+        return self.open_until > time.time()
+
+    def success(self) -> None:
+        self.attempts = 0
+
+    def failure(self) -> float:
+        self.attempts += 1
+
+        if self.attempts % self.threshold == 0:
+            delay = self.cooldown * random.uniform(1, 1.5)
+            self.open_until = time.time() + delay
+
+            logging.warning(f"{self.attempts} reconnect attempts failed, pausing reconnects for {delay:.0f}s")
+
+            return delay
+
+        return random.uniform(0, min(self.maximum, self.base * 2 ** self.attempts))
+
 class WebSocket:
-    URL = "wss://gateway.discord.gg/?v=9&encoding=json&compress=zlib-stream"
+    URL = "wss://gateway.discord.gg/"
+    VERSION = 9
 
     async def __new__(cls, *args) -> "WebSocket":
         instance = super().__new__(cls)
@@ -42,30 +194,53 @@ class WebSocket:
         self.session = aiohttp.ClientSession(loop=self.loop)
         self.gateway = gateway
         self.client = client
+        self.codec = ETFCodec() if client.encoding == "etf" else client.codec
+        self.decompressor: Decompressor | None = None
+
+        if client.compress is not None:
+            if client.compress not in DECOMPRESSORS:
+                raise InvalidArgument("Unsupported compression: %s" % client.compress)
+
+            self.decompressor = DECOMPRESSORS[client.compress]()
+
+        disconnected_at: Optional[float] = None
 
         while True:
-            self.ws = await self.session.ws_connect(WebSocket.URL)
+            try:
+                self.ws = await self.session.ws_connect(self.url)
+            except (aiohttp.ClientError, OSError, asyncio.TimeoutError) as exc:
+                logging.warning(f"failed to connect to the gateway: {exc!r}")
+
+                self.gateway.failed_reconnects += 1
+
+                await asyncio.sleep(self.gateway.backoff.failure())
+                continue
+
             self.gateway.ws = self
-            self.client.gateway = self.gateway
 
-            self.buffer = bytearray()
-            self.inflator = zlib.decompressobj()
+            if disconnected_at is not None:
+                self.gateway.reconnects += 1
+                self.gateway.last_reconnect_time = time.perf_counter() - disconnected_at
+                self.gateway.reconnect_time += self.gateway.last_reconnect_time
+
+            if self.decompressor is not None:
+                self.decompressor.reset()
 
             try:
                 async for message in self.ws:
                     if message.type in (aiohttp.WSMsgType.error, aiohttp.WSMsgType.closed):
                         print(message)
                         break
-                    elif message.type is aiohttp.WSMsgType.binary:
-                        self.buffer.extend(message.data)
+                    elif message.type in (aiohttp.WSMsgType.binary, aiohttp.WSMsgType.text):
+                        data = message.data
 
-                        if len(message.data) < 4 or not message.data[-4:] == b"\x00\x00\xff\xff":
-                            continue
+                        if self.decompressor is not None and message.type is aiohttp.WSMsgType.binary:
+                            data = self.decompressor.feed(data)
 
-                        data = self.inflator.decompress(self.buffer)
-                        self.buffer = bytearray()
+                            if data is None:
+                                continue
 
-                        data = json.loads(data)
+                        data = self.codec.loads(data)
                         op = data.get("op")
                         d = data.get("d")
                         s = data.get("s")
@@ -73,6 +248,9 @@ class WebSocket:
 
                         logging.debug(f"op: {Opcodes(op).name}, data: {None if not isinstance(data, dict) else d}, sequence number: {s}, event name: {t}")
 
+                        if self.decompressor is not None:
+                            logging.debug(f"compressed: {self.decompressor.last_compressed_bytes}, decompressed: {self.decompressor.last_decompressed_bytes}, decompress time: {self.decompressor.last_decompress_time * 1000:.3f}ms")
+
                         await self.gateway.on_message(Opcodes(op), d, s, t)
                     else:
                         print(message)
@@ -80,12 +258,35 @@ class WebSocket:
                 traceback.print_exc()
                 print(exc)
 
-            self.gateway.heartbeat.stop()
+            disconnected_at = time.perf_counter()
+
+            if self.gateway.ready:
+                self.gateway.backoff.success()
+
+            if self.gateway.heartbeat is not MISSING:
+                self.gateway.heartbeat.stop()
+
             self.gateway.ready = False
             self.gateway.resuming = True
             self.gateway.last_sequence_number = self.gateway.sequence_number
+
+            await asyncio.sleep(self.gateway.backoff.failure())
         # await WebSocket.__init__(self, self.gateway, self.client)
 
+    @property
+    def url(self) -> str:
+        url = WebSocket.URL
+
+        if self.gateway.resuming and self.gateway.resume_gateway_url:
+            url = self.gateway.resume_gateway_url.rstrip("/") + "/"
+
+        url += "?v=%s&encoding=%s" % (WebSocket.VERSION, self.client.encoding)
+
+        if self.client.compress is not None:
+            url += "&compress=" + self.client.compress
+
+        return url
+
     async def send(self, op: Opcodes, data: dict, *, sequences: int = None) -> None:
         if self.ws.closed:
             return
@@ -104,6 +305,11 @@ class WebSocket:
             await asyncio.sleep(0.1)
 
         try:
-            await self.ws.send_json(ready_data)
+            data = self.codec.dumps(ready_data)
+
+            if isinstance(data, bytes):
+                await self.ws.send_bytes(data)
+            else:
+                await self.ws.send_str(data)
         except ConnectionResetError:
             await self.ws.close()
\ No newline at end of file
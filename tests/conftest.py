@@ -0,0 +1,125 @@
+"""
+Copyright 2022-2026 czubix
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import asyncio
+import pytest
+
+from femcord import Client
+from femcord.gateway import Gateway, ChunkScheduler
+from femcord.cache import MemberCachePolicy, MessageCache, SnowflakeDict, UserCache
+from femcord.utils import Snowflake, MISSING
+
+def guild_payload(guild_id="824683713459814400", members=(), member_count=None, **fields):
+    guild = {
+        "id": guild_id, "name": "guild", "icon": None, "splash": None, "discovery_splash": None, "owner_id": "41771983423143937",
+        "afk_channel_id": None, "afk_timeout": 0, "verification_level": 0, "default_message_notifications": 0, "explicit_content_filter": 0,
+        "roles": [{"id": guild_id, "name": "@everyone", "permissions": "0", "position": 0, "color": 0, "hoist": False, "managed": False, "mentionable": False, "flags": 0, "icon": None, "unicode_emoji": None}],
+        "emojis": [], "features": [], "mfa_level": 0, "system_channel_id": None, "rules_channel_id": None, "joined_at": "2021-03-22T17:00:00.000000+00:00",
+        "large": False, "member_count": len(members) if member_count is None else member_count, "members": list(members), "presences": [], "voice_states": [],
+        "channels": [{"id": str(int(guild_id) + 3), "type": 0, "name": "general"}], "threads": [], "description": None, "banner": None,
+        "premium_tier": 0, "premium_subscription_count": 0, "preferred_locale": "en-US", "nsfw_level": 0, "stickers": [],
+        "premium_progress_bar_enabled": False, "public_updates_channel_id": None
+    }
+    guild.update(fields)
+    return guild
+
+def member_payload(user_id, username="user", **fields):
+    member = {"user": {"id": user_id, "username": username, "discriminator": "0", "avatar": None, "global_name": None}, "roles": [], "joined_at": "2021-03-22T17:00:00.000000+00:00", "deaf": False, "mute": False, "flags": 0}
+    member.update(fields)
+    return member
+
+class FakeSocket:
+    def __init__(self):
+        self.sent = []
+        self.ws = type("ClientWebSocketResponse", (), {"closed": False})()
+
+    async def send(self, op, data):
+        self.sent.append((op, data))
+
+def make_gateway(client, *, shard_id=None, primary=None, policy=None):
+    # a gateway with the state Gateway.__init__ sets up, minus the connection
+    gateway = object.__new__(Gateway)
+    gateway._Gateway__client = client
+    gateway._Gateway__http = MISSING
+    gateway.loop = asyncio.get_event_loop()
+    gateway.shard_id = shard_id
+    gateway.shard_count = client.shard_count
+    gateway.ws = FakeSocket()
+    gateway.ready = True
+    gateway.heartbeat = MISSING
+    gateway.session_id = MISSING
+    gateway.sequence_number = MISSING
+    gateway.bot_user = MISSING
+    gateway.guilds = primary.guilds if primary else []
+    gateway.guild_index = primary.guild_index if primary else SnowflakeDict()
+    gateway.channel_index = primary.channel_index if primary else SnowflakeDict()
+    gateway.channel_guilds = primary.channel_guilds if primary else SnowflakeDict()
+    gateway.guild_ids = set()
+    gateway.restored_guild_ids = primary.restored_guild_ids if primary else set()
+    gateway.unavailable_guilds = []
+    gateway.users = primary.users if primary else UserCache()
+    gateway.member_cache_policy = policy or client.member_cache_policy
+    gateway.cache_backend = client.cache_backend
+    gateway.backend_queue = primary.backend_queue if primary else asyncio.Queue()
+    gateway.backend_task = None
+    gateway.reaper_task = None
+    gateway.chunker = ChunkScheduler(gateway)
+    gateway.pending_voice_states = SnowflakeDict()
+    gateway.pending_admissions = SnowflakeDict()
+    gateway.restored_members = SnowflakeDict()
+    gateway.wait_for_chunking = False
+    gateway.chunk_guilds_at_startup = client.chunk_guilds_at_startup
+    gateway.ingest_time_budget = client.ingest_time_budget
+    gateway.ingested_members = 0
+    gateway.ingest_time = 0
+    gateway.messages = primary.messages if primary else MessageCache(client.messages_limit)
+    gateway.dispatched_ready = True
+    gateway.dispatched_once = True
+    gateway.presence = None
+    gateway.dispatched = []
+
+    async def dispatch(event, *args, **kwargs):
+        gateway.dispatched.append(event)
+
+    gateway.dispatch = dispatch
+
+    if primary is None:
+        client.gateway = gateway
+    if shard_id is not None:
+        client.shards[shard_id] = gateway
+
+    return gateway
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    yield loop
+    tasks = asyncio.all_tasks(loop)
+
+    for task in tasks:
+        task.cancel()
+
+    loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+    loop.close()
+    asyncio.set_event_loop(None)
+
+@pytest.fixture
+def snowflakes():
+    # Client(snowflakes=...) is process-wide, restore the setting for the other tests
+    configured, enabled = Snowflake.configured, Snowflake.enabled
+    Snowflake.configured = None
+    yield
+    Snowflake.configured, Snowflake.enabled = configured, enabled
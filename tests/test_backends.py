@@ -0,0 +1,99 @@
+"""
+Copyright 2022-2026 czubix
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import asyncio
+import pytest
+
+from femcord import Client
+from femcord.backends import MemoryCacheBackend, SQLiteCacheBackend
+from femcord.cache import MemberCachePolicy
+
+from conftest import guild_payload, member_payload, make_gateway
+
+GUILD_ID = "824683713459814400"
+USER_IDS = ["41771983423143937", "41771983423143938", "41771983423143939"]
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        yield MemoryCacheBackend()
+    else:
+        backend = SQLiteCacheBackend(str(tmp_path / "cache.db"))
+        yield backend
+        backend.close()
+
+def test_batch_is_encoded_on_demand(backend):
+    batch = backend.batch()
+    value = {"id": "1"}
+    batch.set("users", "1", value)
+    value["name"] = "late"
+
+    assert backend.get("users", "1") is None
+
+    backend.write(batch.encode())
+
+    assert backend.get("users", "1") == {"id": "1", "name": "late"}
+
+def test_retain_drops_other_keys(backend):
+    batch = backend.batch()
+    batch.set_many("members:1", ((user_id, {"id": user_id}) for user_id in USER_IDS))
+    batch.retain("members:1", USER_IDS[:1])
+    backend.write(batch.encode())
+
+    assert backend.keys("members:1") == USER_IDS[:1]
+
+def gateway_with(loop, backend, **kwargs):
+    client = Client(cache_backend=backend, **kwargs)
+    gateway = make_gateway(client)
+    gateway.backend_task = loop.create_task(gateway.backend_writer())
+    return gateway
+
+def settle(loop):
+    loop.run_until_complete(asyncio.sleep(0.05))
+
+def test_full_guild_create_prunes_members(loop, backend):
+    gateway = gateway_with(loop, backend)
+
+    loop.run_until_complete(gateway.guild_create(guild_payload(GUILD_ID, [member_payload(user_id) for user_id in USER_IDS])))
+    settle(loop)
+    loop.run_until_complete(gateway.guild_delete({"id": GUILD_ID, "unavailable": True}))
+    loop.run_until_complete(gateway.guild_create(guild_payload(GUILD_ID, [member_payload(user_id) for user_id in USER_IDS[:2]])))
+    settle(loop)
+
+    assert sorted(backend.keys("members:" + GUILD_ID)) == USER_IDS[:2]
+
+def test_member_remove_deletes_member(loop, backend):
+    gateway = gateway_with(loop, backend)
+
+    loop.run_until_complete(gateway.guild_create(guild_payload(GUILD_ID, [member_payload(user_id) for user_id in USER_IDS])))
+    loop.run_until_complete(gateway.guild_member_remove({"guild_id": GUILD_ID, "user": member_payload(USER_IDS[2])["user"]}))
+    settle(loop)
+
+    assert backend.get("members:" + GUILD_ID, USER_IDS[2]) is None
+
+def test_lookups_fall_back_to_backend(loop, backend):
+    gateway = gateway_with(loop, backend, member_cache_policy=MemberCachePolicy.none())
+
+    loop.run_until_complete(gateway.guild_create(guild_payload(GUILD_ID, [member_payload(user_id) for user_id in USER_IDS])))
+    settle(loop)
+    guild = gateway.get_guild(GUILD_ID)
+
+    assert USER_IDS[1] not in guild.members
+    assert loop.run_until_complete(guild.get_member(USER_IDS[1])).user.id == USER_IDS[1]
+
+    other = gateway_with(loop, backend)
+
+    assert loop.run_until_complete(other.load_guild(GUILD_ID)).name == "guild"
+    assert loop.run_until_complete(other.load_channel(str(int(GUILD_ID) + 3))).name == "general"
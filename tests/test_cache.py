@@ -0,0 +1,190 @@
+"""
+Copyright 2022-2026 czubix
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+from femcord import Client
+from femcord.types import Guild
+from femcord.cache import MemberCachePolicy, MessageCache, NameIndexedDict
+
+from conftest import guild_payload, member_payload, make_gateway
+
+class FakeMessage:
+    def __init__(self, message_id, channel_id="1", guild_id="10"):
+        self.id = message_id
+        self.channel = channel_id
+        self.guild = guild_id
+
+GUILD_ID = "824683713459814400"
+OWNER_ID = "41771983423143937"
+USER_IDS = [OWNER_ID, "41771983423143938", "41771983423143939"]
+
+def test_reaper_defaults():
+    assert MemberCachePolicy().reap_interval is None
+    assert MemberCachePolicy.all().reap_interval is None
+    assert MemberCachePolicy.none().reap_interval == 300
+    assert MemberCachePolicy.online_only(reap_interval=None).reap_interval is None
+
+def cached_guild(loop, policy):
+    client = Client()
+    gateway = make_gateway(client, policy=MemberCachePolicy.all())
+    guild = Guild.parse(client, guild_payload(members=[member_payload(OWNER_ID)]))
+    gateway.guilds.append(guild)
+    gateway.index_guild(guild)
+
+    for user_id in USER_IDS:
+        loop.run_until_complete(guild.get_member(member_payload(user_id)))
+
+    gateway.member_cache_policy = policy
+    return gateway, guild
+
+def test_reap_evicts_uncached_members(loop):
+    gateway, guild = cached_guild(loop, MemberCachePolicy.none())
+
+    assert loop.run_until_complete(gateway.reap(batch_size=1)) == 2
+    assert list(guild.members) == [OWNER_ID]
+    assert list(gateway.users) == [OWNER_ID]
+
+def test_reap_skips_everyone_policy(loop):
+    gateway, guild = cached_guild(loop, MemberCachePolicy.all())
+
+    assert loop.run_until_complete(gateway.reap()) == 0
+    assert sorted(guild.members) == USER_IDS
+
+def test_message_cache_global_limit():
+    cache = MessageCache(3)
+
+    for message_id in "123":
+        cache.add(FakeMessage(message_id))
+
+    cache.get("1")
+    cache.add(FakeMessage("4"))
+
+    assert [message.id for message in cache] == ["3", "1", "4"]
+    assert [message.id for message in cache.channels["1"].values()] == ["3", "1", "4"]
+
+def test_message_cache_channel_limit():
+    cache = MessageCache(10, channel_limit=2)
+
+    cache.add(FakeMessage("1", "a"))
+    cache.add(FakeMessage("2", "a"))
+    cache.add(FakeMessage("3", "b"))
+    cache.get("1")
+    cache.add(FakeMessage("4", "a"))
+
+    assert "2" not in cache
+    assert list(cache.channels["a"]) == ["1", "4"]
+    assert list(cache.guilds["10"]) == ["3", "1", "4"]
+
+def test_message_cache_guild_limit():
+    cache = MessageCache(10, guild_limit=2)
+
+    cache.add(FakeMessage("1", "a"))
+    cache.add(FakeMessage("2", "b"))
+    cache.get("1")
+    cache.add(FakeMessage("3", "c"))
+    cache.add(FakeMessage("4", "d", None))
+
+    assert [message.id for message in cache] == ["1", "3", "4"]
+    assert "b" not in cache.channels
+    assert list(cache.guilds["10"]) == ["1", "3"]
+
+def test_message_cache_remove():
+    cache = MessageCache(10)
+    cache.add(FakeMessage("1"))
+
+    assert cache.remove("1").id == "1"
+    assert cache.remove("1") is None
+    assert cache.get("1") is None
+    assert not cache.channels and not cache.guilds
+
+class Named:
+    def __init__(self, *names):
+        self.names = names
+
+class NamedDict(NameIndexedDict):
+    @staticmethod
+    def names(value):
+        return value.names
+
+def test_name_index():
+    cache = NamedDict({"1": Named("Alice", None), "2": Named("bob", "Alice")})
+
+    assert cache.find("alice") is cache["1"]
+    assert cache.find("BOB") is cache["2"]
+    assert cache.find("carol") is None
+
+    del cache["1"]
+
+    assert cache.find("alice") is cache["2"]
+    assert cache.pop("2").names == ("bob", "Alice")
+    assert cache.pop("2", None) is None
+    assert cache.name_index == {} and cache.indexed_names == {}
+
+def test_name_index_popitem_and_clear():
+    cache = NamedDict({"1": Named("alice"), "2": Named("bob")})
+
+    assert cache.popitem()[0] == "2"
+    assert cache.find("bob") is None
+    assert cache.find("alice") is cache["1"]
+
+    cache.clear()
+
+    assert cache.find("alice") is None and cache.name_index == {}
+
+def test_name_index_reindex():
+    cache = NamedDict({"1": Named("alice")})
+    cache["1"].names = ("carol",)
+
+    assert cache.find("alice") is cache["1"]
+
+    cache.reindex("1")
+
+    assert cache.find("alice") is None
+    assert cache.find("carol") is cache["1"]
+
+    cache.reindex("2")
+
+    assert "2" not in cache
+
+def test_rename_reindexes_every_guild(loop):
+    client = Client()
+    gateway = make_gateway(client, policy=MemberCachePolicy.all())
+    other_id = str(int(GUILD_ID) + 2 ** 22)
+
+    for guild_id in (GUILD_ID, other_id):
+        loop.run_until_complete(gateway.guild_create(guild_payload(guild_id, [member_payload(USER_IDS[1], "old")])))
+
+    loop.run_until_complete(gateway.guild_member_update({"guild_id": GUILD_ID, **member_payload(USER_IDS[1], "new")}))
+
+    for guild_id in (GUILD_ID, other_id):
+        members = gateway.get_guild(guild_id).members
+
+        assert members.find("old") is None
+        assert members.find("new") is members[USER_IDS[1]]
+        assert members[USER_IDS[1]].user.username == "new"
+
+    assert gateway.users.find("new").id == USER_IDS[1]
+    assert gateway.users.find("old") is None
+
+def test_user_update_reindexes_bot(loop):
+    client = Client()
+    gateway = make_gateway(client, policy=MemberCachePolicy.all())
+    loop.run_until_complete(gateway.guild_create(guild_payload(GUILD_ID, [member_payload(USER_IDS[1], "bot")])))
+
+    old_user, user = loop.run_until_complete(gateway.user_update(member_payload(USER_IDS[1], "renamed")["user"]))
+    members = gateway.get_guild(GUILD_ID).members
+
+    assert gateway.bot_user is user
+    assert members.find("bot") is None
+    assert members.find("renamed").user is user
@@ -0,0 +1,73 @@
+"""
+Copyright 2022-2026 czubix
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+from femcord import Client
+
+from conftest import make_gateway
+
+async def on_message():
+    pass
+
+async def on_ready():
+    pass
+
+def test_listeners_list_is_dispatched(loop):
+    client = Client()
+    client.listeners.append(on_message)
+
+    assert client.is_listening("message")
+    assert client.get_listeners("message") == [on_message]
+
+    client.listeners.remove(on_message)
+
+    assert not client.is_listening("message")
+    assert client.get_listeners("message") == []
+
+def test_listeners_assignment(loop):
+    client = Client()
+    client.listeners = [on_message, on_ready]
+
+    assert client.get_listeners("ready") == [on_ready]
+
+    client.listeners[0] = on_ready
+    del client.listeners[1]
+
+    assert client.get_listeners("ready") == [on_ready]
+    assert not client.is_listening("message")
+
+def test_add_remove_listener(loop):
+    client = Client()
+    client.add_listener(on_message)
+    client.add_listener(on_message)
+
+    assert client.get_listeners("message") == [on_message, on_message]
+
+    client.remove_listener(on_message)
+
+    assert client.get_listeners("message") == [on_message]
+    assert list(client.listeners) == [on_message]
+
+def test_gateway_dispatch_uses_listeners(loop):
+    client = Client()
+    gateway = make_gateway(client)
+    called = []
+
+    async def on_test(value):
+        called.append(value)
+
+    client.listeners.append(on_test)
+    loop.run_until_complete(type(gateway).dispatch(gateway, "test", 1))
+
+    assert called == [1]
@@ -0,0 +1,78 @@
+"""
+Copyright 2022-2026 czubix
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import json
+import asyncio
+import pytest
+
+from femcord.cluster import ClusterIdentifyQueue
+from femcord.utils import MISSING
+
+def serve(loop, path, replies):
+    # replies: one entry per accepted connection, True answers the first request, False hangs up
+    connections = []
+
+    async def handle(reader, writer):
+        connections.append(writer)
+        line = await reader.readline()
+
+        if replies.pop(0):
+            writer.write(json.dumps({"op": "identify", "nonce": json.loads(line)["nonce"]}).encode() + b"\n")
+            await writer.drain()
+        else:
+            writer.close()
+
+    server = loop.run_until_complete(asyncio.start_unix_server(handle, path))
+    return server, connections
+
+def test_disconnect_fails_pending_requests(loop, tmp_path):
+    path = str(tmp_path / "cluster.sock")
+    server, _ = serve(loop, path, [False])
+    queue = ClusterIdentifyQueue(0, path)
+
+    with pytest.raises(ConnectionResetError):
+        loop.run_until_complete(asyncio.wait_for(queue.request("identify", shard_id=0), 1))
+
+    assert queue.futures == {}
+    assert queue.writer is MISSING
+
+    server.close()
+
+def test_acquire_reconnects(loop, tmp_path):
+    path = str(tmp_path / "cluster.sock")
+    server, connections = serve(loop, path, [False, True])
+    queue = ClusterIdentifyQueue(0, path, retry_delay=0)
+
+    loop.run_until_complete(asyncio.wait_for(queue.acquire(0), 1))
+
+    assert len(connections) == 2
+    assert queue.futures == {}
+    assert queue.writer is not MISSING
+
+    server.close()
+
+def test_acquire_waits_for_the_cluster(loop, tmp_path):
+    path = str(tmp_path / "cluster.sock")
+    queue = ClusterIdentifyQueue(0, path, retry_delay=0.01)
+    task = loop.create_task(queue.acquire(0))
+
+    loop.run_until_complete(asyncio.sleep(0.05))
+
+    assert not task.done()
+
+    server, _ = serve(loop, path, [True])
+    loop.run_until_complete(asyncio.wait_for(task, 1))
+
+    server.close()
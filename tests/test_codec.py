@@ -0,0 +1,61 @@
+"""
+Copyright 2022-2026 czubix
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import sys
+import json
+import pytest
+
+from femcord.codec import JSONCodec, OrjsonCodec, MsgspecCodec, get_codec
+
+from test_etf import CORPUS
+
+def codecs():
+    yield JSONCodec
+
+    for codec, module in ((OrjsonCodec, "orjson"), (MsgspecCodec, "msgspec")):
+        try:
+            __import__(module)
+        except ImportError:
+            yield pytest.param(codec, marks=pytest.mark.skip(reason="%s is not installed" % module))
+        else:
+            yield codec
+
+@pytest.mark.parametrize("codec", list(codecs()))
+def test_round_trip(codec):
+    codec = codec()
+
+    for frame in CORPUS:
+        encoded = codec.dumps(frame)
+
+        assert isinstance(encoded, str)
+        assert json.loads(encoded) == frame
+        assert codec.loads(encoded) == frame
+        assert codec.loads(encoded.encode()) == frame
+
+def test_get_codec_fallback(monkeypatch):
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    monkeypatch.setitem(sys.modules, "msgspec", None)
+
+    assert type(get_codec()) is JSONCodec
+
+def test_get_codec_order(monkeypatch):
+    monkeypatch.setitem(sys.modules, "orjson", None)
+
+    try:
+        import msgspec
+    except ImportError:
+        pytest.skip("msgspec is not installed")
+
+    assert type(get_codec()) is MsgspecCodec
@@ -0,0 +1,85 @@
+"""
+Copyright 2022-2026 czubix
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import zlib
+import json
+import pytest
+
+from femcord import websocket
+from femcord.errors import InvalidArgument
+from femcord.websocket import Inflator, ZstdDecompressor, DECOMPRESSORS
+
+from test_etf import CORPUS
+
+has_zstd = websocket.zstd is not None or websocket.zstandard is not None
+
+def zlib_stream(frames):
+    compressobj = zlib.compressobj()
+    return [compressobj.compress(frame) + compressobj.flush(zlib.Z_SYNC_FLUSH) for frame in frames]
+
+def zstd_stream(frames):
+    import zstandard
+    compressobj = zstandard.ZstdCompressor().compressobj()
+    return [compressobj.compress(frame) + compressobj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK) for frame in frames]
+
+FRAMES = [json.dumps(frame).encode() for frame in CORPUS]
+
+def test_inflator_whole_frames():
+    inflator = Inflator()
+
+    assert [inflator.feed(frame) for frame in zlib_stream(FRAMES)] == FRAMES
+    assert inflator.frames == len(FRAMES)
+    assert inflator.decompressed_bytes == sum(map(len, FRAMES))
+    assert inflator.ratio > 1
+
+def test_inflator_split_frames():
+    inflator = Inflator(size=16)
+    results = []
+
+    for frame in zlib_stream(FRAMES):
+        for index in range(0, len(frame), 7):
+            results.append(inflator.feed(frame[index:index + 7]))
+
+    assert [result for result in results if result is not None] == FRAMES
+    assert len(inflator.buffer) >= max(map(len, zlib_stream(FRAMES)))
+    assert inflator.length == 0
+
+def test_inflator_reset():
+    inflator = Inflator()
+    stream = zlib_stream(FRAMES)
+
+    assert inflator.feed(stream[1][:3]) is None
+
+    inflator.reset()
+
+    assert inflator.feed(zlib_stream(FRAMES)[0]) == FRAMES[0]
+
+@pytest.mark.skipif(not has_zstd, reason="zstd is not available")
+def test_zstd_frames():
+    decompressor = ZstdDecompressor()
+
+    assert [decompressor.feed(frame) for frame in zstd_stream(FRAMES)] == FRAMES
+    assert decompressor.frames == len(FRAMES)
+    assert decompressor.ratio > 1
+
+def test_zstd_unavailable(monkeypatch):
+    monkeypatch.setattr(websocket, "zstd", None)
+    monkeypatch.setattr(websocket, "zstandard", None)
+
+    with pytest.raises(InvalidArgument):
+        ZstdDecompressor()
+
+def test_decompressors():
+    assert DECOMPRESSORS == {"zlib-stream": Inflator, "zstd-stream": ZstdDecompressor}
@@ -0,0 +1,210 @@
+"""
+Copyright 2022-2026 czubix
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import json
+
+from femcord import etf
+
+# frames as discord sends them over the json encoding
+CORPUS = [
+    {"op": 10, "d": {"heartbeat_interval": 41250, "_trace": ["[\"gateway-prd-us-east1-b-0568\",{\"micros\":0.0}]"]}, "s": None, "t": None},
+    {"op": 11, "d": None, "s": None, "t": None},
+    {"op": 0, "s": 1, "t": "READY", "d": {
+        "v": 10,
+        "session_id": "d7d3b1c2e3f4a5b6c7d8e9f0a1b2c3d4",
+        "resume_gateway_url": "wss://gateway-us-east1-b.discord.gg",
+        "user": {"id": "1104456789012345678", "username": "femcord", "discriminator": "0", "avatar": None, "global_name": None, "bot": True, "flags": 0},
+        "guilds": [{"id": "824683713459814400", "unavailable": True}, {"id": "41771983423143937", "unavailable": True}],
+        "application": {"id": "1104456789012345678", "flags": 8953856},
+        "shard": [0, 1]
+    }},
+    {"op": 0, "s": 2, "t": "MESSAGE_CREATE", "d": {
+        "id": "1234567890123456789",
+        "channel_id": "824683713459814403",
+        "guild_id": "824683713459814400",
+        "author": {"id": "41771983423143937", "username": "user", "discriminator": "0", "avatar": "a_0123456789abcdef", "global_name": "User", "public_flags": 4194304},
+        "member": {"roles": ["824683713459814401", "824683713459814402"], "joined_at": "2021-03-22T17:00:00.000000+00:00", "deaf": False, "mute": False, "flags": 0},
+        "content": "zażółć gęślą jaźń \U0001f408",
+        "timestamp": "2024-01-01T00:00:00.000000+00:00",
+        "edited_timestamp": None,
+        "tts": False,
+        "mention_everyone": False,
+        "mentions": [],
+        "mention_roles": ["824683713459814401"],
+        "attachments": [{"id": "1234567890123456780", "filename": "cat.png", "size": 4096, "width": 512, "height": 512, "url": "https://cdn.discordapp.com/attachments/1/2/cat.png"}],
+        "embeds": [{"type": "rich", "title": "t", "color": 16711680, "fields": [{"name": "a", "value": "b", "inline": True}]}],
+        "components": [{"type": 1, "components": [{"type": 2, "style": 1, "custom_id": "1234567890123456789", "label": "ok"}]}],
+        "reactions": [{"emoji": {"id": None, "name": "\U0001f44d"}, "count": 2, "me": False}],
+        "pinned": False,
+        "type": 0,
+        "flags": 0,
+        "nonce": "1234567890123456000"
+    }},
+    {"op": 0, "s": 3, "t": "PRESENCE_UPDATE", "d": {
+        "user": {"id": "41771983423143937"},
+        "guild_id": "824683713459814400",
+        "status": "online",
+        "client_status": {"desktop": "online"},
+        "activities": [{
+            "id": "ec0b28a579ecb4bd",
+            "name": "Spotify",
+            "type": 2,
+            "created_at": 1700000000000,
+            "timestamps": {"start": 1700000000000, "end": 1700000200000},
+            "application_id": "1104456789012345679",
+            "flags": 48,
+            "emoji": {"id": "824683713459814410", "name": "cat", "animated": False}
+        }]
+    }},
+    {"op": 0, "s": 4, "t": "GUILD_MEMBERS_CHUNK", "d": {
+        "guild_id": "824683713459814400",
+        "members": [{"user": {"id": "41771983423143937", "username": "user", "discriminator": "0", "avatar": None, "global_name": None}, "roles": [], "joined_at": "2021-03-22T17:00:00.000000+00:00", "deaf": False, "mute": False, "flags": 0}],
+        "not_found": ["1234567890123456789"],
+        "chunk_index": 0,
+        "chunk_count": 1,
+        "nonce": "0.0"
+    }},
+    {"op": 0, "s": 5, "t": "GUILD_ROLE_UPDATE", "d": {
+        "guild_id": "824683713459814400",
+        "role": {"id": "824683713459814401", "name": "mod", "permissions": "1099511627775", "position": 3, "color": 0, "hoist": True, "managed": False, "mentionable": False, "flags": 0, "icon": None, "unicode_emoji": None}
+    }},
+    {"op": 0, "s": 6, "t": "THREAD_CREATE", "d": {
+        "id": "1234567890123456790",
+        "guild_id": "824683713459814400",
+        "parent_id": "824683713459814403",
+        "owner_id": "41771983423143937",
+        "type": 11,
+        "name": "thread",
+        "applied_tags": ["1234567890123456791"],
+        "rate_limit_per_user": 0,
+        "thread_metadata": {"archived": False, "auto_archive_duration": 1440, "archive_timestamp": "2024-01-01T00:00:00.000000+00:00", "locked": False},
+        "total_message_sent": -1,
+        "bitrate": 64000
+    }}
+]
+
+# the same frames as discord sends them over etf, snowflakes are integers there
+WIRE = CORPUS[:2] + [
+    {"op": 0, "s": 1, "t": "READY", "d": {
+        "v": 10,
+        "session_id": "d7d3b1c2e3f4a5b6c7d8e9f0a1b2c3d4",
+        "resume_gateway_url": "wss://gateway-us-east1-b.discord.gg",
+        "user": {"id": 1104456789012345678, "username": "femcord", "discriminator": "0", "avatar": None, "global_name": None, "bot": True, "flags": 0},
+        "guilds": [{"id": 824683713459814400, "unavailable": True}, {"id": 41771983423143937, "unavailable": True}],
+        "application": {"id": 1104456789012345678, "flags": 8953856},
+        "shard": [0, 1]
+    }},
+    {"op": 0, "s": 2, "t": "MESSAGE_CREATE", "d": {
+        "id": 1234567890123456789,
+        "channel_id": 824683713459814403,
+        "guild_id": 824683713459814400,
+        "author": {"id": 41771983423143937, "username": "user", "discriminator": "0", "avatar": "a_0123456789abcdef", "global_name": "User", "public_flags": 4194304},
+        "member": {"roles": [824683713459814401, 824683713459814402], "joined_at": "2021-03-22T17:00:00.000000+00:00", "deaf": False, "mute": False, "flags": 0},
+        "content": "zażółć gęślą jaźń \U0001f408",
+        "timestamp": "2024-01-01T00:00:00.000000+00:00",
+        "edited_timestamp": None,
+        "tts": False,
+        "mention_everyone": False,
+        "mentions": [],
+        "mention_roles": [824683713459814401],
+        "attachments": [{"id": 1234567890123456780, "filename": "cat.png", "size": 4096, "width": 512, "height": 512, "url": "https://cdn.discordapp.com/attachments/1/2/cat.png"}],
+        "embeds": [{"type": "rich", "title": "t", "color": 16711680, "fields": [{"name": "a", "value": "b", "inline": True}]}],
+        "components": [{"type": 1, "components": [{"type": 2, "style": 1, "custom_id": "1234567890123456789", "label": "ok"}]}],
+        "reactions": [{"emoji": {"id": None, "name": "\U0001f44d"}, "count": 2, "me": False}],
+        "pinned": False,
+        "type": 0,
+        "flags": 0,
+        "nonce": "1234567890123456000"
+    }},
+    {"op": 0, "s": 3, "t": "PRESENCE_UPDATE", "d": {
+        "user": {"id": 41771983423143937},
+        "guild_id": 824683713459814400,
+        "status": "online",
+        "client_status": {"desktop": "online"},
+        "activities": [{
+            "id": "ec0b28a579ecb4bd",
+            "name": "Spotify",
+            "type": 2,
+            "created_at": 1700000000000,
+            "timestamps": {"start": 1700000000000, "end": 1700000200000},
+            "application_id": 1104456789012345679,
+            "flags": 48,
+            "emoji": {"id": 824683713459814410, "name": "cat", "animated": False}
+        }]
+    }},
+    {"op": 0, "s": 4, "t": "GUILD_MEMBERS_CHUNK", "d": {
+        "guild_id": 824683713459814400,
+        "members": [{"user": {"id": 41771983423143937, "username": "user", "discriminator": "0", "avatar": None, "global_name": None}, "roles": [], "joined_at": "2021-03-22T17:00:00.000000+00:00", "deaf": False, "mute": False, "flags": 0}],
+        "not_found": [1234567890123456789],
+        "chunk_index": 0,
+        "chunk_count": 1,
+        "nonce": "0.0"
+    }},
+    {"op": 0, "s": 5, "t": "GUILD_ROLE_UPDATE", "d": {
+        "guild_id": 824683713459814400,
+        "role": {"id": 824683713459814401, "name": "mod", "permissions": "1099511627775", "position": 3, "color": 0, "hoist": True, "managed": False, "mentionable": False, "flags": 0, "icon": None, "unicode_emoji": None}
+    }},
+    {"op": 0, "s": 6, "t": "THREAD_CREATE", "d": {
+        "id": 1234567890123456790,
+        "guild_id": 824683713459814400,
+        "parent_id": 824683713459814403,
+        "owner_id": 41771983423143937,
+        "type": 11,
+        "name": "thread",
+        "applied_tags": [1234567890123456791],
+        "rate_limit_per_user": 0,
+        "thread_metadata": {"archived": False, "auto_archive_duration": 1440, "archive_timestamp": "2024-01-01T00:00:00.000000+00:00", "locked": False},
+        "total_message_sent": -1,
+        "bitrate": 64000
+    }}
+]
+
+def test_round_trip_matches_json():
+    for wire, frame in zip(WIRE, CORPUS):
+        assert etf.loads(etf.dumps(wire)) == json.loads(json.dumps(frame))
+
+def test_round_trip_without_wire_ids():
+    for frame in CORPUS:
+        assert etf.loads(etf.dumps(frame)) == frame
+
+def test_non_id_integers_stay_integers():
+    frame = etf.loads(etf.dumps(WIRE[4]))
+    activity = frame["d"]["activities"][0]
+
+    assert activity["created_at"] == 1700000000000
+    assert activity["timestamps"]["start"] == 1700000000000
+    assert activity["application_id"] == "1104456789012345679"
+
+def test_custom_id_is_not_a_snowflake():
+    frame = etf.loads(etf.dumps(WIRE[3]))
+
+    assert frame["d"]["components"][0]["components"][0]["custom_id"] == "1234567890123456789"
+    assert frame["d"]["nonce"] == "1234567890123456000"
+
+def test_bigints_as_str_disabled():
+    frame = etf.loads(etf.dumps(WIRE[3]), bigints_as_str=False)
+
+    assert frame["d"]["id"] == 1234567890123456789
+    assert frame["d"]["member"]["roles"] == [824683713459814401, 824683713459814402]
+
+def test_known_encoding():
+    assert etf.dumps({"id": 1234567890123456789, "ok": True}) == bytes((131, 116, 0, 0, 0, 2, 109, 0, 0, 0, 2)) + b"id" + bytes((110, 8, 0, 0x15, 0x81, 0xe9, 0x7d, 0xf4, 0x10, 0x22, 0x11, 109, 0, 0, 0, 2)) + b"ok" + bytes((119, 4)) + b"true"
+    assert etf.loads(bytes((131, 116, 0, 0, 0, 1, 109, 0, 0, 0, 8)) + b"guild_id" + bytes((98, 0, 0, 1, 0)), bigints_as_str=False) == {"guild_id": 256}
+
+def test_codec():
+    codec = etf.ETFCodec()
+
+    for wire, frame in zip(WIRE, CORPUS):
+        assert codec.loads(codec.dumps(wire)) == frame
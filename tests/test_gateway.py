@@ -0,0 +1,223 @@
+"""
+Copyright 2022-2026 czubix
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import asyncio
+import time
+
+import logging
+
+from femcord import Client, gateway as gateway_module
+from femcord.cache import MemberCachePolicy
+from femcord.gateway import IdentifyQueue
+from femcord.types import Guild
+from femcord.enums import Opcodes
+
+from conftest import guild_payload, member_payload, make_gateway
+
+# (824683713459814400 >> 22) % 2 == 1, so shard 1 of 2 owns it
+GUILD_ID = "824683713459814400"
+
+def restore(gateway, client, payload):
+    guild = Guild.parse(client, payload)
+    gateway.guilds.append(guild)
+    gateway.index_guild(guild)
+    gateway.restored_guild_ids.add(guild.id)
+    return guild
+
+USER_IDS = ["41771983423143937", "41771983423143938", "41771983423143939"]
+
+def restore_with_members(loop, gateway, client):
+    guild = restore(gateway, client, guild_payload(GUILD_ID))
+
+    for user_id in USER_IDS:
+        loop.run_until_complete(guild.get_member(member_payload(user_id)))
+
+    return guild
+
+def test_full_guild_create_drops_restored_members(loop):
+    client = Client()
+    gateway = make_gateway(client)
+    restore_with_members(loop, gateway, client)
+
+    loop.run_until_complete(gateway.guild_create(guild_payload(GUILD_ID, [member_payload(user_id) for user_id in USER_IDS[:2]])))
+    loop.run_until_complete(asyncio.sleep(0.01))
+    guild = gateway.get_guild(GUILD_ID)
+
+    assert sorted(guild.members) == USER_IDS[:2]
+    assert guild.chunked is True
+
+def test_full_chunk_prunes_restored_members(loop):
+    client = Client()
+    gateway = make_gateway(client)
+    restore_with_members(loop, gateway, client)
+
+    loop.run_until_complete(gateway.guild_create(guild_payload(GUILD_ID, [member_payload(USER_IDS[0])], member_count=3)))
+    loop.run_until_complete(asyncio.sleep(0.01))
+    guild = gateway.get_guild(GUILD_ID)
+
+    assert sorted(guild.members) == USER_IDS
+
+    _, request = gateway.ws.sent[-1]
+    loop.run_until_complete(gateway.guild_members_chunk({"guild_id": GUILD_ID, "members": [member_payload(user_id) for user_id in USER_IDS[:2]], "chunk_index": 0, "chunk_count": 1, "nonce": request["nonce"]}))
+    loop.run_until_complete(asyncio.sleep(0.01))
+
+    assert sorted(guild.members) == USER_IDS[:2]
+    assert guild.chunked is True
+
+def test_full_requests_are_sent_first(loop):
+    client = Client()
+    gateway = make_gateway(client)
+    gateway.ready = False
+
+    gateway.request_guild_members(GUILD_ID, user_ids=[USER_IDS[0]], limit=1, priority=gateway_module.ADMISSION_PRIORITY)
+    gateway.request_guild_members(GUILD_ID, query="user", limit=5)
+    gateway.request_guild_members(GUILD_ID)
+    loop.run_until_complete(asyncio.sleep(0.01))
+
+    assert gateway.ws.sent == []
+
+    gateway.ready = True
+    gateway.chunker.requeue()
+    loop.run_until_complete(asyncio.sleep(0.01))
+
+    assert [request.get("query", "user_ids") for _, request in gateway.ws.sent] == ["", "user", "user_ids"]
+
+def test_admissions_are_coalesced_and_cached(loop, monkeypatch):
+    monkeypatch.setattr(gateway_module, "ADMISSION_WINDOW", 0.01)
+    client = Client()
+    gateway = make_gateway(client, policy=MemberCachePolicy.online_only())
+    loop.run_until_complete(gateway.guild_create(guild_payload(GUILD_ID, member_count=10)))
+    guild = gateway.get_guild(GUILD_ID)
+    presence = {"user": {"id": USER_IDS[1]}, "status": "online", "activities": [], "client_status": {"desktop": "online"}}
+
+    for user_id in USER_IDS[1:]:
+        gateway.admit_member(guild, user_id, {**presence, "user": {"id": user_id}})
+
+    loop.run_until_complete(asyncio.sleep(0.05))
+    _, request = gateway.ws.sent[-1]
+
+    assert request["user_ids"] == USER_IDS[1:]
+
+    loop.run_until_complete(gateway.guild_members_chunk({"guild_id": GUILD_ID, "members": [member_payload(user_id) for user_id in USER_IDS[1:]], "chunk_index": 0, "chunk_count": 1, "nonce": request["nonce"]}))
+    loop.run_until_complete(asyncio.sleep(0.01))
+
+    assert sorted(guild.members) == USER_IDS[1:]
+
+def test_dropped_admissions_are_retried_and_logged(loop, monkeypatch, caplog):
+    monkeypatch.setattr(gateway_module, "ADMISSION_WINDOW", 0.01)
+    client = Client()
+    gateway = make_gateway(client, policy=MemberCachePolicy.online_only())
+    gateway.chunker.timeout = 0.01
+    loop.run_until_complete(gateway.guild_create(guild_payload(GUILD_ID, member_count=10)))
+    gateway.admit_member(gateway.get_guild(GUILD_ID), USER_IDS[1])
+
+    with caplog.at_level(logging.WARNING):
+        loop.run_until_complete(asyncio.sleep(0.2))
+
+    assert len([request for _, request in gateway.ws.sent if "user_ids" in request]) == gateway_module.ADMISSION_ATTEMPTS
+    assert "dropped 1 member admissions" in caplog.text
+
+CHANNEL_ID = str(int(GUILD_ID) + 3)
+
+def voice_state(user_id, channel_id=CHANNEL_ID, **fields):
+    return {"guild_id": GUILD_ID, "channel_id": channel_id, "user_id": user_id, "session_id": "s", "deaf": False, "mute": False, "self_deaf": False, "self_mute": False, "self_video": False, "suppress": False, "request_to_speak_timestamp": None, **fields}
+
+def test_voice_states_apply_to_payload_members(loop):
+    client = Client(chunk_guilds_at_startup=False)
+    gateway = make_gateway(client)
+    payload = guild_payload(GUILD_ID, [member_payload(USER_IDS[0])], member_count=3, voice_states=[voice_state(USER_IDS[0]), voice_state(USER_IDS[1])])
+
+    loop.run_until_complete(gateway.guild_create(payload))
+    loop.run_until_complete(asyncio.sleep(0.01))
+    guild = gateway.get_guild(GUILD_ID)
+
+    assert guild.members[USER_IDS[0]].voice_state.channel.id == CHANNEL_ID
+    assert GUILD_ID not in gateway.pending_voice_states
+
+def test_pending_voice_states_follow_updates(loop):
+    client = Client()
+    gateway = make_gateway(client)
+    payload = guild_payload(GUILD_ID, member_count=3, voice_states=[voice_state(USER_IDS[0]), voice_state(USER_IDS[1], self_mute=False)])
+
+    loop.run_until_complete(gateway.guild_create(payload))
+    loop.run_until_complete(gateway.voice_state_update(voice_state(USER_IDS[0], None, member=member_payload(USER_IDS[0]))))
+    loop.run_until_complete(gateway.voice_state_update(voice_state(USER_IDS[1], self_mute=True, member=member_payload(USER_IDS[1]))))
+
+    assert list(gateway.pending_voice_states[GUILD_ID]) == [USER_IDS[1]]
+
+    request = next(request for _, request in gateway.ws.sent if request.get("query") == "")
+    loop.run_until_complete(gateway.guild_members_chunk({"guild_id": GUILD_ID, "members": [member_payload(user_id) for user_id in USER_IDS], "chunk_index": 0, "chunk_count": 1, "nonce": request["nonce"]}))
+    loop.run_until_complete(asyncio.sleep(0.01))
+    guild = gateway.get_guild(GUILD_ID)
+
+    assert guild.members[USER_IDS[1]].voice_state.self_mute is True
+    assert guild.members[USER_IDS[0]].voice_state.channel is None
+    assert GUILD_ID not in gateway.pending_voice_states
+
+def test_resume_then_reidentify_keeps_one_guild(loop):
+    client = Client(shard_count=2, shard_ids=[1])
+    gateway = make_gateway(client, shard_id=1)
+    restore(gateway, client, guild_payload(GUILD_ID))
+
+    loop.run_until_complete(gateway.on_message(Opcodes.DISPATCH, None, 2, "RESUMED"))
+
+    assert not gateway.restored_guild_ids
+    assert GUILD_ID in gateway.guild_ids
+
+    gateway.reset()
+    loop.run_until_complete(gateway.guild_create(guild_payload(GUILD_ID)))
+
+    assert [guild.id for guild in gateway.guilds] == [GUILD_ID]
+    assert gateway.get_guild(GUILD_ID) is gateway.guilds[0]
+
+def test_identify_queue_clamps_remaining(loop):
+    queue = IdentifyQueue(delay=0)
+    queue.update({"max_concurrency": 1, "remaining": 1, "reset_after": 0})
+
+    loop.run_until_complete(queue.acquire())
+    loop.run_until_complete(queue.acquire())
+
+    assert queue.remaining == 0
+
+def test_identify_queue_refreshes_after_reset(loop):
+    queue = IdentifyQueue(delay=0)
+    queue.update({"max_concurrency": 1, "remaining": 0, "reset_after": 20})
+    fetched = []
+
+    async def fetch_gateway():
+        fetched.append(time.time())
+        return {"session_start_limit": {"max_concurrency": 2, "remaining": 1000, "reset_after": 86400000}}
+
+    queue.fetch_gateway = fetch_gateway
+    start = time.time()
+    loop.run_until_complete(queue.acquire())
+
+    assert len(fetched) == 1 and fetched[0] - start >= 0.015
+    assert queue.remaining == 999
+    assert queue.max_concurrency == 2
+
+def test_identify_queue_fetch_failure(loop):
+    queue = IdentifyQueue(delay=0)
+    queue.update({"max_concurrency": 1, "remaining": 0, "reset_after": 0})
+
+    async def fetch_gateway():
+        raise OSError("offline")
+
+    queue.fetch_gateway = fetch_gateway
+    loop.run_until_complete(queue.acquire())
+    loop.run_until_complete(asyncio.sleep(0))
+
+    assert queue.remaining == 0
+    assert not queue.buckets[0].locked()
@@ -0,0 +1,76 @@
+"""
+Copyright 2022-2026 czubix
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import copy
+
+from femcord import Client
+from femcord.enums import StatusTypes
+from femcord.types import Guild, Member, User
+from femcord.types.dataclass import dataclass
+from femcord.types.guild import AuditLogChange
+from femcord.types.presence import Presence
+
+from conftest import guild_payload, member_payload, make_gateway
+
+GUILD_ID = "824683713459814400"
+USER_ID = "41771983423143937"
+
+def test_models_are_slotted(loop):
+    client = Client()
+    make_gateway(client)
+    guild = Guild.parse(client, guild_payload())
+    member = loop.run_until_complete(guild.get_member(member_payload(USER_ID)))
+
+    for model in (member, member.user, member.voice_state):
+        assert not hasattr(model, "__dict__")
+
+    assert type(member) is Member and type(member.user) is User
+
+def test_slots_opt_out():
+    @dataclass(slots=False)
+    class Model:
+        value: int
+
+        @classmethod
+        def from_raw(cls, client, data):
+            return cls(**data)
+
+    model = Model.from_raw(None, {"value": 1, "unknown": 2})
+
+    assert type(model) is Model
+    assert model.__dict__ == {"value": 1}
+
+def test_member_update_snapshot(loop):
+    client = Client()
+    gateway = make_gateway(client)
+    loop.run_until_complete(gateway.guild_create(guild_payload(GUILD_ID, [member_payload(USER_ID, nick="old")])))
+
+    guild, old_member, member = loop.run_until_complete(gateway.guild_member_update({"guild_id": GUILD_ID, **member_payload(USER_ID, nick="new")}))
+
+    assert old_member is not member
+    assert old_member.nick == "old"
+    assert member.nick == "new"
+    assert guild.members[USER_ID] is member
+
+def test_audit_log_change_reset():
+    assert AuditLogChange.from_raw(None, {"key": "nick", "old_value": "old"}).is_reset is True
+    assert AuditLogChange.from_raw(None, {"key": "nick", "old_value": "old", "new_value": "new"}).is_reset is False
+    assert AuditLogChange.from_raw(None, {"key": "nick", "new_value": "new"}).was_previously_null is True
+
+def test_presence_to_dict(loop):
+    presence = Presence(Client(), StatusTypes.ONLINE, [])
+
+    assert presence.to_dict() == {"status": "online", "activities": [], "since": None, "afk": False}
+    assert copy.copy(presence) == presence
@@ -0,0 +1,75 @@
+"""
+Copyright 2022-2026 czubix
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import pytest
+
+from femcord.enums import Permissions as PermissionsEnum
+from femcord.errors import PermissionNotExist
+from femcord.permissions import Permissions, ALL_PERMISSIONS
+
+def test_from_int():
+    permissions = Permissions.from_int(PermissionsEnum.KICK_MEMBERS.value | PermissionsEnum.SEND_MESSAGES.value)
+
+    assert permissions == Permissions("kick_members", PermissionsEnum.SEND_MESSAGES)
+    assert int(permissions) == permissions.get_int() == 1 << 1 | 1 << 11
+    assert permissions.permissions == [PermissionsEnum.KICK_MEMBERS, PermissionsEnum.SEND_MESSAGES]
+    assert list(permissions) == permissions.permissions
+    assert Permissions.from_int(0).permissions == []
+    assert Permissions.all().value == ALL_PERMISSIONS
+
+def test_operators():
+    kick = Permissions("kick_members")
+    ban = Permissions("ban_members")
+    both = kick | ban
+
+    assert both == Permissions("kick_members", "ban_members")
+    assert both & kick == kick
+    assert both - kick == ban
+    assert both ^ kick == ban
+    assert both ^ both == Permissions()
+    assert ~both == Permissions.all() - both
+    assert ~Permissions.all() == Permissions()
+    assert kick.value == 1 << 1 and ban.value == 1 << 2
+
+def test_has():
+    permissions = Permissions("view_channel", "send_messages")
+
+    assert permissions.has("send_messages")
+    assert permissions.has(PermissionsEnum.VIEW_CHANNEL)
+    assert not permissions.has("ban_members")
+    assert "send_messages" in permissions
+    assert "ban_members" not in permissions
+    assert permissions.has_all(Permissions("view_channel", "send_messages"))
+    assert not permissions.has_all(Permissions("view_channel", "ban_members"))
+
+def test_administrator():
+    permissions = Permissions("administrator")
+
+    assert permissions.has("ban_members")
+    assert permissions.has_all(Permissions.all())
+    assert "ban_members" not in permissions
+
+def test_add_remove():
+    permissions = Permissions().add("kick_members").add("ban_members").remove("kick_members")
+
+    assert permissions == Permissions("ban_members")
+    assert permissions.remove("kick_members") == Permissions("ban_members")
+
+def test_unknown_permission():
+    with pytest.raises(PermissionNotExist):
+        Permissions("fly")
+
+    with pytest.raises(PermissionNotExist):
+        Permissions().has("fly")
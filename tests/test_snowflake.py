@@ -0,0 +1,100 @@
+"""
+Copyright 2022-2026 czubix
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+import pickle
+
+from femcord import Client
+from femcord.types import Guild
+from femcord.cache import SnowflakeDict
+from femcord.utils import Snowflake, ID_PATTERN, time_from_snowflake
+
+from conftest import guild_payload, member_payload, make_gateway
+
+def test_string_compatibility():
+    snowflake = Snowflake("824683713459814400")
+
+    assert snowflake == "824683713459814400"
+    assert "824683713459814400" == snowflake
+    assert snowflake != "824683713459814401"
+    assert str(snowflake) == "824683713459814400"
+    assert f"<#{snowflake}>" == "<#824683713459814400>"
+    assert snowflake + "/x" == "824683713459814400/x"
+    assert len(snowflake) == 18
+    assert snowflake[:3] == "824"
+    assert snowflake.isdigit()
+
+def test_hash_matches_equality():
+    snowflake = Snowflake("824683713459814400")
+
+    assert hash(snowflake) == hash("824683713459814400")
+    assert {"824683713459814400": 1}[snowflake] == 1
+    assert snowflake in {"824683713459814400"}
+    assert {snowflake: 1}["824683713459814400"] == 1
+
+def test_not_equal_to_plain_int():
+    snowflake = Snowflake("824683713459814400")
+
+    assert snowflake != 824683713459814400
+    assert 824683713459814400 != snowflake
+    assert snowflake == Snowflake(824683713459814400)
+    assert int(snowflake) == 824683713459814400
+
+def test_converters():
+    snowflake = Snowflake("824683713459814400")
+
+    assert ID_PATTERN.fullmatch(snowflake)
+    assert time_from_snowflake(snowflake) == time_from_snowflake("824683713459814400")
+
+def test_snowflake_dict_keys(snowflakes):
+    Snowflake.enabled = True
+    cache = SnowflakeDict()
+    cache["824683713459814400"] = 1
+
+    assert isinstance(next(iter(cache)), Snowflake)
+    assert cache.get(Snowflake("824683713459814400")) == 1
+    assert "824683713459814400" in cache
+
+def test_snowflake_dict_operations(snowflakes):
+    Snowflake.enabled = True
+    cache = SnowflakeDict({"824683713459814400": 1, "user": 2})
+
+    assert cache.setdefault("824683713459814401", 3) == 3
+    assert cache.setdefault(Snowflake("824683713459814401"), 4) == 3
+    assert cache.pop("824683713459814400") == 1
+    assert cache.pop("824683713459814400", None) is None
+    del cache[Snowflake("824683713459814401")]
+
+    assert list(cache) == ["user"]
+    assert pickle.loads(pickle.dumps(cache)) == cache
+
+def test_snowflake_dict_disabled(snowflakes):
+    Snowflake.enabled = False
+    cache = SnowflakeDict()
+    cache[Snowflake("824683713459814400")] = 1
+
+    assert type(next(iter(cache))) is str
+    assert cache["824683713459814400"] == 1
+    assert Snowflake("824683713459814400") in cache
+
+def test_get_member_by_snowflake(snowflakes, loop):
+    client = Client(snowflakes=True)
+    gateway = make_gateway(client)
+    guild = Guild.parse(client, guild_payload())
+    member = loop.run_until_complete(guild.get_member(member_payload("41771983423143937")))
+
+    assert isinstance(member.user.id, Snowflake)
+    assert loop.run_until_complete(guild.get_member(member.user.id)) is member
+    assert loop.run_until_complete(gateway.get_user(member.user.id)) is member.user
+    assert loop.run_until_complete(gateway.get_user("user")) is member.user